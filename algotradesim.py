@@ -1,11 +1,24 @@
+import math
 import random
+import sys
 from typing import List, Optional, Tuple
 
+import instrumentation
+from instrumentation import instrument, stage
+from renderer import render_report
+from running_stats import RollingVariance, RunningStats
 
+
+@instrument()
 def calculate_sma(prices: List[float], period: int) -> List[Optional[float]]:
     """
     Вычисление простой скользящей средней (SMA)
 
+    Скользящая сумма обновляется за один проход O(n): на каждом шаге
+    добавляется новая цена и вычитается выпавшая из окна. Сумма ведётся
+    с компенсацией ошибки округления (Кэхэн–Ноймайер), поэтому дрейф
+    не накапливается даже на рядах из миллионов баров.
+
     Args:
         prices: список цен
         period: период SMA
@@ -16,18 +29,121 @@ def calculate_sma(prices: List[float], period: int) -> List[Optional[float]]:
     if len(prices) < period:
         return [None] * len(prices)
 
-    sma_values = []
-    for i in range(len(prices)):
-        if i < period - 1:
-            sma_values.append(None)
+    sma_values = [None] * (period - 1)
+
+    total = math.fsum(prices[:period])
+    compensation = 0.0
+    sma_values.append(total / period)
+
+    for new_price, old_price in zip(prices[period:], prices):
+        t = total + new_price
+        if abs(total) >= abs(new_price):
+            compensation += (total - t) + new_price
+        else:
+            compensation += (new_price - t) + total
+        total = t
+
+        t = total - old_price
+        if abs(total) >= abs(old_price):
+            compensation += (total - t) - old_price
         else:
-            window = prices[i - period + 1: i + 1]
-            sma = sum(window) / period
-            sma_values.append(sma)
+            compensation += total - (old_price + t)
+        total = t
+
+        sma_values.append((total + compensation) / period)
 
     return sma_values
 
 
+@instrument()
+def calculate_stddev(prices: List[float], period: int = 20) -> List[Optional[float]]:
+    """
+    Вычисление скользящего стандартного отклонения
+
+    Окно обновляется за O(1) на бар (RollingVariance: формулы Уэлфорда
+    для скользящего окна), без повторного суммирования окна и без
+    вычитания больших сумм квадратов.
+
+    Args:
+        prices: список цен
+        period: длина окна
+
+    Returns:
+        Список значений (делитель — period), None в зоне прогрева
+    """
+    window = RollingVariance(period)
+    std_values = []
+
+    for price in prices:
+        window.update(price)
+        std_values.append(window.std if window.ready else None)
+
+    return std_values
+
+
+@instrument()
+def calculate_bollinger_bands(prices: List[float], period: int = 20, num_std: float = 2.0) -> Tuple[
+    List[Optional[float]], List[Optional[float]], List[Optional[float]]]:
+    """
+    Вычисление полос Боллинджера
+
+    Args:
+        prices: список цен
+        period: длина окна
+        num_std: ширина полос в стандартных отклонениях
+
+    Returns:
+        Кортеж: (средняя линия, верхняя полоса, нижняя полоса)
+    """
+    window = RollingVariance(period)
+    middle_band = []
+    upper_band = []
+    lower_band = []
+
+    for price in prices:
+        window.update(price)
+        if not window.ready:
+            middle_band.append(None)
+            upper_band.append(None)
+            lower_band.append(None)
+            continue
+
+        width = num_std * window.std
+        middle_band.append(window.mean)
+        upper_band.append(window.mean + width)
+        lower_band.append(window.mean - width)
+
+    return middle_band, upper_band, lower_band
+
+
+def ema_step(average: float, value: float, multiplier: float) -> float:
+    """
+    Шаг рекурсии EMA с коэффициентом multiplier = 2 / (period + 1)
+
+    Общий для списочных (здесь) и потоковых (streaming.py) версий EMA,
+    MACD и Bull Bear Power; векторная версия — recursive_filter.smooth.
+    """
+    return (value - average) * multiplier + average
+
+
+def wilder_step(average: float, value: float, period: int) -> float:
+    """
+    Шаг сглаживания Уайлдера (RSI, ATR): (average * (period - 1) + value) / period
+    """
+    return (average * (period - 1) + value) / period
+
+
+def rsi_value(avg_gain: float, avg_loss: float) -> float:
+    """
+    RSI по средним приросту и падению
+    """
+    if avg_loss == 0:
+        return 100
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+@instrument()
 def calculate_ema(prices: List[float], period: int = 13) -> List[Optional[float]]:
     """
     Вычисление экспоненциальной скользящей средней (EMA)
@@ -37,50 +153,75 @@ def calculate_ema(prices: List[float], period: int = 13) -> List[Optional[float]
 
     ema_values = [None] * (period - 1)
 
-    sma = sum(prices[:period]) / period
-    ema_values.append(sma)
+    ema = sum(prices[:period]) / period
+    ema_values.append(ema)
 
     multiplier = 2 / (period + 1)
 
-    for i in range(period, len(prices)):
-        ema = (prices[i] - ema_values[i - 1]) * multiplier + ema_values[i - 1]
+    for price in prices[period:]:
+        ema = ema_step(ema, price, multiplier)
         ema_values.append(ema)
 
     return ema_values
 
 
-def calculate_ema_with_none(prices: List[Optional[float]], period: int = 13) -> List[Optional[float]]:
-    """
-    Вычисление EMA для списка, который может содержать None значения
-    """
-    if len(prices) < period:
-        return [None] * len(prices)
+GAP_POLICIES = ("skip", "hold", "reset")
 
-    start_idx = 0
-    for i in range(len(prices)):
-        if prices[i] is not None:
-            start_idx = i
-            break
-
-    if len(prices) - start_idx < period:
-        return [None] * len(prices)
 
-    valid_prices = [p for p in prices if p is not None]
+@instrument()
+def calculate_ema_with_none(
+        prices: List[Optional[float]],
+        period: int = 13,
+        gap_policy: str = "skip"
+) -> List[Optional[float]]:
+    """
+    Вычисление EMA для списка, который может содержать None значения
 
-    if len(valid_prices) < period:
-        return [None] * len(prices)
+    Один проход без промежуточных списков, значения остаются на своих
+    индексах. Первое значение — SMA первых period непустых цен.
 
-    ema_result = calculate_ema(valid_prices, period)
+    Args:
+        prices: список цен, None — пропуск
+        period: период EMA
+        gap_policy: поведение на пропусках после начала расчёта:
+            "skip" — на пропуске None, рекурсия продолжается со следующей цены;
+            "hold" — на пропуске повторяется последнее значение EMA;
+            "reset" — пропуск сбрасывает EMA, прогрев начинается заново
 
-    result = [None] * start_idx
-    result.extend(ema_result)
+    Returns:
+        Список значений EMA той же длины, None в зоне прогрева и на пропусках
+    """
+    if gap_policy not in GAP_POLICIES:
+        raise ValueError(f"gap_policy должен быть одним из {GAP_POLICIES}")
 
-    while len(result) < len(prices):
-        result.append(None)
+    multiplier = 2 / (period + 1)
+    hold = gap_policy == "hold"
+    reset = gap_policy == "reset"
+
+    result = []
+    ema = None
+    seed = []
+
+    for price in prices:
+        if price is None:
+            if reset:
+                ema = None
+                seed.clear()
+            result.append(ema if hold else None)
+        elif ema is not None:
+            ema = ema_step(ema, price, multiplier)
+            result.append(ema)
+        else:
+            seed.append(price)
+            if len(seed) == period:
+                ema = sum(seed) / period
+                seed.clear()
+            result.append(ema)
 
-    return result[:len(prices)]
+    return result
 
 
+@instrument()
 def calculate_momentum(prices: List[float], period: int = 10) -> List[Optional[float]]:
     """
     Вычисление индикатора Momentum
@@ -97,6 +238,7 @@ def calculate_momentum(prices: List[float], period: int = 10) -> List[Optional[f
     return momentum_values
 
 
+@instrument()
 def calculate_rsi(close_prices: List[float], period: int = 14) -> List[Optional[float]]:
     """
     Вычисление индикатора RSI (Relative Strength Index)
@@ -121,32 +263,25 @@ def calculate_rsi(close_prices: List[float], period: int = 14) -> List[Optional[
 
     avg_gain = sum(gains[:period]) / period
     avg_loss = sum(losses[:period]) / period
+    rsi_values.append(rsi_value(avg_gain, avg_loss))
 
-    if avg_loss == 0:
-        first_rsi = 100
-    else:
-        rs = avg_gain / avg_loss
-        first_rsi = 100 - (100 / (1 + rs))
-
-    rsi_values.append(first_rsi)
+    for gain, loss in zip(gains[period:], losses[period:]):
+        avg_gain = wilder_step(avg_gain, gain, period)
+        avg_loss = wilder_step(avg_loss, loss, period)
+        rsi_values.append(rsi_value(avg_gain, avg_loss))
 
-    for i in range(period, len(gains)):
-        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+    return rsi_values
 
-        if avg_loss == 0:
-            rsi = 100
-        else:
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
 
-        rsi_values.append(rsi)
+def _cached_ema(prices: List[float], period: int, cache) -> List[Optional[float]]:
+    if cache is None:
+        return calculate_ema(prices, period)
+    return cache.ema_list(prices, period)
 
-    return rsi_values
 
-
-def calculate_macd(close_prices: List[float], fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[
-    List[Optional[float]], List[Optional[float]], List[Optional[float]]]:
+@instrument()
+def calculate_macd(close_prices: List[float], fast: int = 12, slow: int = 26, signal: int = 9,
+                   cache=None) -> Tuple[List[Optional[float]], List[Optional[float]], List[Optional[float]]]:
     """
     Вычисление индикатора MACD
 
@@ -155,12 +290,13 @@ def calculate_macd(close_prices: List[float], fast: int = 12, slow: int = 26, si
         fast: период быстрой EMA
         slow: период медленной EMA
         signal: период сигнальной линии
+        cache: IndicatorCache, из которого берутся быстрая и медленная EMA
 
     Returns:
         Кортеж: (macd_line, signal_line, histogram)
     """
-    ema_fast = calculate_ema(close_prices, fast)
-    ema_slow = calculate_ema(close_prices, slow)
+    ema_fast = _cached_ema(close_prices, fast, cache)
+    ema_slow = _cached_ema(close_prices, slow, cache)
 
     macd_line = []
     for i in range(len(close_prices)):
@@ -181,16 +317,20 @@ def calculate_macd(close_prices: List[float], fast: int = 12, slow: int = 26, si
     return macd_line, signal_line, histogram
 
 
+@instrument()
 def calculate_bull_bear_power(
         high_prices: List[float],
         low_prices: List[float],
         close_prices: List[float],
-        period: int = 13
+        period: int = 13,
+        cache=None
 ) -> tuple:
     """
     Вычисление индикатора Bull Bear Power
+
+    EMA цен закрытия берётся из cache (IndicatorCache), если он передан.
     """
-    ema_close = calculate_ema(close_prices, period)
+    ema_close = _cached_ema(close_prices, period, cache)
 
     bull_power = []
     bear_power = []
@@ -206,6 +346,52 @@ def calculate_bull_bear_power(
     return bull_power, bear_power
 
 
+def true_range(high: float, low: float, prev_close: Optional[float]) -> float:
+    """
+    True range бара: max(high - low, |high - close[-1]|, |low - close[-1]|),
+    без предыдущего закрытия — high - low
+    """
+    if prev_close is None:
+        return high - low
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+@instrument()
+def calculate_atr(
+        high_prices: List[float],
+        low_prices: List[float],
+        close_prices: List[float],
+        period: int = 14
+) -> List[Optional[float]]:
+    """
+    Вычисление индикатора ATR (Average True Range)
+
+    True range считается через true_range, первое значение ATR — среднее
+    первых period значений, далее сглаживание Уайлдера (wilder_step), как
+    в calculate_rsi и StreamingATR.
+
+    Returns:
+        Список значений ATR
+    """
+    if len(close_prices) < period:
+        return [None] * len(close_prices)
+
+    true_ranges = [true_range(high_prices[0], low_prices[0], None)]
+    for high, low, prev_close in zip(high_prices[1:], low_prices[1:], close_prices):
+        true_ranges.append(true_range(high, low, prev_close))
+
+    atr_values = [None] * (period - 1)
+    atr = sum(true_ranges[:period]) / period
+    atr_values.append(atr)
+
+    for value in true_ranges[period:]:
+        atr = wilder_step(atr, value, period)
+        atr_values.append(atr)
+
+    return atr_values
+
+
+@instrument()
 def generate_btc_price_data(days: int = 100) -> tuple:
     """
     Генерация тестовых данных цен для BTC
@@ -243,6 +429,7 @@ def generate_btc_price_data(days: int = 100) -> tuple:
     return close_prices, high_prices, low_prices
 
 
+@instrument()
 def plot_results(
         close_prices: List[float],
         momentum_values: List[Optional[float]],
@@ -255,159 +442,22 @@ def plot_results(
 ):
     """
     Простая текстовая визуализация результатов (без графиков)
-    """
-    print("\n" + "=" * 70)
-    print("ТЕКСТОВАЯ ВИЗУАЛИЗАЦИЯ РЕЗУЛЬТАТОВ")
-    print("=" * 70)
-
-    days_to_show = 30
-    start_idx = max(0, len(close_prices) - days_to_show)
-
-    print("\nСимвольный график цены (последние 30 дней):")
-    print("-" * 70)
-
-    display_prices = close_prices[start_idx:]
-    min_price = min(display_prices)
-    max_price = max(display_prices)
-
-    for i, price in enumerate(display_prices):
-        normalized = int(((price - min_price) / (max_price - min_price)) * 50) if max_price > min_price else 25
-        day_num = start_idx + i + 1
-        price_str = f"{price:.2f}"
-        graph_bar = "█" * (normalized + 1)
-
-        trend_marker = ""
-        if i > 0:
-            if price > display_prices[i - 1]:
-                trend_marker = "↗"
-            elif price < display_prices[i - 1]:
-                trend_marker = "↘"
-            else:
-                trend_marker = "→"
-
-        print(f"День {day_num:3d}: {trend_marker} {price_str} {graph_bar}")
-
-    if rsi_values:
-        print("\n" + "=" * 70)
-        print("Индикатор RSI (последние 30 дней):")
-        print("=" * 70)
-
-        rsi_display = rsi_values[start_idx:]
-        for i, rsi in enumerate(rsi_display):
-            day_num = start_idx + i + 1
-            if rsi is None:
-                rsi_str = "N/A"
-                bar = ""
-            else:
-                rsi_str = f"{rsi:.2f}"
-
-                if rsi > 70:
-                    level = "Перекупленность"
-                elif rsi < 30:
-                    level = "Перепроданность"
-                else:
-                    level = "Нейтрально"
-
-                bar_length = min(20, int(abs(rsi - 50) / 2.5))
-                if rsi > 50:
-                    bar = "█" * bar_length + f" ↑ {level}"
-                else:
-                    bar = " " * (20 - bar_length) + "█" * bar_length + f" ↓ {level}"
-
-            print(f"День {day_num:3d}: RSI: {rsi_str:6s} {bar}")
-
-    if macd_line and signal_line and histogram:
-        print("\n" + "=" * 70)
-        print("Индикатор MACD (последние 30 дней):")
-        print("=" * 70)
-
-        macd_display = macd_line[start_idx:]
-        signal_display = signal_line[start_idx:]
-        hist_display = histogram[start_idx:]
-
-        for i in range(len(macd_display)):
-            day_num = start_idx + i + 1
-            macd_val = macd_display[i]
-            signal_val = signal_display[i]
-            hist_val = hist_display[i]
-
-            if macd_val is None or signal_val is None or hist_val is None:
-                print(f"День {day_num:3d}: MACD: N/A | Signal: N/A | Hist: N/A")
-            else:
-                macd_str = f"{macd_val:+.2f}"
-                signal_str = f"{signal_val:+.2f}"
-                hist_str = f"{hist_val:+.2f}"
-
-                if hist_val > 0:
-                    signal = "Бычий"
-                else:
-                    signal = "Медвежий"
-
-                if i > 0 and macd_display[i - 1] is not None and signal_display[i - 1] is not None:
-                    if macd_val > signal_val and macd_display[i - 1] <= signal_display[i - 1]:
-                        cross = "↑ Пересечение вверх"
-                    elif macd_val < signal_val and macd_display[i - 1] >= signal_display[i - 1]:
-                        cross = "↓ Пересечение вниз"
-                    else:
-                        cross = ""
-                else:
-                    cross = ""
-
-                print(
-                    f"День {day_num:3d}: MACD: {macd_str} | Signal: {signal_str} | Hist: {hist_str} [{signal}] {cross}")
-
-    print("\n" + "=" * 70)
-    print("Символьные графии индикаторов (последние 30 дней):")
-    print("=" * 70)
-
-    print("\nMomentum:")
-    momentum_display = momentum_values[start_idx:]
-    momentum_clean = [0 if v is None else v for v in momentum_display]
-    mom_min = min(momentum_clean)
-    mom_max = max(momentum_clean)
-
-    for i, mom in enumerate(momentum_display):
-        if mom is None:
-            bar = " " * 25 + "N/A"
-        else:
-            normalized = int(((mom - mom_min) / (mom_max - mom_min)) * 25) if mom_max > mom_min else 12
-            bar = (" " * (12 - normalized // 2)) + "█" * normalized
-            if mom > 0:
-                bar += " [+]"
-            else:
-                bar += " [-]"
-
-        day_num = start_idx + i + 1
-        mom_str = f"{mom:.2f}" if mom is not None else "      N/A     "
-        print(f"День {day_num:3d}: {mom_str} {bar}")
-
-    print("\nBull/Bear Power:")
-    bull_display = bull_power[start_idx:]
-    bear_display = bear_power[start_idx:]
-
-    for i in range(len(bull_display)):
-        bull = bull_display[i]
-        bear = bear_display[i]
-        day_num = start_idx + i + 1
-
-        if bull is None or bear is None:
-            print(f"День {day_num:3d}: Bull: N/A | Bear: N/A")
-        else:
-            bull_str = f"{bull:+.2f}"
-            bear_str = f"{bear:+.2f}"
-
-            bull_strength = ""
-            bear_strength = ""
-
 
-            if bull > 0:
-                bull_strength = "█" * min(10, int(abs(bull) / 100))
-            if bear < 0:
-                bear_strength = "█" * min(10, int(abs(bear) / 100))
-
-            print(f"День {day_num:3d}: Bull: {bull_str} {bull_strength:10s} | Bear: {bear_str} {bear_strength:10s}")
+    Отчёт собирается в один буфер (renderer.render_report) и выводится одной записью.
+    """
+    sys.stdout.write(render_report(
+        close_prices,
+        momentum_values,
+        bull_power,
+        bear_power,
+        rsi_values,
+        macd_line,
+        signal_line,
+        histogram
+    ))
 
 
+@instrument()
 def main():
     """Основная функция для тестирования"""
     print("=" * 60)
@@ -460,42 +510,44 @@ def main():
     print("Анализ сигналов:")
     print(f"{'=' * 60}")
 
-    mom_signals = []
-    for i in range(momentum_period + 1, days - 1):
-        if momentum_values[i] is not None and momentum_values[i - 1] is not None:
-            if momentum_values[i] > 0 and momentum_values[i - 1] <= 0:
-                mom_signals.append((i, "BUY", momentum_values[i]))
-            elif momentum_values[i] < 0 and momentum_values[i - 1] >= 0:
-                mom_signals.append((i, "SELL", momentum_values[i]))
-
-    rsi_signals = []
-    for i in range(rsi_period + 1, days - 1):
-        if rsi_values[i] is not None and rsi_values[i - 1] is not None:
-            if rsi_values[i] < 30 and rsi_values[i - 1] >= 30:
-                rsi_signals.append((i, "Перепродано (BUY)", rsi_values[i]))
-            elif rsi_values[i] > 70 and rsi_values[i - 1] <= 70:
-                rsi_signals.append((i, "Перекуплено (SELL)", rsi_values[i]))
-
-    macd_signals = []
-    for i in range(max(macd_slow, macd_signal) + 1, days - 1):
-        if macd_line[i] is not None and signal_line[i] is not None:
-
-            if histogram[i] is not None and histogram[i - 1] is not None:
-                if histogram[i] > 0 and histogram[i - 1] <= 0:
-                    macd_signals.append((i, "Histogram ↑ (BUY)", macd_line[i], histogram[i]))
-                elif histogram[i] < 0 and histogram[i - 1] >= 0:
-                    macd_signals.append((i, "Histogram ↓ (SELL)", macd_line[i], histogram[i]))
-
-
-    bbp_signals = []
-    for i in range(bbp_period + 1, days - 1):
-        if bull_power[i] is not None and bear_power[i] is not None:
-            if bull_power[i] > 0 and bear_power[i] > 0:
-                bbp_signals.append((i, "Сильный бычий", bull_power[i], bear_power[i]))
-            elif bull_power[i] < 0 and bear_power[i] < 0:
-                bbp_signals.append((i, "Сильный медвежий", bull_power[i], bear_power[i]))
-            elif bull_power[i] > 0 > bear_power[i]:
-                bbp_signals.append((i, "Борьба", bull_power[i], bear_power[i]))
+    with stage("signals", bars=days):
+        mom_signals = []
+        for i in range(momentum_period + 1, days - 1):
+            if momentum_values[i] is not None and momentum_values[i - 1] is not None:
+                if momentum_values[i] > 0 and momentum_values[i - 1] <= 0:
+                    mom_signals.append((i, "BUY", momentum_values[i]))
+                elif momentum_values[i] < 0 and momentum_values[i - 1] >= 0:
+                    mom_signals.append((i, "SELL", momentum_values[i]))
+
+        rsi_signals = []
+        for i in range(rsi_period + 1, days - 1):
+            if rsi_values[i] is not None and rsi_values[i - 1] is not None:
+                if rsi_values[i] < 30 and rsi_values[i - 1] >= 30:
+                    rsi_signals.append((i, "Перепродано (BUY)", rsi_values[i]))
+                elif rsi_values[i] > 70 and rsi_values[i - 1] <= 70:
+                    rsi_signals.append((i, "Перекуплено (SELL)", rsi_values[i]))
+
+        macd_signals = []
+        for i in range(max(macd_slow, macd_signal) + 1, days - 1):
+            if macd_line[i] is not None and signal_line[i] is not None:
+
+                if histogram[i] is not None and histogram[i - 1] is not None:
+                    if histogram[i] > 0 and histogram[i - 1] <= 0:
+                        macd_signals.append((i, "Histogram ↑ (BUY)", macd_line[i], histogram[i]))
+                    elif histogram[i] < 0 and histogram[i - 1] >= 0:
+                        macd_signals.append((i, "Histogram ↓ (SELL)", macd_line[i], histogram[i]))
+
+
+        bbp_signals = []
+        for i in range(bbp_period + 1, days - 1):
+            if bull_power[i] is not None and bear_power[i] is not None:
+                if bull_power[i] > 0 and bear_power[i] > 0:
+                    bbp_signals.append((i, "Сильный бычий", bull_power[i], bear_power[i]))
+                elif bull_power[i] < 0 and bear_power[i] < 0:
+                    bbp_signals.append((i, "Сильный медвежий", bull_power[i], bear_power[i]))
+                elif bull_power[i] > 0 > bear_power[i]:
+                    bbp_signals.append((i, "Борьба", bull_power[i], bear_power[i]))
+
 
     print(f"\nСигналы Momentum (пересечение нуля):")
     for signal in mom_signals[-10:]:
@@ -531,46 +583,50 @@ def main():
     print("Статистика:")
     print(f"{'=' * 60}")
 
-    valid_momentum = [m for m in momentum_values if m is not None]
-    valid_bull = [b for b in bull_power if b is not None]
-    valid_bear = [b for b in bear_power if b is not None]
-    valid_rsi = [r for r in rsi_values if r is not None]
-    valid_macd = [m for m in macd_line if m is not None]
-    valid_hist = [h for h in histogram if h is not None]
-
-    if valid_momentum:
-        print(f"Momentum:")
-        print(f"  Среднее: {sum(valid_momentum) / len(valid_momentum):.2f}")
-        print(f"  Максимум: {max(valid_momentum):.2f}")
-        print(f"  Минимум: {min(valid_momentum):.2f}")
-
-    if valid_rsi:
-        print(f"\nRSI:")
-        print(f"  Среднее: {sum(valid_rsi) / len(valid_rsi):.2f}")
-        print(f"  Максимум: {max(valid_rsi):.2f}")
-        print(f"  Минимум: {min(valid_rsi):.2f}")
-        print(f"  Дней в перекупленности (>70): {sum(1 for r in valid_rsi if r > 70)}")
-        print(f"  Дней в перепроданности (<30): {sum(1 for r in valid_rsi if r < 30)}")
-
-    if valid_macd:
-        print(f"\nMACD:")
-        print(f"  Среднее: {sum(valid_macd) / len(valid_macd):.2f}")
-        print(f"  Максимум: {max(valid_macd):.2f}")
-        print(f"  Минимум: {min(valid_macd):.2f}")
-        print(f"  Положительных значений: {sum(1 for m in valid_macd if m > 0)}/{len(valid_macd)}")
-
-    if valid_hist:
-        print(f"\nMACD Гистограмма:")
-        print(f"  Положительных значений: {sum(1 for h in valid_hist if h > 0)}/{len(valid_hist)}")
-
-    if valid_bull and valid_bear:
-        print(f"\nBull Power:")
-        print(f"  Положительных значений: {sum(1 for b in valid_bull if b > 0)}/{len(valid_bull)}")
-        print(f"  Среднее: {sum(valid_bull) / len(valid_bull):.2f}")
-
-        print(f"\nBear Power:")
-        print(f"  Отрицательных значений: {sum(1 for b in valid_bear if b < 0)}/{len(valid_bear)}")
-        print(f"  Среднее: {sum(valid_bear) / len(valid_bear):.2f}")
+    with stage("statistics", bars=days):
+        momentum_stats = RunningStats().update(momentum_values)
+        bull_stats = RunningStats().update(bull_power)
+        bear_stats = RunningStats().update(bear_power)
+        rsi_stats = RunningStats(above=(70,), below=(30,)).update(rsi_values)
+        macd_stats = RunningStats().update(macd_line)
+        hist_stats = RunningStats().update(histogram)
+
+    # Вывод отдельным этапом, чтобы время статистики не включало консольный ввод-вывод
+    with stage("report"):
+        if momentum_stats:
+            print(f"Momentum:")
+            print(f"  Среднее: {momentum_stats.mean:.2f}")
+            print(f"  Максимум: {momentum_stats.max:.2f}")
+            print(f"  Минимум: {momentum_stats.min:.2f}")
+
+        if rsi_stats:
+            print(f"\nRSI:")
+            print(f"  Среднее: {rsi_stats.mean:.2f}")
+            print(f"  Максимум: {rsi_stats.max:.2f}")
+            print(f"  Минимум: {rsi_stats.min:.2f}")
+            print(f"  Дней в перекупленности (>70): {rsi_stats.count_above(70)}")
+            print(f"  Дней в перепроданности (<30): {rsi_stats.count_below(30)}")
+
+        if macd_stats:
+            print(f"\nMACD:")
+            print(f"  Среднее: {macd_stats.mean:.2f}")
+            print(f"  Максимум: {macd_stats.max:.2f}")
+            print(f"  Минимум: {macd_stats.min:.2f}")
+            print(f"  Положительных значений: {macd_stats.positive}/{macd_stats.count}")
+
+        if hist_stats:
+            print(f"\nMACD Гистограмма:")
+            print(f"  Положительных значений: {hist_stats.positive}/{hist_stats.count}")
+
+        if bull_stats and bear_stats:
+            print(f"\nBull Power:")
+            print(f"  Положительных значений: {bull_stats.positive}/{bull_stats.count}")
+            print(f"  Среднее: {bull_stats.mean:.2f}")
+
+            print(f"\nBear Power:")
+            print(f"  Отрицательных значений: {bear_stats.negative}/{bear_stats.count}")
+            print(f"  Среднее: {bear_stats.mean:.2f}")
+
 
     print("\n" + "=" * 60)
     print("Краткий отчёт:")
@@ -616,4 +672,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+
+    if instrumentation.is_enabled():
+        print()
+        print(instrumentation.summary())
\ No newline at end of file
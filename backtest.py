@@ -0,0 +1,186 @@
+"""
+Векторизованный бэктест сигналов индикаторов.
+
+Сигналы — массивы направлений (+1 BUY, -1 SELL, 0 — нет сигнала) той же
+формы, что и цены: (bars,) или (symbols, bars). Позиция открывается по
+цене закрытия бара сигнала и держится до следующего сигнала, доходность
+позиции начисляется со следующего бара. Комиссия и проскальзывание
+списываются пропорционально обороту (изменению позиции).
+"""
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+from signal_scanner import SignalScanner, signal_array
+
+
+def signals_from_indicators(indicators: Mapping[str, np.ndarray], rsi_levels=(30, 70)) -> Dict[str, np.ndarray]:
+    """
+    Массивы направлений по правилам main() из колонок индикаторов
+
+    Args:
+        indicators: колонки как в UniverseResult.columns (momentum, rsi,
+            macd_hist, bull_power, bear_power)
+
+    Returns:
+        Словарь правило -> массив направлений int8
+    """
+    shape = np.shape(next(iter(indicators.values())))
+    events = SignalScanner().scan(dict(indicators), rsi_levels)
+    return {rule: signal_array(rule_events, shape, rule) for rule, rule_events in events.items()}
+
+
+def combine_signals(signals: Mapping[str, np.ndarray], weights: Optional[Mapping[str, float]] = None) -> np.ndarray:
+    """
+    Голосование правил: знак взвешенной суммы направлений на каждом баре
+    """
+    total = None
+    for rule, values in signals.items():
+        weighted = values * (1.0 if weights is None else weights.get(rule, 0.0))
+        total = weighted if total is None else total + weighted
+    return np.sign(total).astype(np.int8)
+
+
+def _last_index(mask: np.ndarray) -> np.ndarray:
+    """Индекс последнего бара с mask = True до текущего включительно (-1, если его нет)"""
+    last = np.where(mask, np.arange(mask.shape[-1]), -1)
+    np.maximum.accumulate(last, axis=-1, out=last)
+    return last
+
+
+def forward_fill(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    Протягивание последнего значения с valid = True вперёд; до первого такого бара — NaN
+    """
+    last = _last_index(valid)
+    filled = np.take_along_axis(np.asarray(values, dtype=np.float64), np.maximum(last, 0), axis=-1)
+    filled[last < 0] = np.nan
+    return filled
+
+
+def positions_from_signals(signals: np.ndarray, allow_short: bool = True,
+                           valid: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Позиция на каждом баре: последний ненулевой сигнал, протянутый вперёд
+
+    Без коротких позиций сигнал SELL закрывает позицию (0). Сигналы на
+    барах с valid = False (нет цены) пропускаются, и позиция переносится
+    через пропуски внутри истории без изменений. Если история ряда
+    кончается раньше массива, позиция закрывается на последнем баре с
+    valid = True.
+    """
+    signals = np.asarray(signals)
+    active = signals != 0
+    if valid is not None:
+        active &= valid
+
+    positions = forward_fill(signals, active)
+    positions[np.isnan(positions)] = 0.0
+
+    if valid is not None:
+        last_valid = _last_index(valid)[..., -1:]
+        ended = (np.arange(positions.shape[-1]) >= last_valid) & (last_valid < positions.shape[-1] - 1)
+        positions[ended] = 0.0
+
+    if not allow_short:
+        np.maximum(positions, 0.0, out=positions)
+    return positions
+
+
+class BacktestResult:
+    """
+    Результат бэктеста: все ряды той же формы, что и цены
+
+    Attributes:
+        positions: позиция после закрытия бара
+        returns: чистая доходность стратегии на баре
+        equity: кривая капитала
+        drawdown: просадка от предыдущего максимума капитала (<= 0)
+        turnover: оборот на баре (|изменение позиции|)
+        costs: издержки на баре (комиссия + проскальзывание)
+    """
+
+    def __init__(self, positions: np.ndarray, returns: np.ndarray, equity: np.ndarray,
+                 drawdown: np.ndarray, turnover: np.ndarray, costs: np.ndarray,
+                 initial_capital: float, bars_per_year: int):
+        self.positions = positions
+        self.returns = returns
+        self.equity = equity
+        self.drawdown = drawdown
+        self.turnover = turnover
+        self.costs = costs
+        self.initial_capital = initial_capital
+        self.bars_per_year = bars_per_year
+
+    def stats(self) -> Dict[str, np.ndarray]:
+        """
+        Итоговые показатели (скаляры для одного ряда, массивы по инструментам для матрицы)
+        """
+        mean = self.returns.mean(axis=-1)
+        std = self.returns.std(axis=-1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(std > 0, mean / std * np.sqrt(self.bars_per_year), np.nan)
+
+        return {
+            "total_return": self.equity[..., -1] / self.initial_capital - 1,
+            "annual_return": (1 + mean) ** self.bars_per_year - 1,
+            "sharpe": sharpe,
+            "max_drawdown": self.drawdown.min(axis=-1),
+            "turnover": self.turnover.sum(axis=-1),
+            "trades": np.count_nonzero(self.turnover, axis=-1),
+            "costs": self.costs.sum(axis=-1),
+            "exposure": np.mean(self.positions != 0, axis=-1),
+        }
+
+
+def run_backtest(
+        close_prices: np.ndarray,
+        signals: np.ndarray,
+        fee: float = 0.001,
+        slippage: float = 0.0005,
+        allow_short: bool = True,
+        initial_capital: float = 1.0,
+        bars_per_year: int = 365
+) -> BacktestResult:
+    """
+    Бэктест направлений signals на ценах закрытия
+
+    Args:
+        close_prices: цены (bars,) или (symbols, bars), NaN вне истории
+        signals: направления той же формы (+1 BUY, -1 SELL, 0)
+        fee: комиссия на единицу оборота
+        slippage: проскальзывание на единицу оборота
+        allow_short: разрешены ли короткие позиции
+        initial_capital: начальный капитал
+        bars_per_year: баров в году для годовых показателей
+
+    Returns:
+        BacktestResult
+    """
+    close_prices = np.asarray(close_prices, dtype=np.float64)
+
+    # На барах без цены позиция не открывается и не меняется, а изменение
+    # цены за пропуск начисляется на первом баре после него; после конца
+    # истории ряда позиции нет
+    priced = ~np.isnan(close_prices)
+    positions = positions_from_signals(signals, allow_short, valid=priced)
+    filled_prices = forward_fill(close_prices, priced)
+
+    price_returns = np.zeros(close_prices.shape)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        price_returns[..., 1:] = filled_prices[..., 1:] / filled_prices[..., :-1] - 1
+    np.nan_to_num(price_returns, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+
+    held = np.zeros(positions.shape)
+    held[..., 1:] = positions[..., :-1]
+
+    turnover = np.abs(positions - held)
+    costs = turnover * (fee + slippage)
+    returns = held * price_returns - costs
+
+    equity = initial_capital * np.cumprod(1 + returns, axis=-1)
+    peak = np.maximum.accumulate(equity, axis=-1)
+    drawdown = equity / peak - 1
+
+    return BacktestResult(positions, returns, equity, drawdown, turnover, costs, initial_capital, bars_per_year)
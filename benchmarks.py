@@ -0,0 +1,415 @@
+"""
+Бенчмарки индикаторов.
+
+benchmark_sma — сравнение скользящей SMA с прежней реализацией срезами.
+run_suite — все индикаторы и поиск сигналов на обоих бэкендах (чистый
+Python из algotradesim и NumPy из indicators_np) на рядах от 1e3 до 1e7
+баров и нескольких периодах: пропускная способность (баров/с) и пиковый
+объём выделенной памяти (tracemalloc). Результаты сохраняются в JSON и
+сравниваются с сохранённым базовым прогоном; падение скорости или рост
+памяти больше допуска считается регрессией (код выхода 1).
+
+    python benchmarks.py --update-baseline      # базовый прогон на эталонной машине
+    python benchmarks.py                        # прогон и сравнение с базой
+    python benchmarks.py --sizes 1000 100000 --backends numpy
+    python benchmarks.py --sma                  # прежний бенчмарк SMA
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import algotradesim
+import indicators_np
+from algotradesim import calculate_sma
+from signal_scanner import SignalScanner
+
+BACKENDS = ("python", "numpy")
+SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+PERIODS = (10, 50, 200)
+
+# Чистый Python на 1e7 баров идёт минутами, по умолчанию он ограничен 1e6
+PYTHON_MAX_BARS = 1_000_000
+
+DEFAULT_OUTPUT = "benchmark_results.json"
+DEFAULT_BASELINE = "benchmark_baseline.json"
+DEFAULT_TOLERANCE = 0.25
+
+# Рост пиковой памяти меньше этого порога не считается регрессией
+ALLOCATION_NOISE = 64 * 1024
+
+# Число None/NaN в начале ряда для calculate_ema_with_none (как у MACD 12/26)
+EMA_WITH_NONE_WARMUP = 25
+
+# Индикаторы, которые прогоняются по всем периодам; остальные — с параметрами по умолчанию
+PERIODIC = ("calculate_sma", "calculate_ema", "calculate_ema_with_none", "calculate_rsi",
+            "calculate_momentum", "calculate_bull_bear_power", "calculate_stddev",
+            "calculate_bollinger_bands", "calculate_atr")
+
+
+def calculate_sma_reference(prices: List[float], period: int) -> List[Optional[float]]:
+    """
+    Прежняя реализация SMA: срез окна и sum() на каждом баре, O(n·period)
+    """
+    if len(prices) < period:
+        return [None] * len(prices)
+
+    sma_values = []
+    for i in range(len(prices)):
+        if i < period - 1:
+            sma_values.append(None)
+        else:
+            window = prices[i - period + 1: i + 1]
+            sma = sum(window) / period
+            sma_values.append(sma)
+
+    return sma_values
+
+
+def time_call(func: Callable, *args, repeat: int = 3) -> float:
+    """
+    Лучшее время (в секундах) из нескольких запусков функции
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_sma(
+        lengths: Tuple[int, ...] = (10_000, 100_000, 1_000_000),
+        periods: Tuple[int, ...] = (10, 50, 200),
+        seed: int = 42
+) -> List[dict]:
+    """
+    Сравнение скользящей SMA с прежней реализацией
+
+    Returns:
+        Список строк результатов: длина, период, время обеих версий и ускорение
+    """
+    rng = random.Random(seed)
+    results = []
+
+    for length in lengths:
+        prices = [50000.0 + rng.uniform(-5000.0, 5000.0) for _ in range(length)]
+
+        for period in periods:
+            reference_time = time_call(calculate_sma_reference, prices, period, repeat=1)
+            rolling_time = time_call(calculate_sma, prices, period)
+
+            results.append({
+                "length": length,
+                "period": period,
+                "reference_s": reference_time,
+                "rolling_s": rolling_time,
+                "speedup": reference_time / rolling_time if rolling_time > 0 else float("inf"),
+            })
+
+    return results
+
+
+def make_price_data(length: int, seed: int = 42) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Случайное блуждание цен (close, high, low) длиной length
+
+    Логарифмические приращения, поэтому цены не уходят в ноль и в
+    денормализованные числа на 1e7 баров.
+    """
+    rng = np.random.default_rng(seed)
+    close = 50000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, length)))
+    high = close * (1 + rng.uniform(0.0, 0.02, length))
+    low = close * (1 - rng.uniform(0.0, 0.02, length))
+    return close, high, low
+
+
+def _python_cases(close: np.ndarray, high: np.ndarray, low: np.ndarray) -> Dict[str, Callable]:
+    close, high, low = close.tolist(), high.tolist(), low.tolist()
+    with_none = [None] * EMA_WITH_NONE_WARMUP + close[EMA_WITH_NONE_WARMUP:]
+
+    return {
+        "calculate_sma": lambda period: algotradesim.calculate_sma(close, period),
+        "calculate_ema": lambda period: algotradesim.calculate_ema(close, period),
+        "calculate_ema_with_none": lambda period: algotradesim.calculate_ema_with_none(with_none, period),
+        "calculate_rsi": lambda period: algotradesim.calculate_rsi(close, period),
+        "calculate_macd": lambda period: algotradesim.calculate_macd(close),
+        "calculate_momentum": lambda period: algotradesim.calculate_momentum(close, period),
+        "calculate_bull_bear_power": lambda period: algotradesim.calculate_bull_bear_power(high, low, close, period),
+        "calculate_stddev": lambda period: algotradesim.calculate_stddev(close, period),
+        "calculate_bollinger_bands": lambda period: algotradesim.calculate_bollinger_bands(close, period),
+        "calculate_atr": lambda period: algotradesim.calculate_atr(high, low, close, period),
+    }
+
+
+def _numpy_cases(close: np.ndarray, high: np.ndarray, low: np.ndarray) -> Dict[str, Callable]:
+    with_nan = close.copy()
+    with_nan[:EMA_WITH_NONE_WARMUP] = np.nan
+
+    macd_line, signal_line, histogram = indicators_np.calculate_macd(close)
+    bull_power, bear_power = indicators_np.calculate_bull_bear_power(high, low, close)
+    indicators = {
+        "momentum": indicators_np.calculate_momentum(close),
+        "rsi": indicators_np.calculate_rsi(close),
+        "macd_hist": histogram,
+        "bull_power": bull_power,
+        "bear_power": bear_power,
+    }
+    scanner = SignalScanner()
+
+    return {
+        "calculate_sma": lambda period: indicators_np.calculate_sma(close, period),
+        "calculate_ema": lambda period: indicators_np.calculate_ema(close, period),
+        "calculate_ema_with_none": lambda period: indicators_np.calculate_ema_with_nan(with_nan, period),
+        "calculate_rsi": lambda period: indicators_np.calculate_rsi(close, period),
+        "calculate_macd": lambda period: indicators_np.calculate_macd(close),
+        "calculate_momentum": lambda period: indicators_np.calculate_momentum(close, period),
+        "calculate_bull_bear_power": lambda period: indicators_np.calculate_bull_bear_power(high, low, close, period),
+        "calculate_stddev": lambda period: indicators_np.calculate_stddev(close, period),
+        "calculate_bollinger_bands": lambda period: indicators_np.calculate_bollinger_bands(close, period),
+        "calculate_atr": lambda period: indicators_np.calculate_atr(high, low, close, period),
+        "scan_signals": lambda period: scanner.scan(indicators),
+    }
+
+
+def measure(func: Callable, repeat: int = 3, min_time: float = 0.05) -> float:
+    """
+    Лучшее время одного вызова func() в секундах
+
+    Быстрые вызовы повторяются в цикле, пока замер не займёт min_time,
+    чтобы на рядах в 1e3 баров не мерить разрешение таймера.
+    """
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+
+    loops = max(1, int(min_time / elapsed)) if elapsed > 0 else 1000
+    best = elapsed
+    for _ in range(repeat - 1 if loops == 1 else repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+
+def peak_allocation(func: Callable) -> int:
+    """
+    Пиковый объём памяти в байтах, выделенной за вызов func() (tracemalloc)
+
+    NumPy регистрирует буферы массивов в tracemalloc, поэтому учитываются
+    и списки Python, и массивы.
+    """
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        func()
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+def result_key(row: dict) -> str:
+    """Ключ строки результата для сравнения с базой"""
+    period = "-" if row["period"] is None else row["period"]
+    return f"{row['name']}/{row['backend']}/{row['bars']}/{period}"
+
+
+def run_suite(
+        sizes: Sequence[int] = SIZES,
+        periods: Sequence[int] = PERIODS,
+        backends: Sequence[str] = BACKENDS,
+        names: Optional[Sequence[str]] = None,
+        repeat: int = 3,
+        python_max_bars: int = PYTHON_MAX_BARS,
+        seed: int = 42,
+        progress: Optional[Callable[[dict], None]] = None
+) -> List[dict]:
+    """
+    Прогон всех индикаторов на всех размерах, периодах и бэкендах
+
+    Args:
+        names: ограничить набор индикаторов (имена функций и scan_signals)
+        python_max_bars: максимальная длина ряда для бэкенда python
+        progress: вызывается для каждой готовой строки результата
+
+    Returns:
+        Строки результатов: name, backend, bars, period, seconds, bars_per_s, peak_bytes
+    """
+    case_builders = {"python": _python_cases, "numpy": _numpy_cases}
+    results = []
+
+    for bars in sizes:
+        close, high, low = make_price_data(bars, seed)
+
+        for backend in backends:
+            if backend == "python" and bars > python_max_bars:
+                continue
+            cases = case_builders[backend](close, high, low)
+
+            for name, case in cases.items():
+                if names and name not in names:
+                    continue
+
+                for period in periods if name in PERIODIC else (None,):
+                    func = lambda: case(period)
+                    seconds = measure(func, repeat)
+                    row = {
+                        "name": name,
+                        "backend": backend,
+                        "bars": bars,
+                        "period": period,
+                        "seconds": seconds,
+                        "bars_per_s": bars / seconds if seconds > 0 else float("inf"),
+                        "peak_bytes": peak_allocation(func),
+                    }
+                    results.append(row)
+                    if progress:
+                        progress(row)
+
+    return results
+
+
+def save_results(path: str, results: List[dict]):
+    """Сохранение результатов в JSON вместе с описанием окружения"""
+    document = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+
+
+def load_results(path: str) -> List[dict]:
+    """Чтение результатов, сохранённых save_results"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare_results(results: List[dict], baseline: List[dict], tolerance: float = DEFAULT_TOLERANCE) -> List[dict]:
+    """
+    Сравнение с базовым прогоном
+
+    Регрессия — пропускная способность ниже базовой больше чем на
+    tolerance или пиковая память выше больше чем на tolerance (и больше
+    чем на ALLOCATION_NOISE байт). Строки без пары в базе пропускаются.
+
+    Returns:
+        Список регрессий: key, metric, baseline, current, ratio
+    """
+    reference = {result_key(row): row for row in baseline}
+    regressions = []
+
+    for row in results:
+        key = result_key(row)
+        base = reference.get(key)
+        if base is None:
+            continue
+
+        speed = row["bars_per_s"] / base["bars_per_s"]
+        if speed < 1 - tolerance:
+            regressions.append({"key": key, "metric": "bars_per_s", "baseline": base["bars_per_s"],
+                                "current": row["bars_per_s"], "ratio": speed})
+
+        growth = row["peak_bytes"] - base["peak_bytes"]
+        if growth > ALLOCATION_NOISE and row["peak_bytes"] > base["peak_bytes"] * (1 + tolerance):
+            regressions.append({"key": key, "metric": "peak_bytes", "baseline": base["peak_bytes"],
+                                "current": row["peak_bytes"],
+                                "ratio": row["peak_bytes"] / max(base["peak_bytes"], 1)})
+
+    return regressions
+
+
+def format_row(row: dict) -> str:
+    """Строка таблицы результатов"""
+    period = "-" if row["period"] is None else row["period"]
+    return (f"{row['name']:<26} {row['backend']:<7} {row['bars']:>10} {period:>6} "
+            f"{row['seconds']:>10.5f} {row['bars_per_s']:>14,.0f} {row['peak_bytes'] / 2 ** 20:>10.2f}")
+
+
+def print_sma_comparison():
+    """Запуск бенчмарка SMA"""
+    print("=" * 70)
+    print("Бенчмарк SMA: срез окна vs скользящая сумма")
+    print("=" * 70)
+    print(f"{'Баров':>10} {'Период':>7} {'Срез, с':>10} {'Скольз., с':>11} {'Ускорение':>10}")
+    print("-" * 70)
+
+    for row in benchmark_sma():
+        print(f"{row['length']:>10} {row['period']:>7} {row['reference_s']:>10.4f} "
+              f"{row['rolling_s']:>11.4f} {row['speedup']:>9.1f}x")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Запуск набора бенчмарков из командной строки
+
+    Returns:
+        Код выхода: 1, если найдены регрессии относительно базы
+    """
+    parser = argparse.ArgumentParser(description="Бенчмарки индикаторов")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--periods", type=int, nargs="+", default=PERIODS)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--names", nargs="+", help="только эти индикаторы")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--python-max-bars", type=int, default=PYTHON_MAX_BARS)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="куда сохранить результаты")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="базовый прогон для сравнения")
+    parser.add_argument("--update-baseline", action="store_true", help="записать результаты как новую базу")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--sma", action="store_true", help="прежний бенчмарк SMA")
+    args = parser.parse_args(argv)
+
+    if args.sma:
+        print_sma_comparison()
+        return 0
+
+    header = (f"{'Индикатор':<26} {'Бэкенд':<7} {'Баров':>10} {'Период':>6} "
+              f"{'Время, с':>10} {'Баров/с':>14} {'Пик, МиБ':>10}")
+    print(header)
+    print("-" * len(header))
+
+    results = run_suite(args.sizes, args.periods, args.backends, args.names, args.repeat,
+                        args.python_max_bars, progress=lambda row: print(format_row(row), flush=True))
+    save_results(args.output, results)
+    print(f"\nРезультаты сохранены в {args.output}")
+
+    if args.update_baseline:
+        save_results(args.baseline, results)
+        print(f"База обновлена: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"База {args.baseline} не найдена, сравнение пропущено (--update-baseline создаст её)")
+        return 0
+
+    regressions = compare_results(results, load_results(args.baseline), args.tolerance)
+    if not regressions:
+        print(f"Регрессий относительно {args.baseline} нет (допуск {args.tolerance:.0%})")
+        return 0
+
+    print(f"\nРегрессии относительно {args.baseline} (допуск {args.tolerance:.0%}):")
+    for regression in regressions:
+        print(f"  {regression['key']:<50} {regression['metric']:<10} "
+              f"{regression['baseline']:>14,.0f} -> {regression['current']:>14,.0f} ({regression['ratio']:.2f}x)")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+Расчёт индикаторов по блокам фиксированного размера (out-of-core).
+
+Каждый обработчик хранит между блоками только состояние рекурсии
+(последнее значение EMA, средние Уайлдера, предыдущую цену) и буфер
+прогрева (первые period цен для затравки SMA или хвост окна), поэтому
+пиковая память зависит от размера блока, а не от длины ряда. Внутри блока
+вычисления векторизованы тем же фильтром (recursive_filter), что и в indicators_np.
+Результат совпадает с расчётом целиком с точностью до округления
+(indicators_np.REFERENCE_RTOL), зоны прогрева совпадают точно.
+"""
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+import indicators_np
+from recursive_filter import linear_filter
+from universe import DEFAULT_PARAMS
+
+
+class ChunkedEMA:
+    """
+    EMA по блокам: затравка SMA первых period значений, затем рекурсия
+
+    Args:
+        period: период EMA
+        smoothing: коэффициент сглаживания (по умолчанию 2 / (period + 1),
+            для средних Уайлдера — 1 / period)
+        gap_policy: обработка NaN как в indicators_np.calculate_ema_with_nan
+            ("skip", "hold", "reset"; для сигнальной линии MACD — "skip");
+            None — NaN распространяется по рекурсии
+    """
+
+    def __init__(self, period: int = 13, smoothing: Optional[float] = None, gap_policy: Optional[str] = None):
+        if gap_policy is not None and gap_policy not in indicators_np.GAP_POLICIES:
+            raise ValueError(f"gap_policy должен быть одним из {indicators_np.GAP_POLICIES}")
+
+        self.period = period
+        self.smoothing = 2 / (period + 1) if smoothing is None else smoothing
+        self.gap_policy = gap_policy
+        self.value: Optional[float] = None
+        self._seed = np.empty(0)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        block = np.asarray(block, dtype=np.float64)
+        if self.gap_policy is None:
+            return self._process_valid(block)
+
+        valid = ~np.isnan(block)
+        if valid.all():
+            return self._process_valid(block)
+
+        result = np.full(block.shape, np.nan)
+        position = 0
+        for start, stop in indicators_np.valid_runs(valid):
+            self._gap(result[position:start])
+            result[start:stop] = self._process_valid(block[start:stop])
+            position = stop
+        self._gap(result[position:])
+        return result
+
+    def _gap(self, result: np.ndarray):
+        if not len(result):
+            return
+        if self.gap_policy == "reset":
+            self.value = None
+            self._seed = np.empty(0)
+        elif self.gap_policy == "hold" and self.value is not None:
+            result[:] = self.value
+
+    def _process_valid(self, block: np.ndarray) -> np.ndarray:
+        result = np.full(block.shape, np.nan)
+        start = 0
+
+        if self.value is None:
+            need = self.period - len(self._seed)
+            taken = block[:need]
+            self._seed = np.concatenate([self._seed, taken])
+            start = len(taken)
+
+            if len(self._seed) < self.period:
+                return result
+
+            self.value = self._seed.sum() / self.period
+            self._seed = np.empty(0)
+            result[start - 1] = self.value
+
+        if start < len(block):
+            linear_filter(block[start:], 1 - self.smoothing, self.value, self.smoothing, out=result[start:])
+            self.value = float(result[-1])
+
+        return result
+
+
+class ChunkedSMA:
+    """
+    SMA по блокам: между блоками хранится хвост из period - 1 цен
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self._tail = np.empty(0)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        block = np.asarray(block, dtype=np.float64)
+        window = np.concatenate([self._tail, block])
+        result = indicators_np.calculate_sma(window, self.period)[len(self._tail):]
+
+        self._tail = window[max(len(window) - self.period + 1, 0):].copy()
+        return result
+
+
+class ChunkedMomentum:
+    """
+    Momentum по блокам: между блоками хранится хвост из period цен
+    """
+
+    def __init__(self, period: int = 10):
+        self.period = period
+        self._tail = np.empty(0)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        block = np.asarray(block, dtype=np.float64)
+        window = np.concatenate([self._tail, block])
+        result = indicators_np.calculate_momentum(window, self.period)[len(self._tail):]
+
+        self._tail = window[max(len(window) - self.period, 0):].copy()
+        return result
+
+
+class ChunkedRSI:
+    """
+    RSI по блокам: переносятся предыдущая цена и средние Уайлдера
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._prev_close: Optional[float] = None
+        self._gain = ChunkedEMA(period, smoothing=1 / period)
+        self._loss = ChunkedEMA(period, smoothing=1 / period)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        block = np.asarray(block, dtype=np.float64)
+        result = np.full(block.shape, np.nan)
+        if not len(block):
+            return result
+
+        if self._prev_close is None:
+            changes = np.diff(block)
+            offset = 1
+        else:
+            changes = np.diff(block, prepend=self._prev_close)
+            offset = 0
+        self._prev_close = float(block[-1])
+
+        avg_gain = self._gain.process(np.maximum(changes, 0.0))
+        avg_loss = self._loss.process(np.maximum(-changes, 0.0))
+
+        rsi = result[offset:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.divide(avg_gain, avg_loss, out=rsi)
+            rsi += 1
+            np.divide(-100, rsi, out=rsi)
+            rsi += 100
+        rsi[avg_loss == 0] = 100.0
+        return result
+
+
+class ChunkedMACD:
+    """
+    MACD по блокам: три EMA со своим переносимым состоянием
+    """
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self._fast = ChunkedEMA(fast)
+        self._slow = ChunkedEMA(slow)
+        self._signal = ChunkedEMA(signal, gap_policy="skip")
+
+    def process(self, block: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        macd_line = self._fast.process(block) - self._slow.process(block)
+        signal_line = self._signal.process(macd_line)
+        return macd_line, signal_line, macd_line - signal_line
+
+
+class ChunkedBullBearPower:
+    """
+    Bull Bear Power по блокам
+    """
+
+    def __init__(self, period: int = 13):
+        self._ema = ChunkedEMA(period)
+
+    def process(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        ema_close = self._ema.process(close)
+        return np.asarray(high, dtype=np.float64) - ema_close, np.asarray(low, dtype=np.float64) - ema_close
+
+
+class ChunkedIndicators:
+    """
+    Все индикаторы main() по блокам с общим набором периодов
+
+    Колонки результата совпадают с universe.COLUMNS.
+    """
+
+    def __init__(self, **params):
+        unknown = set(params) - set(DEFAULT_PARAMS)
+        if unknown:
+            raise ValueError(f"Неизвестные параметры: {sorted(unknown)}")
+        settings = {**DEFAULT_PARAMS, **params}
+
+        self.bars_processed = 0
+        self._momentum = ChunkedMomentum(settings["momentum_period"])
+        self._bbp = ChunkedBullBearPower(settings["bbp_period"])
+        self._rsi = ChunkedRSI(settings["rsi_period"])
+        self._macd = ChunkedMACD(settings["macd_fast"], settings["macd_slow"], settings["macd_signal"])
+
+    def process(self, close: np.ndarray, high: Optional[np.ndarray] = None,
+                low: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        close = np.asarray(close, dtype=np.float64)
+        high = close if high is None else high
+        low = close if low is None else low
+
+        bull_power, bear_power = self._bbp.process(high, low, close)
+        macd_line, signal_line, histogram = self._macd.process(close)
+        self.bars_processed += len(close)
+
+        return {
+            "close": close,
+            "momentum": self._momentum.process(close),
+            "bull_power": bull_power,
+            "bear_power": bear_power,
+            "rsi": self._rsi.process(close),
+            "macd": macd_line,
+            "macd_signal": signal_line,
+            "macd_hist": histogram,
+        }
+
+
+def iter_blocks(close: np.ndarray, high: Optional[np.ndarray] = None, low: Optional[np.ndarray] = None,
+                block_size: int = 1_000_000) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Нарезка рядов (например, колонок OHLCStore) на блоки без копирования
+    """
+    high = close if high is None else high
+    low = close if low is None else low
+
+    for start in range(0, len(close), block_size):
+        stop = start + block_size
+        yield close[start:stop], high[start:stop], low[start:stop]
+
+
+def run_chunked(blocks: Iterable[Tuple[np.ndarray, np.ndarray, np.ndarray]], **params) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Генератор результатов по блокам (close, high, low)
+
+    Пример для файла, не помещающегося в память:
+        store = OHLCStore("btc.ohlc")
+        for columns in run_chunked(iter_blocks(*store.price_data())):
+            ...
+    """
+    engine = ChunkedIndicators(**params)
+    for close, high, low in blocks:
+        yield engine.process(close, high, low)
@@ -0,0 +1,382 @@
+"""
+Событийный цикл на asyncio: воспроизведение баров, потоковые индикаторы
+и локальная симуляция биржи.
+
+Для каждого инструмента запускаются две задачи: поставщик (feed) кладёт
+в очередь порции баров из генератора или файла, а обработчик по одному
+бару обновляет индикаторы streaming.py, передаёт бар симулятору биржи и
+выставляет заявки по сигналам стратегии. Очередь ограничена, поэтому
+медленный обработчик притормаживает поставщика, а не копит память.
+
+Бары внутри порции обрабатываются обычным циклом без await: переключение
+задач на каждый бар стоило бы дороже самих индикаторов. Задержка (lag)
+измеряется для каждой порции как время от её готовности (момента
+публикации или, при воспроизведении с bar_interval, расписания по часам)
+до окончания обработки.
+
+Пример:
+    close, high, low = generate_paths(100, 10_000, seed=1)
+    sources = {f"SYM{i}": iter_blocks(close[i], high[i], low[i], 1000) for i in range(100)}
+    report = asyncio.run(EventEngine(SimulatedExchange(latency_bars=1, max_fill=0.5)).run(sources))
+    print(report.format_summary())
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from ingest import DEFAULT_READ_SIZE, iter_file
+from streaming import StreamingBullBearPower, StreamingMACD, StreamingMomentum, StreamingRSI
+from universe import DEFAULT_PARAMS
+
+Block = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+# Остаток заявки меньше этой доли её объёма считается ошибкой округления
+# суммы частичных исполнений
+FILL_TOLERANCE = 1e-9
+
+
+class Fill(NamedTuple):
+    order_id: int
+    symbol: str
+    index: int
+    quantity: float
+    price: float
+    fee: float
+
+
+class Order:
+    """
+    Рыночная заявка: quantity > 0 — покупка, < 0 — продажа
+
+    Attributes:
+        active_from: номер бара, начиная с которого заявка видна бирже
+        filled: исполненное количество (со знаком)
+        average_price: средняя цена исполнения
+    """
+    __slots__ = ("order_id", "symbol", "quantity", "submitted", "active_from", "filled", "average_price")
+
+    def __init__(self, order_id: int, symbol: str, quantity: float, submitted: int, active_from: int):
+        self.order_id = order_id
+        self.symbol = symbol
+        self.quantity = quantity
+        self.submitted = submitted
+        self.active_from = active_from
+        self.filled = 0.0
+        self.average_price = 0.0
+
+    @property
+    def remaining(self) -> float:
+        return self.quantity - self.filled
+
+    @property
+    def done(self) -> bool:
+        return abs(self.remaining) <= FILL_TOLERANCE * abs(self.quantity)
+
+    def __repr__(self) -> str:
+        return (f"Order(#{self.order_id} {self.symbol} {self.quantity:+g} @bar {self.submitted}, "
+                f"filled={self.filled:+g})")
+
+
+class SimulatedExchange:
+    """
+    Локальная биржа: рыночные заявки исполняются по цене закрытия бара
+
+    Время на бирже — номер бара инструмента, поэтому результат не зависит
+    от скорости воспроизведения и планировщика asyncio.
+
+    Args:
+        latency_bars: задержка доставки заявки — заявка, выставленная на
+            баре t, начинает исполняться на баре t + latency_bars (0 —
+            сразу по цене текущего бара)
+        max_fill: максимальный объём исполнения за бар (частичные
+            исполнения); None — заявка исполняется целиком
+        fee: комиссия на единицу оборота в деньгах
+        slippage: проскальзывание цены в сторону заявки
+    """
+
+    def __init__(self, latency_bars: int = 1, max_fill: Optional[float] = None,
+                 fee: float = 0.001, slippage: float = 0.0005):
+        self.latency_bars = latency_bars
+        self.max_fill = max_fill
+        self.fee = fee
+        self.slippage = slippage
+
+        self.positions: Dict[str, float] = {}
+        self.cash: Dict[str, float] = {}
+        self.last_price: Dict[str, float] = {}
+        self.fills: List[Fill] = []
+        self.orders: List[Order] = []
+        self._pending: Dict[str, Deque[Order]] = {}
+
+    def submit(self, symbol: str, quantity: float, index: int) -> Order:
+        """
+        Выставление рыночной заявки на баре index (quantity не может быть 0)
+        """
+        if quantity == 0:
+            raise ValueError("Объём заявки не может быть нулевым")
+
+        order = Order(len(self.orders), symbol, quantity, index, index + self.latency_bars)
+        self.orders.append(order)
+        self._pending.setdefault(symbol, deque()).append(order)
+
+        if not self.latency_bars and symbol in self.last_price:
+            self.on_bar(symbol, index, self.last_price[symbol])
+        return order
+
+    def has_pending(self, symbol: str) -> bool:
+        """Есть ли у инструмента неисполненные заявки"""
+        return bool(self._pending.get(symbol))
+
+    def open_quantity(self, symbol: str) -> float:
+        """Неисполненный остаток заявок инструмента"""
+        return sum(order.remaining for order in self._pending.get(symbol, ()))
+
+    def on_bar(self, symbol: str, index: int, price: float):
+        """
+        Новый бар инструмента: исполнение активных заявок по его цене
+        """
+        self.last_price[symbol] = price
+        pending = self._pending.get(symbol)
+
+        while pending and pending[0].active_from <= index:
+            order = pending[0]
+            quantity = order.remaining
+            if self.max_fill is not None and abs(quantity) > self.max_fill:
+                quantity = self.max_fill if quantity > 0 else -self.max_fill
+
+            fill_price = price * (1 + self.slippage) if quantity > 0 else price * (1 - self.slippage)
+            fee = abs(quantity) * fill_price * self.fee
+
+            filled = order.filled + quantity
+            order.average_price = (order.average_price * order.filled + fill_price * quantity) / filled
+            order.filled = filled
+
+            self.positions[symbol] = self.positions.get(symbol, 0.0) + quantity
+            self.cash[symbol] = self.cash.get(symbol, 0.0) - quantity * fill_price - fee
+            self.fills.append(Fill(order.order_id, symbol, index, quantity, fill_price, fee))
+
+            if not order.done:
+                break
+            pending.popleft()
+
+    def equity(self, symbol: str) -> float:
+        """Результат по инструменту: деньги плюс позиция по последней цене"""
+        return self.cash.get(symbol, 0.0) + self.positions.get(symbol, 0.0) * self.last_price.get(symbol, 0.0)
+
+
+class SignalStrategy:
+    """
+    Правила из main() на потоковых индикаторах: пересечение Momentum и
+    гистограммы MACD нуля, вход RSI в зоны перепроданности/перекупленности
+
+    Целевая позиция — знак суммы голосов правил на баре, умноженный на
+    size; бар без сигналов позицию не меняет.
+    """
+
+    def __init__(self, size: float = 1.0, rsi_levels: Tuple[float, float] = (30, 70), **params):
+        unknown = set(params) - set(DEFAULT_PARAMS)
+        if unknown:
+            raise ValueError(f"Неизвестные параметры: {sorted(unknown)}")
+        settings = {**DEFAULT_PARAMS, **params}
+
+        self.size = size
+        self.rsi_lower, self.rsi_upper = rsi_levels
+        self.momentum = StreamingMomentum(settings["momentum_period"])
+        self.rsi = StreamingRSI(settings["rsi_period"])
+        self.macd = StreamingMACD(settings["macd_fast"], settings["macd_slow"], settings["macd_signal"])
+        self.bbp = StreamingBullBearPower(settings["bbp_period"])
+
+        self._prev_momentum: Optional[float] = None
+        self._prev_rsi: Optional[float] = None
+        self._prev_histogram: Optional[float] = None
+
+    def on_bar(self, close: float, high: float, low: float) -> Optional[float]:
+        """
+        Обновление индикаторов баром
+
+        Returns:
+            Новая целевая позиция или None, если сигналов нет
+        """
+        momentum = self.momentum.update(close)
+        rsi = self.rsi.update(close)
+        histogram = self.macd.update(close)[2]
+        self.bbp.update(high, low, close)
+
+        vote = 0
+        prev = self._prev_momentum
+        if prev is not None:
+            if prev <= 0 < momentum:
+                vote += 1
+            elif prev >= 0 > momentum:
+                vote -= 1
+
+        prev = self._prev_rsi
+        if prev is not None:
+            if rsi < self.rsi_lower <= prev:
+                vote += 1
+            elif rsi > self.rsi_upper >= prev:
+                vote -= 1
+
+        prev = self._prev_histogram
+        if prev is not None:
+            if prev <= 0 < histogram:
+                vote += 1
+            elif prev >= 0 > histogram:
+                vote -= 1
+
+        self._prev_momentum = momentum
+        self._prev_rsi = rsi
+        self._prev_histogram = histogram
+
+        if vote > 0:
+            return self.size
+        if vote < 0:
+            return -self.size
+        return None
+
+
+def file_source(path: str, read_size: int = DEFAULT_READ_SIZE) -> Iterator[Block]:
+    """
+    Порции (close, high, low) из CSV/NDJSON (см. ingest.iter_file)
+    """
+    for chunk in iter_file(path, ("close", "high", "low"), read_size=read_size):
+        yield chunk["close"], chunk["high"], chunk["low"]
+
+
+class EngineReport:
+    """
+    Итоги прогона: пропускная способность и задержка обработки порций
+    """
+
+    def __init__(self, bars: int, elapsed: float, lags: np.ndarray, exchange: SimulatedExchange):
+        self.bars = bars
+        self.elapsed = elapsed
+        self.lags = lags
+        self.exchange = exchange
+
+    @property
+    def bars_per_second(self) -> float:
+        return self.bars / self.elapsed if self.elapsed else float("inf")
+
+    def lag_stats(self) -> Dict[str, float]:
+        """Задержка обработки порций в секундах"""
+        if not len(self.lags):
+            return {"mean": float("nan"), "p50": float("nan"), "p99": float("nan"), "max": float("nan")}
+        return {
+            "mean": float(self.lags.mean()),
+            "p50": float(np.percentile(self.lags, 50)),
+            "p99": float(np.percentile(self.lags, 99)),
+            "max": float(self.lags.max()),
+        }
+
+    def format_summary(self) -> str:
+        """Текстовая сводка"""
+        lag = self.lag_stats()
+        equity = sum(self.exchange.equity(symbol) for symbol in self.exchange.last_price)
+        return "\n".join([
+            f"Баров: {self.bars} за {self.elapsed:.3f} с ({self.bars_per_second:,.0f} баров/с)",
+            f"Задержка, мс: среднее {lag['mean'] * 1000:.3f}, p50 {lag['p50'] * 1000:.3f}, "
+            f"p99 {lag['p99'] * 1000:.3f}, макс. {lag['max'] * 1000:.3f}",
+            f"Заявок: {len(self.exchange.orders)}, исполнений: {len(self.exchange.fills)}, "
+            f"итог по всем инструментам: {equity:.4f}",
+        ])
+
+
+class EventEngine:
+    """
+    Событийный цикл для множества инструментов
+
+    Args:
+        exchange: симулятор биржи
+        strategy_factory: создаёт стратегию для инструмента (объект с
+            методом on_bar(close, high, low) -> целевая позиция или None)
+        bar_interval: секунд на бар при воспроизведении по часам; None —
+            так быстро, как возможно
+        queue_size: ёмкость очереди порций на инструмент
+    """
+
+    def __init__(self, exchange: Optional[SimulatedExchange] = None,
+                 strategy_factory: Callable[[str], SignalStrategy] = lambda symbol: SignalStrategy(),
+                 bar_interval: Optional[float] = None, queue_size: int = 4):
+        self.exchange = exchange or SimulatedExchange()
+        self.strategy_factory = strategy_factory
+        self.bar_interval = bar_interval
+        self.queue_size = queue_size
+        self.bars = 0
+        self._lags: List[float] = []
+
+    async def _feed(self, blocks: Iterable[Block], queue: asyncio.Queue, start: float):
+        index = 0
+        for close, high, low in blocks:
+            index += len(close)
+            item = [close.tolist(), high.tolist(), low.tolist(), None]
+            if self.bar_interval is not None:
+                item[3] = start + index * self.bar_interval
+                delay = item[3] - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            await queue.put(item)
+            if self.bar_interval is None:
+                # Время публикации: ожидание места в полной очереди не считается задержкой
+                item[3] = time.perf_counter()
+        await queue.put(None)
+
+    async def _consume(self, symbol: str, queue: asyncio.Queue):
+        strategy = self.strategy_factory(symbol)
+        exchange = self.exchange
+        on_bar = exchange.on_bar
+        has_pending = exchange.has_pending
+        index = 0
+        target = 0.0
+
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            closes, highs, lows, due = item
+
+            for close, high, low in zip(closes, highs, lows):
+                if has_pending(symbol):
+                    on_bar(symbol, index, close)
+                else:
+                    exchange.last_price[symbol] = close
+
+                wanted = strategy.on_bar(close, high, low)
+                if wanted is not None and wanted != target:
+                    exposure = exchange.positions.get(symbol, 0.0) + exchange.open_quantity(symbol)
+                    if wanted != exposure:
+                        exchange.submit(symbol, wanted - exposure, index)
+                    target = wanted
+                index += 1
+
+            self.bars += len(closes)
+            self._lags.append(time.perf_counter() - due)
+
+    async def run(self, sources: Mapping[str, Iterable[Block]]) -> EngineReport:
+        """
+        Прогон всех инструментов: по паре задач (поставщик, обработчик) на инструмент
+
+        Args:
+            sources: инструмент -> итерируемое порций (close, high, low),
+                например chunked.iter_blocks(...) или file_source(path)
+        """
+        start = time.perf_counter()
+        tasks = []
+        for symbol, blocks in sources.items():
+            queue = asyncio.Queue(self.queue_size)
+            tasks.append(asyncio.create_task(self._feed(blocks, queue, start)))
+            tasks.append(asyncio.create_task(self._consume(symbol, queue)))
+
+        await asyncio.gather(*tasks)
+        return EngineReport(self.bars, time.perf_counter() - start, np.array(self._lags), self.exchange)
+
+
+def run_events(sources: Mapping[str, Iterable[Block]], **kwargs) -> EngineReport:
+    """
+    Синхронная обёртка: asyncio.run(EventEngine(**kwargs).run(sources))
+    """
+    return asyncio.run(EventEngine(**kwargs).run(sources))
@@ -0,0 +1,182 @@
+"""
+Кэш промежуточных результатов индикаторов.
+
+Ключ записи — (ключ ряда, имя индикатора, параметры). Ключ ряда считается
+по содержимому массива (blake2b) один раз на объект и дальше берётся по
+идентичности, поэтому массивы, переданные в кэш, не должны изменяться на
+месте. Списки не поддерживают weakref: их ключи запоминаются вместе с
+самим списком для последних _MAX_LIST_KEYS списков, а если список
+дописывается, вызывающий может передать свой ключ (например, версию
+данных) через аргумент key. Записи вытесняются по LRU при превышении
+лимита памяти.
+"""
+import hashlib
+import sys
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+import algotradesim
+import indicators_np
+
+# Размер объекта float в CPython
+_FLOAT_SIZE = sys.getsizeof(0.0)
+
+# Сколько последних списков держать в памяти ради их ключей
+_MAX_LIST_KEYS = 16
+
+
+def series_key(prices: np.ndarray) -> Tuple:
+    """
+    Ключ ряда по содержимому: форма и хэш байтов массива
+    """
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    digest = hashlib.blake2b(prices.data, digest_size=16).hexdigest()
+    return prices.shape, digest
+
+
+def _nbytes(value) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, tuple):
+        if value and not isinstance(value[0], (np.ndarray, tuple)):
+            # Ряд значений algotradesim, сохранённый кортежем
+            return sys.getsizeof(value) + _FLOAT_SIZE * (len(value) - value.count(None))
+        return sum(_nbytes(item) for item in value)
+    return 0
+
+
+def _freeze(value):
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, tuple):
+        for item in value:
+            _freeze(item)
+    return value
+
+
+class IndicatorCache:
+    """
+    LRU-кэш индикаторов с ограничением по памяти и счётчиками попаданий
+
+    Args:
+        max_bytes: лимит суммарного размера хранимых массивов
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[object, int]]" = OrderedDict()
+        self._keys: Dict[int, Tuple[weakref.ref, Tuple]] = {}
+        self._list_keys: "OrderedDict[int, Tuple[list, int, Tuple]]" = OrderedDict()
+
+    def key_for(self, prices: np.ndarray, key: Optional[Hashable] = None) -> Tuple:
+        """
+        Ключ ряда: хэш содержимого, запомненный по идентичности объекта
+
+        Args:
+            key: ключ ряда от вызывающего (идентификатор и версия данных);
+                если задан, содержимое не хэшируется
+        """
+        if key is not None:
+            return ("key", key)
+
+        if isinstance(prices, list):
+            return self._list_key(prices)
+
+        known = self._keys.get(id(prices))
+        if known is not None and known[0]() is prices:
+            return known[1]
+
+        key = series_key(prices)
+        try:
+            ref = weakref.ref(prices, lambda _, ident=id(prices): self._keys.pop(ident, None))
+        except TypeError:
+            return key
+        self._keys[id(prices)] = (ref, key)
+        return key
+
+    def _list_key(self, prices: list) -> Tuple:
+        # Список хранится в записи, поэтому его id не переиспользуется;
+        # изменение длины (дописанные бары) считается новым рядом
+        known = self._list_keys.get(id(prices))
+        if known is not None and known[0] is prices and known[1] == len(prices):
+            self._list_keys.move_to_end(id(prices))
+            return known[2]
+
+        key = series_key(prices)
+        self._list_keys[id(prices)] = (prices, len(prices), key)
+        self._list_keys.move_to_end(id(prices))
+        if len(self._list_keys) > _MAX_LIST_KEYS:
+            self._list_keys.popitem(last=False)
+        return key
+
+    def get_or_compute(self, prices: np.ndarray, indicator: str, params: Tuple, compute: Callable,
+                       key: Optional[Hashable] = None):
+        """
+        Результат indicator(params) для ряда prices из кэша или через compute()
+
+        Возвращаемые массивы доступны только для чтения.
+        """
+        key = (self.key_for(prices, key), indicator, params)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        self.misses += 1
+        value = _freeze(compute())
+        size = _nbytes(value)
+
+        if size <= self.max_bytes:
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            self._evict()
+
+        return value
+
+    def ema(self, prices: np.ndarray, period: int) -> np.ndarray:
+        """EMA ряда через кэш"""
+        return self.get_or_compute(prices, "ema", (period,),
+                                   lambda: indicators_np.calculate_ema(prices, period))
+
+    def ema_list(self, prices: List[float], period: int, key: Optional[Hashable] = None) -> List[Optional[float]]:
+        """
+        EMA списка цен (algotradesim.calculate_ema) через кэш
+
+        Значение хранится кортежем, вызывающий получает новый список.
+        """
+        return list(self.get_or_compute(prices, "ema_list", (period,),
+                                        lambda: tuple(algotradesim.calculate_ema(prices, period)), key))
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Очистка кэша (счётчики сохраняются)"""
+        self._entries.clear()
+        self._keys.clear()
+        self._list_keys.clear()
+        self.current_bytes = 0
+
+    def stats(self) -> dict:
+        """Счётчики попаданий, промахов и занятой памяти"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+        }
@@ -0,0 +1,209 @@
+"""
+Ленивая таблица индикаторов с вычислением по требованию.
+
+Колонки IndicatorFrame объявляются как отложенные вычисления: функция от
+колонок-зависимостей и глубина истории (lookback), нужная для точного
+значения на баре. Колонка считается только при обращении к ней, вместе с
+зависимостями (macd_signal -> macd -> ema_12, ema_26), и кэшируется.
+
+При запросе окна [start, stop) каждая колонка считается на диапазоне
+[start - lookback, stop): для SMA и Momentum это несколько баров прогрева.
+Рекурсивные индикаторы (EMA, RSI, MACD, Bull Bear Power) зависят от всей
+истории с первого бара, поэтому для них диапазон начинается с 0, но
+заканчивается на stop. Значения в окне совпадают с расчётом по всему ряду
+(для SMA — с точностью до округления скользящей суммы: окно начинается с
+точной суммы math.fsum, а не с суммы, накопленной с начала ряда).
+
+Расчёт — функциями algotradesim на списках, без NumPy.
+"""
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from algotradesim import (
+    calculate_ema,
+    calculate_ema_with_none,
+    calculate_momentum,
+    calculate_rsi,
+    calculate_sma,
+)
+from universe import DEFAULT_PARAMS
+
+# Глубина истории «с первого бара» для рекурсивных индикаторов
+FULL_HISTORY = None
+
+INPUTS = ("close", "high", "low")
+
+_AUTO_COLUMN = re.compile(r"(sma|ema|momentum|rsi)_(\d+)$")
+
+
+def _difference(left: List[Optional[float]], right: List[Optional[float]]) -> List[Optional[float]]:
+    return [None if a is None or b is None else a - b for a, b in zip(left, right)]
+
+
+class Column:
+    """
+    Объявление колонки: compute(*значения inputs) -> список той же длины
+
+    Args:
+        inputs: имена колонок-зависимостей или исходных рядов (INPUTS)
+        lookback: сколько баров до начала окна нужно для точного значения;
+            FULL_HISTORY — расчёт всегда с первого бара
+    """
+    __slots__ = ("name", "inputs", "compute", "lookback")
+
+    def __init__(self, name: str, inputs: Sequence[str], compute: Callable[..., List[Optional[float]]],
+                 lookback: Optional[int] = FULL_HISTORY):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.compute = compute
+        self.lookback = lookback
+
+    def __repr__(self) -> str:
+        lookback = "full" if self.lookback is FULL_HISTORY else self.lookback
+        return f"Column({self.name!r}, inputs={self.inputs}, lookback={lookback})"
+
+
+class IndicatorFrame:
+    """
+    Ленивая таблица индикаторов над рядами close/high/low
+
+    Колонки по умолчанию: momentum, rsi, macd, macd_signal, macd_hist,
+    bull_power, bear_power. Колонки вида sma_20, ema_50, momentum_5,
+    rsi_7 создаются автоматически при первом обращении.
+
+    Пример:
+        frame = IndicatorFrame(close_prices, high_prices, low_prices)
+        frame["rsi"]                      # весь ряд
+        frame["macd_hist", -10:]          # последние 10 значений
+        frame.tail(30, "momentum", "bull_power", "bear_power")
+
+    Args:
+        params: периоды индикаторов (см. DEFAULT_PARAMS)
+    """
+
+    def __init__(self, close_prices: List[float], high_prices: Optional[List[float]] = None,
+                 low_prices: Optional[List[float]] = None, **params):
+        unknown = set(params) - set(DEFAULT_PARAMS)
+        if unknown:
+            raise ValueError(f"Неизвестные параметры: {sorted(unknown)}")
+        settings = {**DEFAULT_PARAMS, **params}
+
+        self._inputs = {
+            "close": close_prices,
+            "high": close_prices if high_prices is None else high_prices,
+            "low": close_prices if low_prices is None else low_prices,
+        }
+        self._columns: Dict[str, Column] = {}
+        self._cache: Dict[str, Tuple[int, List[Optional[float]]]] = {}
+        self.bars_computed = 0
+
+        fast, slow, signal = settings["macd_fast"], settings["macd_slow"], settings["macd_signal"]
+        bbp_ema = f"ema_{settings['bbp_period']}"
+
+        self.alias("momentum", f"momentum_{settings['momentum_period']}")
+        self.alias("rsi", f"rsi_{settings['rsi_period']}")
+        self.add_column("macd", (f"ema_{fast}", f"ema_{slow}"), _difference, lookback=0)
+        self.add_column("macd_signal", ("macd",), lambda macd: calculate_ema_with_none(macd, signal))
+        self.add_column("macd_hist", ("macd", "macd_signal"), _difference, lookback=0)
+        self.add_column("bull_power", ("high", bbp_ema), _difference, lookback=0)
+        self.add_column("bear_power", ("low", bbp_ema), _difference, lookback=0)
+
+    def __len__(self) -> int:
+        return len(self._inputs["close"])
+
+    @property
+    def columns(self) -> List[str]:
+        """Объявленные колонки (автоматические — после первого обращения)"""
+        return list(self._columns)
+
+    def add_column(self, name: str, inputs: Sequence[str], compute: Callable[..., List[Optional[float]]],
+                   lookback: Optional[int] = FULL_HISTORY):
+        """
+        Объявление колонки (см. Column); кэш колонок не сбрасывается
+        """
+        if name in INPUTS:
+            raise ValueError(f"Имя {name!r} занято исходным рядом")
+        self._columns[name] = Column(name, inputs, compute, lookback)
+
+    def alias(self, name: str, target: str):
+        """Колонка name — другое имя колонки target"""
+        self.add_column(name, (target,), lambda values: values, lookback=0)
+
+    def _column(self, name: str) -> Column:
+        column = self._columns.get(name)
+        if column is not None:
+            return column
+
+        match = _AUTO_COLUMN.match(name)
+        if match is None:
+            raise KeyError(name)
+
+        kind, period = match.group(1), int(match.group(2))
+        if kind == "sma":
+            column = Column(name, ("close",), lambda close: calculate_sma(close, period), period - 1)
+        elif kind == "momentum":
+            column = Column(name, ("close",), lambda close: calculate_momentum(close, period), period)
+        elif kind == "ema":
+            column = Column(name, ("close",), lambda close: calculate_ema(close, period))
+        else:
+            column = Column(name, ("close",), lambda close: calculate_rsi(close, period))
+
+        self._columns[name] = column
+        return column
+
+    def _values(self, name: str, start: int, stop: int) -> List[Optional[float]]:
+        if name in self._inputs:
+            return self._inputs[name][start:stop]
+
+        cached = self._cache.get(name)
+        if cached is not None:
+            cached_start, values = cached
+            if cached_start <= start and stop <= cached_start + len(values):
+                return values[start - cached_start:stop - cached_start]
+
+        column = self._column(name)
+        first = 0 if column.lookback is FULL_HISTORY else max(0, start - column.lookback)
+        arguments = [self._values(dependency, first, stop) for dependency in column.inputs]
+        computed = column.compute(*arguments)
+        self.bars_computed += stop - first
+
+        # Расчёт с первого бара точен на всём диапазоне и кэшируется целиком;
+        # иначе бары до start — прогрев окна, и кэшируется только [start, stop)
+        cache_start = 0 if first == 0 else start
+        values = computed[cache_start - first:]
+        if cached is None or len(values) >= len(cached[1]):
+            self._cache[name] = (cache_start, values)
+        return values[start - cache_start:]
+
+    def window(self, name: str, start: Optional[int] = None, stop: Optional[int] = None) -> List[Optional[float]]:
+        """
+        Значения колонки на барах [start, stop) (индексы как у срезов списка)
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        if stop <= start:
+            return []
+        return self._values(name, start, stop)
+
+    def tail(self, bars: int, *names: str) -> Dict[str, List[Optional[float]]]:
+        """Последние bars значений указанных колонок"""
+        start = max(0, len(self) - bars)
+        return {name: self.window(name, start) for name in names}
+
+    def __getitem__(self, key: Union[str, Tuple[str, slice]]) -> List[Optional[float]]:
+        if isinstance(key, tuple):
+            name, bars = key
+            if bars.step not in (None, 1):
+                raise ValueError("Шаг среза не поддерживается")
+            return self.window(name, bars.start, bars.stop)
+        return self.window(key)
+
+    def invalidate(self, name: Optional[str] = None):
+        """Сброс кэша колонки (или всех колонок)"""
+        if name is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(name, None)
+
+    def __repr__(self) -> str:
+        cached = {name: (start, start + len(values)) for name, (start, values) in self._cache.items()}
+        return f"IndicatorFrame(bars={len(self)}, columns={self.columns}, cached={cached})"
@@ -0,0 +1,134 @@
+"""
+Компактный ряд значений индикатора.
+
+IndicatorSeries хранит значения в непрерывном буфере float64 (array('d')
+или массив NumPy) вместо списка объектов float и None: 8 байт на значение
+вместо ~32. Зона прогрева и пропуски хранятся как NaN, а при обращении по
+индексу и итерации возвращаются как None, поэтому ряд можно передавать в
+код, написанный для List[Optional[float]] (например, plot_results).
+"""
+import math
+from array import array
+from functools import wraps
+from typing import Callable, Iterable, Iterator, List, Optional
+
+_NAN = float("nan")
+
+
+class IndicatorSeries:
+    """
+    Ряд значений индикатора поверх буфера float64
+
+    Срезы не копируют данные, а ссылаются на тот же буфер. Ряд
+    поддерживает буферный протокол (memoryview(series) на Python 3.12+,
+    series.buffer() на любой версии) и np.asarray(series) без копирования.
+    """
+
+    __slots__ = ("_view", "_owner", "_first_valid")
+
+    def __init__(self, buffer, owner=None):
+        view = memoryview(buffer)
+        if view.format != "d" or view.ndim != 1:
+            raise ValueError("IndicatorSeries поддерживает только одномерные буферы float64")
+
+        self._view = view
+        self._owner = buffer if owner is None else owner
+        self._first_valid: Optional[int] = None
+
+    @classmethod
+    def from_values(cls, values: Iterable[Optional[float]]) -> "IndicatorSeries":
+        """Ряд из значений, где None означает отсутствие значения"""
+        return cls(array("d", (_NAN if v is None else v for v in values)))
+
+    @property
+    def first_valid(self) -> int:
+        """Индекс первого значения вне зоны прогрева (len(self), если таких нет)"""
+        if self._first_valid is None:
+            view = self._view
+            index = 0
+            while index < len(view) and view[index] != view[index]:
+                index += 1
+            self._first_valid = index
+        return self._first_valid
+
+    @property
+    def nbytes(self) -> int:
+        return self._view.nbytes
+
+    def buffer(self) -> memoryview:
+        """memoryview на данные ряда без копирования"""
+        return self._view
+
+    def __buffer__(self, flags: int) -> memoryview:
+        return self._view
+
+    def __array__(self, dtype=None, copy=None):
+        import numpy as np
+
+        values = np.asarray(self._view)
+        return values if dtype is None else values.astype(dtype, copy=False)
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return IndicatorSeries(self._view[index], self._owner)
+
+        value = self._view[index]
+        return None if value != value else value
+
+    def __iter__(self) -> Iterator[Optional[float]]:
+        for value in self._view:
+            yield None if value != value else value
+
+    def valid(self) -> Iterator[float]:
+        """Значения без зоны прогрева и пропусков"""
+        view = self._view
+        for index in range(self.first_valid, len(view)):
+            value = view[index]
+            if value == value:
+                yield value
+
+    def tolist(self) -> List[Optional[float]]:
+        """Список в прежнем формате List[Optional[float]]"""
+        return [None if math.isnan(v) else v for v in self._view.tolist()]
+
+    def __repr__(self) -> str:
+        return f"IndicatorSeries(len={len(self)}, first_valid={self.first_valid})"
+
+
+def as_series(values):
+    """
+    Преобразование результата индикатора в IndicatorSeries
+
+    Списки копируются в array('d'), массивы NumPy float64 и другие буферы
+    оборачиваются без копирования. Кортежи (MACD, Bull Bear Power)
+    преобразуются поэлементно.
+    """
+    if isinstance(values, IndicatorSeries):
+        return values
+    if isinstance(values, tuple):
+        return tuple(as_series(item) for item in values)
+    if isinstance(values, list):
+        return IndicatorSeries.from_values(values)
+
+    try:
+        return IndicatorSeries(values)
+    except (TypeError, ValueError):
+        return IndicatorSeries.from_values(values)
+
+
+def compact(func: Callable) -> Callable:
+    """
+    Декоратор: индикатор возвращает IndicatorSeries вместо списков
+
+    Пример:
+        rsi = compact(calculate_rsi)(close_prices, 14)
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return as_series(func(*args, **kwargs))
+
+    return wrapper
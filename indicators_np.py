@@ -0,0 +1,485 @@
+"""
+Векторизованный бэкенд индикаторов на NumPy.
+
+Функции повторяют одноимённые функции из algotradesim.py, но принимают и
+возвращают массивы float64, а вместо None в зоне прогрева стоит NaN.
+Все функции работают вдоль последней оси, поэтому на вход можно подавать
+как один ряд (bars,), так и матрицу (symbols, bars).
+
+Расхождение с эталонной реализацией на чистом Python не превышает
+REFERENCE_RTOL относительно масштаба цен (см. max_reference_error).
+"""
+import math
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from recursive_filter import ema_alpha, smooth, smooth_many, wilder_alpha
+
+REFERENCE_RTOL = 1e-9
+_SMA_BLOCK = 4096
+# Предельный размер временного массива окон в calculate_stddev
+_WINDOW_CHUNK = 1 << 20
+
+
+def to_array(values: Sequence[Optional[float]]) -> np.ndarray:
+    """
+    Преобразование списка со значениями None в массив float64 с NaN
+    """
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def to_optional_list(values: np.ndarray) -> List[Optional[float]]:
+    """
+    Преобразование одномерного массива с NaN в список со значениями None
+    """
+    return [None if math.isnan(v) else v for v in values.tolist()]
+
+
+def calculate_sma(prices: np.ndarray, period: int) -> np.ndarray:
+    """
+    Вычисление простой скользящей средней (SMA)
+
+    Суммы окон берутся как разность кумулятивных сумм, но cumsum
+    перезапускается в каждом блоке длины >= period, поэтому ошибка
+    округления ограничена длиной блока, а не длиной всего ряда.
+
+    Args:
+        prices: массив цен (..., bars)
+        period: период SMA
+
+    Returns:
+        Массив значений SMA, NaN в зоне прогрева
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    lead = prices.shape[:-1]
+    n = prices.shape[-1]
+    result = np.full(prices.shape, np.nan)
+
+    if n < period:
+        return result
+
+    block = max(period, _SMA_BLOCK)
+    n_blocks = -(-n // block)
+    padded = n_blocks * block
+    local = np.zeros(lead + (n_blocks, block))
+    local.reshape(lead + (padded,))[..., :n] = prices
+    np.cumsum(local, axis=-1, out=local)
+
+    # Окно, начало которого лежит в предыдущем блоке, добирает его хвост
+    correction = np.zeros(lead + (n_blocks, block))
+    correction[..., block - period:] = local[..., -1:]
+    local = local.reshape(lead + (padded,))
+    correction = correction.reshape(lead + (padded,))
+
+    window = local[..., period:n] - local[..., :n - period]
+    window += correction[..., :n - period]
+
+    result[..., period - 1] = prices[..., :period].sum(axis=-1) / period
+    np.divide(window, period, out=result[..., period:])
+    return result
+
+
+def calculate_stddev(prices: np.ndarray, period: int = 20) -> np.ndarray:
+    """
+    Вычисление скользящего стандартного отклонения (делитель — period)
+
+    Каждое окно считается в два прохода (среднее, затем отклонения от
+    него) по представлению sliding_window_view, без разности больших
+    сумм квадратов. Ряд обрабатывается кусками, чтобы временный массив
+    окон не превышал _WINDOW_CHUNK значений.
+
+    Returns:
+        Массив значений, NaN в зоне прогрева
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    n = prices.shape[-1]
+    result = np.full(prices.shape, np.nan)
+
+    if n < period:
+        return result
+
+    windows = np.lib.stride_tricks.sliding_window_view(prices, period, axis=-1)
+    std_values = result[..., period - 1:]
+    rows = max(1, _WINDOW_CHUNK // (period * max(1, math.prod(prices.shape[:-1]))))
+
+    for start in range(0, n - period + 1, rows):
+        stop = start + rows
+        np.std(windows[..., start:stop, :], axis=-1, out=std_values[..., start:stop])
+
+    return result
+
+
+def calculate_bollinger_bands(prices: np.ndarray, period: int = 20,
+                              num_std: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Вычисление полос Боллинджера
+
+    Returns:
+        Кортеж массивов: (средняя линия, верхняя полоса, нижняя полоса)
+    """
+    middle_band = calculate_sma(prices, period)
+    width = num_std * calculate_stddev(prices, period)
+
+    return middle_band, middle_band + width, middle_band - width
+
+
+def calculate_ema(prices: np.ndarray, period: int = 13) -> np.ndarray:
+    """
+    Вычисление экспоненциальной скользящей средней (EMA)
+
+    Первое значение — SMA первых period цен, дальше рекурсия
+    EMA = цена * k + EMA_prev * (1 - k), k = 2 / (period + 1).
+    """
+    return smooth(prices, ema_alpha(period), period)
+
+
+def calculate_ema_many(prices: np.ndarray, periods: Sequence[int]) -> np.ndarray:
+    """
+    EMA сразу для нескольких периодов одним проходом рекурсивного фильтра
+
+    Returns:
+        Массив формы (len(periods), ..., bars); совпадает с calculate_ema
+        для каждого периода с точностью до округления (REFERENCE_RTOL)
+    """
+    return smooth_many(prices, periods)
+
+
+GAP_POLICIES = ("skip", "hold", "reset")
+
+
+def valid_runs(valid: np.ndarray) -> np.ndarray:
+    """
+    Непрерывные участки True в одномерной маске: массив пар [start, stop)
+    """
+    edges = np.diff(np.concatenate(([False], valid, [False])).astype(np.int8))
+    return np.stack([np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)], axis=-1)
+
+
+def calculate_ema_with_nan(prices: np.ndarray, period: int = 13, gap_policy: str = "skip") -> np.ndarray:
+    """
+    Вычисление EMA для ряда с пропусками NaN (аналог calculate_ema_with_none)
+
+    Политики пропусков как в calculate_ema_with_none: "skip" — NaN на
+    пропуске, рекурсия продолжается со следующего значения; "hold" — на
+    пропуске повторяется последнее значение EMA; "reset" — пропуск
+    сбрасывает EMA и прогрев начинается заново.
+
+    Строки без пропусков внутри ряда (только NaN в начале, как у линии
+    MACD) группируются по первому валидному индексу и считаются целиком.
+    Для строк с пропусками внутри валидные значения сдвигаются к началу
+    строки (take_along_axis), фильтруются и возвращаются на свои индексы.
+    """
+    if gap_policy not in GAP_POLICIES:
+        raise ValueError(f"gap_policy должен быть одним из {GAP_POLICIES}")
+
+    prices = np.asarray(prices, dtype=np.float64)
+    n = prices.shape[-1]
+    result = np.full(prices.shape, np.nan)
+
+    if n < period:
+        return result
+
+    rows_view = prices.reshape(-1, n)
+    result_view = result.reshape(-1, n)
+
+    valid = ~np.isnan(rows_view)
+    counts = valid.sum(axis=-1)
+    starts = np.where(counts > 0, valid.argmax(axis=-1), n)
+    contiguous = counts == n - starts
+
+    for start in np.unique(starts[contiguous]):
+        if n - start < period:
+            continue
+        rows = contiguous & (starts == start)
+        result_view[rows, start:] = calculate_ema(rows_view[rows, start:], period)
+
+    gapped = np.flatnonzero(~contiguous & (counts >= period))
+    if not len(gapped):
+        return result
+
+    if gap_policy == "reset":
+        for row in gapped:
+            for run_start, run_stop in valid_runs(valid[row]):
+                if run_stop - run_start >= period:
+                    result_view[row, run_start:run_stop] = calculate_ema(rows_view[row, run_start:run_stop], period)
+        return result
+
+    # Стабильная сортировка по признаку пропуска ставит валидные значения
+    # в начало строки в исходном порядке, NaN в хвосте не влияют на рекурсию
+    order = np.argsort(~valid[gapped], axis=-1, kind="stable")
+    compact = calculate_ema(np.take_along_axis(rows_view[gapped], order, axis=-1), period)
+
+    gapped_result = np.empty_like(compact)
+    np.put_along_axis(gapped_result, order, compact, axis=-1)
+
+    if gap_policy == "hold":
+        bars = np.arange(n)
+        last = np.where(np.isnan(gapped_result), -1, bars)
+        np.maximum.accumulate(last, axis=-1, out=last)
+        gapped_result = np.take_along_axis(gapped_result, np.maximum(last, 0), axis=-1)
+        gapped_result[last < 0] = np.nan
+
+    result_view[gapped] = gapped_result
+    return result
+
+
+def calculate_momentum(prices: np.ndarray, period: int = 10) -> np.ndarray:
+    """
+    Вычисление индикатора Momentum как разности со сдвигом на period баров
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    n = prices.shape[-1]
+    result = np.full(prices.shape, np.nan)
+
+    if n > period:
+        result[..., period:] = prices[..., period:] - prices[..., :n - period]
+
+    return result
+
+
+def calculate_rsi(close_prices: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Вычисление индикатора RSI (Relative Strength Index)
+
+    Средние рост и падение сглаживаются по Уайлдеру (k = 1 / period)
+    тем же рекурсивным фильтром, что и EMA (recursive_filter.smooth).
+
+    Args:
+        close_prices: массив цен закрытия (..., bars)
+        period: период RSI (обычно 14)
+
+    Returns:
+        Массив значений RSI, NaN в зоне прогрева
+    """
+    close_prices = np.asarray(close_prices, dtype=np.float64)
+    n = close_prices.shape[-1]
+    result = np.full(close_prices.shape, np.nan)
+
+    if n < period + 1:
+        return result
+
+    changes = np.diff(close_prices, axis=-1)
+    gains = np.maximum(changes, 0.0)
+    losses = np.maximum(-changes, 0.0)
+
+    avg_gain = smooth(gains, wilder_alpha(period), period, out=gains)[..., period - 1:]
+    avg_loss = smooth(losses, wilder_alpha(period), period, out=losses)[..., period - 1:]
+
+    rsi = result[..., period:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(avg_gain, avg_loss, out=rsi)
+        rsi += 1
+        np.divide(-100, rsi, out=rsi)
+        rsi += 100
+    rsi[avg_loss == 0] = 100.0
+    return result
+
+
+def calculate_atr(
+        high_prices: np.ndarray,
+        low_prices: np.ndarray,
+        close_prices: np.ndarray,
+        period: int = 14
+) -> np.ndarray:
+    """
+    Вычисление индикатора ATR (Average True Range)
+
+    True range первого бара — high - low, далее с учётом предыдущего
+    закрытия; сглаживание Уайлдера тем же фильтром, что и в calculate_rsi.
+
+    Returns:
+        Массив значений ATR, NaN в зоне прогрева
+    """
+    high_prices = np.asarray(high_prices, dtype=np.float64)
+    low_prices = np.asarray(low_prices, dtype=np.float64)
+    close_prices = np.asarray(close_prices, dtype=np.float64)
+
+    true_ranges = high_prices - low_prices
+    prev_close = close_prices[..., :-1]
+    np.maximum(true_ranges[..., 1:], np.abs(high_prices[..., 1:] - prev_close), out=true_ranges[..., 1:])
+    np.maximum(true_ranges[..., 1:], np.abs(low_prices[..., 1:] - prev_close), out=true_ranges[..., 1:])
+
+    return smooth(true_ranges, wilder_alpha(period), period, out=true_ranges)
+
+
+def _cached_ema(prices: np.ndarray, period: int, cache) -> np.ndarray:
+    if cache is None:
+        return calculate_ema(prices, period)
+    return cache.ema(prices, period)
+
+
+def calculate_macd(close_prices: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9,
+                   cache=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Вычисление индикатора MACD
+
+    Args:
+        close_prices: массив цен закрытия (..., bars)
+        fast: период быстрой EMA
+        slow: период медленной EMA
+        signal: период сигнальной линии
+        cache: IndicatorCache, из которого берутся быстрая и медленная EMA
+
+    Returns:
+        Кортеж массивов: (macd_line, signal_line, histogram)
+    """
+    close_prices = np.asarray(close_prices, dtype=np.float64)
+
+    macd_line = _cached_ema(close_prices, fast, cache) - _cached_ema(close_prices, slow, cache)
+    signal_line = calculate_ema_with_nan(macd_line, signal)
+    histogram = macd_line - signal_line
+
+    return macd_line, signal_line, histogram
+
+
+def calculate_bull_bear_power(
+        high_prices: np.ndarray,
+        low_prices: np.ndarray,
+        close_prices: np.ndarray,
+        period: int = 13,
+        cache=None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Вычисление индикатора Bull Bear Power
+
+    EMA цен закрытия берётся из cache (IndicatorCache), если он передан.
+    """
+    ema_close = _cached_ema(np.asarray(close_prices, dtype=np.float64), period, cache)
+
+    bull_power = np.asarray(high_prices, dtype=np.float64) - ema_close
+    bear_power = np.asarray(low_prices, dtype=np.float64) - ema_close
+
+    return bull_power, bear_power
+
+
+def _rolling_extreme(values: np.ndarray, period: int, accumulate: np.ufunc, fill: float) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    lead = values.shape[:-1]
+    n = values.shape[-1]
+    result = np.full(values.shape, np.nan)
+
+    if n < period:
+        return result
+
+    # ван Херк / Гил–Верман: накопленный экстремум внутри блоков длины
+    # period слева направо и справа налево; окно [i - period + 1, i]
+    # покрывает хвост одного блока и начало следующего
+    n_blocks = -(-n // period)
+    padded = np.full(lead + (n_blocks * period,), fill)
+    padded[..., :n] = values
+    blocks = padded.reshape(lead + (n_blocks, period))
+
+    forward = accumulate.accumulate(blocks, axis=-1).reshape(padded.shape)
+    backward = accumulate.accumulate(blocks[..., ::-1], axis=-1)[..., ::-1].reshape(padded.shape)
+
+    accumulate(backward[..., :n - period + 1], forward[..., period - 1:n], out=result[..., period - 1:])
+    return result
+
+
+def rolling_max(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Скользящий максимум за period баров
+
+    Алгоритм ван Херка / Гил–Вермана: три прохода по ряду при любой длине
+    окна. Вход не должен содержать NaN.
+
+    Args:
+        values: массив значений (..., bars)
+        period: длина окна
+
+    Returns:
+        Массив максимумов, NaN в зоне прогрева
+    """
+    return _rolling_extreme(values, period, np.maximum, -np.inf)
+
+
+def rolling_min(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Скользящий минимум за period баров (см. rolling_max)
+    """
+    return _rolling_extreme(values, period, np.minimum, np.inf)
+
+
+def _range_ratio(numerator: np.ndarray, highest: np.ndarray, lowest: np.ndarray, flat: float) -> np.ndarray:
+    """numerator / (highest - lowest); flat там, где диапазон нулевой"""
+    spread = highest - lowest
+    is_flat = spread == 0
+    ratio = numerator / np.where(is_flat, 1.0, spread)
+    ratio[is_flat] = flat
+    return ratio
+
+
+def calculate_stochastic(
+        high_prices: np.ndarray,
+        low_prices: np.ndarray,
+        close_prices: np.ndarray,
+        k_period: int = 14,
+        d_period: int = 3
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Вычисление стохастического осциллятора
+
+    Returns:
+        Кортеж: (%K, %D)
+    """
+    close_prices = np.asarray(close_prices, dtype=np.float64)
+    highest = rolling_max(high_prices, k_period)
+    lowest = rolling_min(low_prices, k_period)
+    k_values = _range_ratio(100 * (close_prices - lowest), highest, lowest, 50.0)
+
+    d_values = np.full(k_values.shape, np.nan)
+    warmup = min(k_period - 1, k_values.shape[-1])
+    d_values[..., warmup:] = calculate_sma(k_values[..., warmup:], d_period)
+
+    return k_values, d_values
+
+
+def calculate_williams_r(
+        high_prices: np.ndarray,
+        low_prices: np.ndarray,
+        close_prices: np.ndarray,
+        period: int = 14
+) -> np.ndarray:
+    """
+    Вычисление индикатора Williams %R
+    """
+    highest = rolling_max(high_prices, period)
+    lowest = rolling_min(low_prices, period)
+    return _range_ratio(-100 * (highest - np.asarray(close_prices, dtype=np.float64)), highest, lowest, -50.0)
+
+
+def calculate_donchian(
+        high_prices: np.ndarray,
+        low_prices: np.ndarray,
+        period: int = 20
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Вычисление канала Дончиана
+
+    Returns:
+        Кортеж: (верхняя граница, средняя линия, нижняя граница)
+    """
+    upper = rolling_max(high_prices, period)
+    lower = rolling_min(low_prices, period)
+
+    return upper, (upper + lower) / 2, lower
+
+
+def max_reference_error(values: np.ndarray, reference: Sequence[Optional[float]], scale: float) -> float:
+    """
+    Максимальное расхождение с эталоном на чистом Python, отнесённое к scale
+
+    Зоны прогрева (NaN / None) должны совпадать, иначе возвращается inf.
+    """
+    expected = to_array(reference)
+    values = np.asarray(values, dtype=np.float64)
+
+    if not np.array_equal(np.isnan(values), np.isnan(expected)):
+        return math.inf
+
+    valid = ~np.isnan(expected)
+    if not valid.any():
+        return 0.0
+
+    return float(np.max(np.abs(values[valid] - expected[valid])) / scale)
@@ -0,0 +1,236 @@
+"""
+Потоковая загрузка OHLC из CSV и NDJSON.
+
+Файл читается большими буферами (read_size байт), буфер обрезается по
+последнему переводу строки, а остаток переносится в следующий. Числовые
+колонки разбираются сразу в массивы float64 средствами NumPy, без
+промежуточных списков строк и словарей. Порции можно подавать прямо в
+chunked.ChunkedIndicators.
+
+Если установлен pyarrow, CSV по умолчанию читается его многопоточным
+C-парсером (engine="arrow"), иначе — через np.loadtxt (engine="numpy").
+"""
+import io
+import json
+import re
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from chunked import ChunkedIndicators
+
+try:
+    import pyarrow
+    from pyarrow import csv as arrow_csv
+except ImportError:
+    pyarrow = None
+    arrow_csv = None
+
+DEFAULT_READ_SIZE = 16 * 1024 * 1024
+DEFAULT_COLUMNS = ("open", "high", "low", "close", "volume")
+ENGINES = ("auto", "numpy", "arrow")
+
+_NUMBER = rb"(-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)"
+
+
+def read_lines(path: str, read_size: int = DEFAULT_READ_SIZE) -> Iterator[bytes]:
+    """
+    Генератор буферов из целых строк файла (каждый около read_size байт)
+    """
+    remainder = b""
+
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(read_size)
+            if not data:
+                break
+
+            data = remainder + data
+            cut = data.rfind(b"\n") + 1
+            if not cut:
+                remainder = data
+                continue
+
+            remainder = data[cut:]
+            yield data[:cut]
+
+    if remainder.strip():
+        yield remainder + b"\n"
+
+
+def _csv_header(path: str, delimiter: str) -> List[str]:
+    with open(path, "rb") as f:
+        first = f.readline()
+    return [name.strip() for name in first.decode().split(delimiter)]
+
+
+def _iter_csv_arrow(path: str, columns: Sequence[str], delimiter: str,
+                    read_size: int) -> Iterator[Dict[str, np.ndarray]]:
+    header = _csv_header(path, delimiter)
+    names = {name.lower(): name for name in header}
+    missing = [name for name in columns if name not in names]
+    if missing:
+        raise ValueError(f"{path}: нет колонок {missing}")
+    source = [names[name] for name in columns]
+
+    reader = arrow_csv.open_csv(
+        path,
+        read_options=arrow_csv.ReadOptions(block_size=read_size),
+        parse_options=arrow_csv.ParseOptions(delimiter=delimiter),
+        convert_options=arrow_csv.ConvertOptions(
+            include_columns=source,
+            column_types={name: pyarrow.float64() for name in source},
+        ),
+    )
+    for batch in reader:
+        yield {name: batch.column(batch.schema.get_field_index(original)).to_numpy(zero_copy_only=False)
+               for name, original in zip(columns, source)}
+
+
+def iter_csv(
+        path: str,
+        columns: Sequence[str] = DEFAULT_COLUMNS,
+        delimiter: str = ",",
+        read_size: int = DEFAULT_READ_SIZE,
+        engine: str = "auto"
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Потоковое чтение CSV с заголовком: порции вида {колонка: массив float64}
+
+    В режиме numpy буфер разбирается одним вызовом np.loadtxt (C-парсер
+    NumPy) с usecols, поэтому в float преобразуются только нужные
+    колонки, а остальные (например, дата строкой) пропускаются.
+
+    Args:
+        path: путь к файлу
+        columns: имена колонок, которые нужно загрузить
+        delimiter: разделитель полей
+        read_size: размер буфера чтения в байтах
+        engine: "arrow" — pyarrow.csv, "numpy" — np.loadtxt,
+            "auto" — pyarrow, если он установлен
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"engine должен быть одним из {ENGINES}")
+    if engine == "arrow" and arrow_csv is None:
+        raise ValueError("Для engine='arrow' нужен pyarrow")
+    if engine != "numpy" and arrow_csv is not None:
+        yield from _iter_csv_arrow(path, columns, delimiter, read_size)
+        return
+
+    lines = read_lines(path, read_size)
+
+    first = next(lines, b"")
+    header_end = first.find(b"\n")
+    header = [name.strip().lower() for name in first[:header_end].decode().split(delimiter)]
+
+    missing = [name for name in columns if name not in header]
+    if missing:
+        raise ValueError(f"{path}: нет колонок {missing}")
+    positions = [header.index(name) for name in columns]
+
+    def buffers():
+        if first[header_end + 1:].strip():
+            yield first[header_end + 1:]
+        yield from lines
+
+    for buffer in buffers():
+        table = np.loadtxt(io.BytesIO(buffer), delimiter=delimiter, usecols=positions,
+                           dtype=np.float64, ndmin=2)
+        yield {name: np.ascontiguousarray(table[:, i]) for i, name in enumerate(columns)}
+
+
+def _line_bounds(buffer: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """Позиции переводов строк и номера непустых строк буфера"""
+    ends = np.flatnonzero(np.frombuffer(buffer, dtype=np.uint8) == ord("\n"))
+    starts = np.empty_like(ends)
+    starts[:1] = 0
+    starts[1:] = ends[:-1] + 1
+    return ends, np.flatnonzero(starts != ends)
+
+
+def _key_lines(buffer: bytes, key: bytes, ends: np.ndarray) -> np.ndarray:
+    """Номера строк, в которых встречается key (по одному на вхождение)"""
+    pieces = buffer.split(key)
+    lengths = np.fromiter(map(len, pieces), dtype=np.int64, count=len(pieces))[:-1]
+    positions = np.cumsum(lengths + len(key)) - len(key)
+    return np.searchsorted(ends, positions)
+
+
+def _parse_ndjson_lines(buffer: bytes, columns: Sequence[str], path: str, first_line: int) -> Dict[str, np.ndarray]:
+    """
+    Построчный разбор json.loads: медленный путь для буферов, где поля
+    стоят не по одному в строке, и поиск строки с ошибкой
+    """
+    values: Dict[str, List[float]] = {name: [] for name in columns}
+
+    for number, line in enumerate(buffer.split(b"\n"), first_line):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        for name in columns:
+            value = record.get(name)
+            if isinstance(value, str):
+                try:
+                    value = float(value)
+                except ValueError:
+                    value = None
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"{path}: строка {number}: нет числового поля {name!r}")
+            values[name].append(value)
+
+    return {name: np.array(column, dtype=np.float64) for name, column in values.items()}
+
+
+def iter_ndjson(
+        path: str,
+        columns: Sequence[str] = DEFAULT_COLUMNS,
+        read_size: int = DEFAULT_READ_SIZE
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Потоковое чтение NDJSON (один объект на строку) с числовыми полями
+
+    Значения каждой колонки извлекаются из буфера одним регулярным
+    выражением, без разбора строк в словари. Затем проверяется, что
+    ключ каждой колонки встречается ровно один раз в каждой непустой
+    строке и у каждого вхождения есть числовое значение, — только тогда
+    значения колонок относятся к одним и тем же строкам. Иначе буфер
+    разбирается построчно через json, и строка без поля или с
+    нечисловым значением (например, null) вызывает ValueError.
+    """
+    keys = {name: b'"' + re.escape(name.encode()) + b'"' for name in columns}
+    patterns = {name: re.compile(key + rb'\s*:\s*"?' + _NUMBER) for name, key in keys.items()}
+    first_line = 1
+
+    for buffer in read_lines(path, read_size):
+        ends, lines = _line_bounds(buffer)
+        chunk = {name: np.array(pattern.findall(buffer), dtype=np.float64) for name, pattern in patterns.items()}
+
+        aligned = all(len(values) == len(lines) for values in chunk.values()) and all(
+            np.array_equal(_key_lines(buffer, key, ends), lines) for key in keys.values())
+        if not aligned:
+            chunk = _parse_ndjson_lines(buffer, columns, path, first_line)
+
+        first_line += len(ends)
+        yield chunk
+
+
+def iter_file(path: str, columns: Sequence[str] = DEFAULT_COLUMNS, **kwargs) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Потоковое чтение CSV или NDJSON по расширению файла
+    """
+    if path.endswith((".ndjson", ".jsonl", ".json")):
+        return iter_ndjson(path, columns, **kwargs)
+    return iter_csv(path, columns, **kwargs)
+
+
+def ingest_indicators(path: str, read_size: int = DEFAULT_READ_SIZE, **params) -> Iterator[Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]]:
+    """
+    Конвейер: файл -> порции колонок -> индикаторы с переносом состояния
+
+    Yields:
+        Пары (порция исходных колонок, индикаторы для этой порции)
+    """
+    engine = ChunkedIndicators(**params)
+
+    for chunk in iter_file(path, ("high", "low", "close"), read_size=read_size):
+        yield chunk, engine.process(chunk["close"], chunk["high"], chunk["low"])
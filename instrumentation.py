@@ -0,0 +1,225 @@
+"""
+Необязательная инструментовка этапов конвейера.
+
+Декоратор instrument() и контекстный менеджер stage() собирают по
+каждому этапу число вызовов, суммарное и максимальное время, число
+обработанных баров и пиковый объём выделенной памяти. Время этапов
+включающее: если calculate_macd вызывает calculate_ema, время EMA входит
+и в её собственную строку, и в строку MACD.
+
+По умолчанию сбор выключен, и обёртка делает только одну проверку флага
+перед вызовом функции. Включение — enable() или переменная окружения
+ALGOTRADESIM_PROFILE (1 — время, memory — время и память через
+tracemalloc, который заметно замедляет чистый Python).
+
+    ALGOTRADESIM_PROFILE=1 python algotradesim.py
+
+Зависит только от стандартной библиотеки.
+"""
+import functools
+import json
+import os
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+_enabled = False
+_track_memory = False
+
+_stats: Dict[str, "StageStats"] = {}
+
+# Для вложенных этапов: [память на входе, максимум памяти, замеченный внутри]
+_memory_stack: List[List[int]] = []
+
+
+class StageStats:
+    """
+    Накопленные метрики одного этапа
+    """
+    __slots__ = ("name", "calls", "total_time", "max_time", "bars", "peak_bytes")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.bars = 0
+        self.peak_bytes = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "total_time": self.total_time,
+            "mean_time": self.total_time / self.calls if self.calls else 0.0,
+            "max_time": self.max_time,
+            "bars": self.bars,
+            "bars_per_s": self.bars / self.total_time if self.total_time else 0.0,
+            "peak_bytes": self.peak_bytes,
+        }
+
+
+def enable(memory: bool = False):
+    """
+    Включение сбора метрик
+
+    Args:
+        memory: отслеживать пиковую память (tracemalloc)
+    """
+    global _enabled, _track_memory
+    _enabled = True
+    _track_memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def disable():
+    """Выключение сбора метрик (накопленные значения сохраняются)"""
+    global _enabled, _track_memory
+    if _track_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _enabled = False
+    _track_memory = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    """Сброс накопленных метрик"""
+    _stats.clear()
+    _memory_stack.clear()
+
+
+def count_bars(args: tuple) -> int:
+    """
+    Число баров по первому аргументу: длина ряда или само число (days)
+    """
+    if not args:
+        return 0
+    first = args[0]
+    if isinstance(first, int):
+        return first
+    try:
+        return len(first)
+    except TypeError:
+        return 0
+
+
+def _memory_enter():
+    current, peak = tracemalloc.get_traced_memory()
+    if _memory_stack:
+        outer = _memory_stack[-1]
+        outer[1] = max(outer[1], peak)
+    tracemalloc.reset_peak()
+    _memory_stack.append([current, current])
+
+
+def _memory_exit() -> int:
+    peak = tracemalloc.get_traced_memory()[1]
+    start, seen = _memory_stack.pop()
+    peak = max(peak, seen)
+    if _memory_stack:
+        outer = _memory_stack[-1]
+        outer[1] = max(outer[1], peak)
+    return peak - start
+
+
+def _record(name: str, elapsed: float, bars: int, peak_bytes: int):
+    stats = _stats.get(name)
+    if stats is None:
+        stats = _stats[name] = StageStats(name)
+
+    stats.calls += 1
+    stats.total_time += elapsed
+    stats.max_time = max(stats.max_time, elapsed)
+    stats.bars += bars
+    stats.peak_bytes = max(stats.peak_bytes, peak_bytes)
+
+
+class stage:
+    """
+    Контекстный менеджер для участка кода внутри функции
+
+        with stage("signals", bars=len(close_prices)):
+            ...
+    """
+    __slots__ = ("name", "bars", "_active", "_start", "_memory")
+
+    def __init__(self, name: str, bars: int = 0):
+        self.name = name
+        self.bars = bars
+
+    def __enter__(self) -> "stage":
+        self._active = _enabled
+        if self._active:
+            self._memory = _track_memory
+            if self._memory:
+                _memory_enter()
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._active:
+            elapsed = time.perf_counter() - self._start
+            peak_bytes = _memory_exit() if self._memory else 0
+            _record(self.name, elapsed, self.bars, peak_bytes)
+
+
+def instrument(name: Optional[str] = None, bars: Callable[[tuple], int] = count_bars):
+    """
+    Декоратор этапа: метрики записываются под именем name (по умолчанию — имя функции)
+
+    Args:
+        bars: функция от позиционных аргументов вызова, возвращающая число баров
+    """
+    def decorator(func):
+        stage_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+
+            with stage(stage_name, bars(args)):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def metrics() -> Dict[str, dict]:
+    """Метрики всех этапов в порядке первого вызова"""
+    return {name: stats.as_dict() for name, stats in _stats.items()}
+
+
+def summary() -> str:
+    """Текстовая таблица метрик, этапы отсортированы по суммарному времени"""
+    header = (f"{'Этап':<28} {'Вызовов':>8} {'Всего, мс':>11} {'Макс., мс':>10} "
+              f"{'Баров':>10} {'Баров/с':>13} {'Пик, КиБ':>10}")
+    lines = [header, "-" * len(header)]
+
+    for name, row in sorted(metrics().items(), key=lambda item: -item[1]["total_time"]):
+        lines.append(
+            f"{name:<28} {row['calls']:>8} {row['total_time'] * 1000:>11.3f} {row['max_time'] * 1000:>10.3f} "
+            f"{row['bars']:>10} {row['bars_per_s']:>13,.0f} {row['peak_bytes'] / 1024:>10.1f}"
+        )
+
+    return "\n".join(lines)
+
+
+def export_json(path: Optional[str] = None) -> str:
+    """
+    Метрики в JSON; при заданном path результат также записывается в файл
+    """
+    document = json.dumps({"memory_tracked": _track_memory, "stages": metrics()}, ensure_ascii=False, indent=2)
+    if path is not None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(document)
+    return document
+
+
+_mode = os.environ.get("ALGOTRADESIM_PROFILE", "").strip().lower()
+if _mode and _mode not in ("0", "false", "no"):
+    enable(memory=_mode == "memory")
@@ -0,0 +1,192 @@
+"""
+Monte Carlo-проверка устойчивости сигнальных правил из main().
+
+Синтетические пути генерируются price_generator, индикаторы считаются
+пакетно для всей пачки путей (universe), сигналы ищет SignalScanner.
+Пачки раздаются процессам, у каждой пачки свой поток случайных чисел из
+SeedSequence.spawn(), поэтому результат зависит только от seed, а не от
+числа процессов.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from price_generator import BTC_MODEL, PriceModel, generate_paths
+from signal_scanner import SignalScanner, event_directions
+from universe import DEFAULT_PARAMS, compute_universe
+
+RULES = ("momentum", "rsi", "macd")
+
+RETURN_BINS = np.linspace(-0.5, 0.5, 101)
+
+
+class MonteCarloResult:
+    """
+    Результаты прогона: по строке на путь, по колонке на правило из RULES
+
+    Attributes:
+        signals: число сигналов на пути
+        hits: число сигналов с доходностью в сторону сигнала
+        return_sums: сумма доходностей сигналов с учётом направления
+        return_histogram: гистограмма доходностей отдельных сигналов (RETURN_BINS)
+    """
+
+    def __init__(self, signals: np.ndarray, hits: np.ndarray, return_sums: np.ndarray,
+                 return_histogram: np.ndarray, horizon: int):
+        self.signals = signals
+        self.hits = hits
+        self.return_sums = return_sums
+        self.return_histogram = return_histogram
+        self.horizon = horizon
+
+    @property
+    def n_paths(self) -> int:
+        return self.signals.shape[0]
+
+    def summary(self) -> Dict[str, dict]:
+        """
+        Сводка по каждому правилу: распределение числа сигналов на путь,
+        доля попаданий и распределение средней доходности на путь
+        """
+        summary = {}
+
+        for column, rule in enumerate(RULES):
+            signals = self.signals[:, column]
+            total = signals.sum()
+            with np.errstate(invalid="ignore", divide="ignore"):
+                path_returns = self.return_sums[:, column] / signals
+            path_returns = path_returns[signals > 0]
+
+            summary[rule] = {
+                "signals_mean": float(signals.mean()),
+                "signals_p5": float(np.percentile(signals, 5)),
+                "signals_p50": float(np.percentile(signals, 50)),
+                "signals_p95": float(np.percentile(signals, 95)),
+                "hit_rate": float(self.hits[:, column].sum() / total) if total else float("nan"),
+                "mean_return": float(self.return_sums[:, column].sum() / total) if total else float("nan"),
+                "path_return_p5": float(np.percentile(path_returns, 5)) if len(path_returns) else float("nan"),
+                "path_return_p95": float(np.percentile(path_returns, 95)) if len(path_returns) else float("nan"),
+                "paths_profitable": float(np.mean(path_returns > 0)) if len(path_returns) else float("nan"),
+            }
+
+        return summary
+
+    def format_summary(self) -> str:
+        """Текстовая таблица сводки"""
+        header = (f"{'Правило':<10} {'Сигн./путь':>10} {'p5-p95':>10} {'Hit %':>7} "
+                  f"{'Ср. дох. %':>10} {'Путей в +':>9}")
+        lines = [f"Путей: {self.n_paths}, горизонт: {self.horizon} баров", header, "-" * len(header)]
+
+        for rule, stats in self.summary().items():
+            spread = f"{stats['signals_p5']:.0f}-{stats['signals_p95']:.0f}"
+            lines.append(
+                f"{rule:<10} {stats['signals_mean']:>10.2f} {spread:>10} {stats['hit_rate'] * 100:>7.1f} "
+                f"{stats['mean_return'] * 100:>10.3f} {stats['paths_profitable'] * 100:>8.1f}%"
+            )
+
+        return "\n".join(lines)
+
+
+def simulate_batch(
+        seed: np.random.SeedSequence,
+        n_paths: int,
+        n_bars: int,
+        model: PriceModel = BTC_MODEL,
+        horizon: int = 5,
+        params: Optional[dict] = None,
+        rsi_levels: Tuple[float, float] = (30, 70)
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Прогон одной пачки путей
+
+    Returns:
+        Кортеж (signals, hits, return_sums, return_histogram), см. MonteCarloResult
+    """
+    close_prices, high_prices, low_prices = generate_paths(n_paths, n_bars, model, seed)
+    result = compute_universe(close_prices, high_prices, low_prices, **(params or {}))
+    events = SignalScanner().scan(result.columns, rsi_levels)
+
+    forward = np.full(close_prices.shape, np.nan)
+    if n_bars > horizon:
+        forward[:, :n_bars - horizon] = close_prices[:, horizon:] / close_prices[:, :n_bars - horizon] - 1
+
+    signals = np.zeros((n_paths, len(RULES)), dtype=np.int64)
+    hits = np.zeros((n_paths, len(RULES)), dtype=np.int64)
+    return_sums = np.zeros((n_paths, len(RULES)))
+    histogram = np.zeros(len(RETURN_BINS) - 1, dtype=np.int64)
+
+    for column, rule in enumerate(RULES):
+        rule_events = events[rule]
+        direction = event_directions(rule_events, rule)
+
+        returns = forward[rule_events["symbol"], rule_events["index"]]
+        usable = (direction != 0) & ~np.isnan(returns)
+        paths = rule_events["symbol"][usable]
+        signed = direction[usable] * returns[usable]
+
+        signals[:, column] = np.bincount(paths, minlength=n_paths)
+        hits[:, column] = np.bincount(paths, weights=signed > 0, minlength=n_paths).astype(np.int64)
+        return_sums[:, column] = np.bincount(paths, weights=signed, minlength=n_paths)
+        histogram += np.histogram(np.clip(signed, RETURN_BINS[0], RETURN_BINS[-1]), RETURN_BINS)[0]
+
+    return signals, hits, return_sums, histogram
+
+
+def _simulate_task(args) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    return simulate_batch(*args)
+
+
+def run_monte_carlo(
+        n_paths: int = 50_000,
+        n_bars: int = 100,
+        model: PriceModel = BTC_MODEL,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None,
+        batch_paths: int = 2_000,
+        horizon: int = 5,
+        params: Optional[dict] = None,
+        rsi_levels: Tuple[float, float] = (30, 70)
+) -> MonteCarloResult:
+    """
+    Monte Carlo-прогон сигнальных правил по n_paths синтетическим путям
+
+    Args:
+        n_paths: число путей
+        n_bars: длина каждого пути в барах
+        model: модель генератора цен
+        seed: seed корневого SeedSequence
+        workers: число процессов (по умолчанию — число ядер)
+        batch_paths: число путей в одной задаче
+        horizon: горизонт доходности после сигнала, баров
+        params: периоды индикаторов (см. universe.DEFAULT_PARAMS)
+        rsi_levels: пороги RSI (перепроданность, перекупленность)
+
+    Returns:
+        MonteCarloResult
+    """
+    for name, value in (("n_paths", n_paths), ("n_bars", n_bars), ("batch_paths", batch_paths)):
+        if value < 1:
+            raise ValueError(f"{name} должен быть не меньше 1: {value}")
+
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    sizes = [min(batch_paths, n_paths - start) for start in range(0, n_paths, batch_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(child, size, n_bars, model, horizon, params, rsi_levels) for child, size in zip(seeds, sizes)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) < 2:
+        parts = [_simulate_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(_simulate_task, tasks))
+
+    signals, hits, return_sums, histograms = zip(*parts)
+    return MonteCarloResult(
+        np.concatenate(signals),
+        np.concatenate(hits),
+        np.concatenate(return_sums),
+        np.sum(histograms, axis=0),
+        horizon,
+    )
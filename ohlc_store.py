@@ -0,0 +1,183 @@
+"""
+Бинарное колоночное хранилище OHLC на диске с чтением через np.memmap.
+
+Формат файла:
+    [заголовок HEADER_SIZE байт][колонка 0][колонка 1]...
+
+Заголовок: сигнатура MAGIC, версия, число колонок, число записанных строк,
+ёмкость (строк на колонку) и имена колонок по NAME_SIZE байт. Каждая
+колонка — непрерывный массив float64 (little-endian) длиной в ёмкость,
+колонка i начинается со смещения HEADER_SIZE + i * capacity * 8.
+Заголовок занимает целую страницу, поэтому все колонки выровнены.
+
+Открытие файла читает только заголовок, а данные подгружаются ОС
+постранично при обращении к ним.
+"""
+import os
+import struct
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+MAGIC = b"OHLCSTR1"
+VERSION = 1
+HEADER_SIZE = 4096
+NAME_SIZE = 32
+DTYPE = np.dtype("<f8")
+
+_HEADER_FORMAT = "<8sIIQQ"
+_HEADER_FIXED = struct.calcsize(_HEADER_FORMAT)
+_MAX_COLUMNS = (HEADER_SIZE - _HEADER_FIXED) // NAME_SIZE
+
+OHLC_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def _pack_header(names: Sequence[str], n_rows: int, capacity: int) -> bytes:
+    header = struct.pack(_HEADER_FORMAT, MAGIC, VERSION, len(names), n_rows, capacity)
+    for name in names:
+        encoded = name.encode("utf-8")
+        if len(encoded) > NAME_SIZE:
+            raise ValueError(f"Слишком длинное имя колонки: {name}")
+        header += encoded.ljust(NAME_SIZE, b"\0")
+    return header.ljust(HEADER_SIZE, b"\0")
+
+
+def read_header(path: str) -> Tuple[List[str], int, int]:
+    """
+    Чтение заголовка хранилища
+
+    Returns:
+        Кортеж: (имена колонок, число строк, ёмкость)
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f"{path}: файл короче заголовка")
+
+    magic, version, n_columns, n_rows, capacity = struct.unpack_from(_HEADER_FORMAT, header)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: не является хранилищем OHLC")
+    if version != VERSION:
+        raise ValueError(f"{path}: неподдерживаемая версия формата {version}")
+
+    names = []
+    for i in range(n_columns):
+        start = _HEADER_FIXED + i * NAME_SIZE
+        names.append(header[start:start + NAME_SIZE].rstrip(b"\0").decode("utf-8"))
+
+    return names, n_rows, capacity
+
+
+class StoreWriter:
+    """
+    Запись хранилища порциями с заранее заданной ёмкостью
+
+    Пример:
+        with StoreWriter("btc.ohlc", OHLC_COLUMNS, capacity=10_000_000) as writer:
+            for chunk in chunks:
+                writer.append(chunk)
+    """
+
+    def __init__(self, path: str, columns: Sequence[str], capacity: int):
+        if len(columns) > _MAX_COLUMNS:
+            raise ValueError(f"Не больше {_MAX_COLUMNS} колонок")
+
+        self.path = path
+        self.columns = list(columns)
+        self.capacity = capacity
+        self.n_rows = 0
+
+        self._file = open(path, "w+b")
+        self._file.write(_pack_header(self.columns, 0, capacity))
+        self._file.truncate(HEADER_SIZE + len(self.columns) * capacity * DTYPE.itemsize)
+
+    def append(self, chunk: Mapping[str, Iterable[float]]):
+        """
+        Дописывание порции строк: словарь колонка -> значения одинаковой длины
+        """
+        arrays = [np.ascontiguousarray(chunk[name], dtype=DTYPE) for name in self.columns]
+        length = len(arrays[0])
+
+        if any(len(array) != length for array in arrays):
+            raise ValueError("Колонки порции имеют разную длину")
+        if self.n_rows + length > self.capacity:
+            raise ValueError(f"Превышена ёмкость хранилища: {self.capacity} строк")
+
+        for i, array in enumerate(arrays):
+            self._file.seek(HEADER_SIZE + (i * self.capacity + self.n_rows) * DTYPE.itemsize)
+            self._file.write(array.data)
+
+        self.n_rows += length
+
+    def close(self):
+        """Запись итогового числа строк в заголовок и закрытие файла"""
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(_pack_header(self.columns, self.n_rows, self.capacity))
+        self._file.close()
+
+    def __enter__(self) -> "StoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def write_store(path: str, columns: Mapping[str, Sequence[float]]):
+    """
+    Запись хранилища из колонок, целиком находящихся в памяти
+    """
+    names = list(columns)
+    n_rows = len(columns[names[0]])
+
+    with StoreWriter(path, names, n_rows) as writer:
+        writer.append(columns)
+
+
+class OHLCStore:
+    """
+    Хранилище, открытое на чтение через np.memmap
+
+    Колонки возвращаются как представления memmap без копирования и
+    подаются в функции indicators_np напрямую:
+
+        store = OHLCStore("btc.ohlc")
+        rsi = indicators_np.calculate_rsi(store["close"])
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.columns, self.n_rows, self.capacity = read_header(path)
+
+        expected = HEADER_SIZE + len(self.columns) * self.capacity * DTYPE.itemsize
+        if os.path.getsize(path) < expected:
+            raise ValueError(f"{path}: файл обрезан")
+
+        if self.capacity:
+            self._data = np.memmap(path, dtype=DTYPE, mode="r", offset=HEADER_SIZE,
+                                   shape=(len(self.columns), self.capacity))
+        else:
+            self._data = np.empty((len(self.columns), 0), dtype=DTYPE)
+        self._index = {name: i for i, name in enumerate(self.columns)}
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._index
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self._data[self._index[column], :self.n_rows]
+
+    def slice(self, start: int, stop: int) -> Dict[str, np.ndarray]:
+        """Все колонки в диапазоне строк [start, stop) без копирования"""
+        return {name: self[name][start:stop] for name in self.columns}
+
+    def price_data(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(close_prices, high_prices, low_prices) — как у генераторов данных"""
+        return self["close"], self["high"], self["low"]
+
+    def __repr__(self) -> str:
+        return f"OHLCStore({self.path!r}, rows={self.n_rows}, columns={self.columns})"
@@ -1,211 +1,20 @@
 import random
-from typing import List, Optional, Tuple
-
-
-def calculate_sma(prices: List[float], period: int) -> List[Optional[float]]:
-    """
-    Вычисление простой скользящей средней (SMA)
-
-    Args:
-        prices: список цен
-        period: период SMA
-
-    Returns:
-        Список значений SMA
-    """
-    if len(prices) < period:
-        return [None] * len(prices)
-
-    sma_values = []
-    for i in range(len(prices)):
-        if i < period - 1:
-            sma_values.append(None)
-        else:
-            window = prices[i - period + 1: i + 1]
-            sma = sum(window) / period
-            sma_values.append(sma)
-
-    return sma_values
-
-
-def calculate_ema(prices: List[float], period: int = 13) -> List[Optional[float]]:
-    """
-    Вычисление экспоненциальной скользящей средней (EMA)
-    """
-    if len(prices) < period:
-        return [None] * len(prices)
-
-    ema_values = [None] * (period - 1)
-
-    sma = sum(prices[:period]) / period
-    ema_values.append(sma)
-
-    multiplier = 2 / (period + 1)
-
-    for i in range(period, len(prices)):
-        ema = (prices[i] - ema_values[i - 1]) * multiplier + ema_values[i - 1]
-        ema_values.append(ema)
-
-    return ema_values
-
-
-def calculate_ema_with_none(prices: List[Optional[float]], period: int = 13) -> List[Optional[float]]:
-    """
-    Вычисление EMA для списка, который может содержать None значения
-    """
-    if len(prices) < period:
-        return [None] * len(prices)
-
-    start_idx = 0
-    for i in range(len(prices)):
-        if prices[i] is not None:
-            start_idx = i
-            break
-
-    if len(prices) - start_idx < period:
-        return [None] * len(prices)
-
-    valid_prices = [p for p in prices if p is not None]
-
-    if len(valid_prices) < period:
-        return [None] * len(prices)
-
-    ema_result = calculate_ema(valid_prices, period)
-
-    result = [None] * start_idx
-    result.extend(ema_result)
-
-    while len(result) < len(prices):
-        result.append(None)
-
-    return result[:len(prices)]
-
-
-def calculate_momentum(prices: List[float], period: int = 10) -> List[Optional[float]]:
-    """
-    Вычисление индикатора Momentum
-    """
-    momentum_values = []
-
-    for i in range(len(prices)):
-        if i < period:
-            momentum_values.append(None)
-        else:
-            momentum = prices[i] - prices[i - period]
-            momentum_values.append(momentum)
-
-    return momentum_values
-
-
-def calculate_rsi(close_prices: List[float], period: int = 14) -> List[Optional[float]]:
-    """
-    Вычисление индикатора RSI (Relative Strength Index)
-
-    Args:
-        close_prices: список цен закрытия
-        period: период RSI (обычно 14)
-
-    Returns:
-        Список значений RSI
-    """
-    if len(close_prices) < period + 1:
-        return [None] * len(close_prices)
-
-    changes = [close_prices[i] - close_prices[i - 1]
-               for i in range(1, len(close_prices))]
-
-    gains = [max(change, 0) for change in changes]
-    losses = [abs(min(change, 0)) for change in changes]
-
-    rsi_values = [None] * period
-
-    avg_gain = sum(gains[:period]) / period
-    avg_loss = sum(losses[:period]) / period
-
-    if avg_loss == 0:
-        first_rsi = 100
-    else:
-        rs = avg_gain / avg_loss
-        first_rsi = 100 - (100 / (1 + rs))
-
-    rsi_values.append(first_rsi)
-
-    for i in range(period, len(gains)):
-        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
-
-        if avg_loss == 0:
-            rsi = 100
-        else:
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-
-        rsi_values.append(rsi)
-
-    return rsi_values
-
-
-def calculate_macd(close_prices: List[float], fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[
-    List[Optional[float]], List[Optional[float]], List[Optional[float]]]:
-    """
-    Вычисление индикатора MACD
-
-    Args:
-        close_prices: список цен закрытия
-        fast: период быстрой EMA
-        slow: период медленной EMA
-        signal: период сигнальной линии
-
-    Returns:
-        Кортеж: (macd_line, signal_line, histogram)
-    """
-    ema_fast = calculate_ema(close_prices, fast)
-    ema_slow = calculate_ema(close_prices, slow)
-
-    macd_line = []
-    for i in range(len(close_prices)):
-        if ema_fast[i] is None or ema_slow[i] is None:
-            macd_line.append(None)
-        else:
-            macd_line.append(ema_fast[i] - ema_slow[i])
-
-    signal_line = calculate_ema_with_none(macd_line, signal)
-
-    histogram = []
-    for i in range(len(macd_line)):
-        if macd_line[i] is None or signal_line[i] is None:
-            histogram.append(None)
-        else:
-            histogram.append(macd_line[i] - signal_line[i])
-
-    return macd_line, signal_line, histogram
-
-
-def calculate_bull_bear_power(
-        high_prices: List[float],
-        low_prices: List[float],
-        close_prices: List[float],
-        period: int = 13
-) -> tuple:
-    """
-    Вычисление индикатора Bull Bear Power
-    """
-    ema_close = calculate_ema(close_prices, period)
-
-    bull_power = []
-    bear_power = []
-
-    for i in range(len(close_prices)):
-        if ema_close[i] is None:
-            bull_power.append(None)
-            bear_power.append(None)
-        else:
-            bull_power.append(high_prices[i] - ema_close[i])
-            bear_power.append(low_prices[i] - ema_close[i])
-
-    return bull_power, bear_power
-
-
+import sys
+from typing import List, Optional
+
+import instrumentation
+from algotradesim import (
+    calculate_bull_bear_power,
+    calculate_macd,
+    calculate_momentum,
+    calculate_rsi,
+)
+from instrumentation import instrument, stage
+from renderer import render_report
+from running_stats import RunningStats
+
+
+@instrument()
 def generate_pepe_price_data(days: int = 100) -> tuple:
     """
     Генерация тестовых данных цен для PEPE
@@ -243,6 +52,7 @@ def generate_pepe_price_data(days: int = 100) -> tuple:
     return close_prices, high_prices, low_prices
 
 
+@instrument()
 def plot_results(
         close_prices: List[float],
         momentum_values: List[Optional[float]],
@@ -255,158 +65,24 @@ def plot_results(
 ):
     """
     Простая текстовая визуализация результатов (без графиков)
-    """
-    print("\n" + "=" * 70)
-    print("ТЕКСТОВАЯ ВИЗУАЛИЗАЦИЯ РЕЗУЛЬТАТОВ")
-    print("=" * 70)
-
-    days_to_show = 30
-    start_idx = max(0, len(close_prices) - days_to_show)
-
-    print("\nСимвольный график цены (последние 30 дней):")
-    print("-" * 70)
-
-    display_prices = close_prices[start_idx:]
-    min_price = min(display_prices)
-    max_price = max(display_prices)
-
-    for i, price in enumerate(display_prices):
-        normalized = int(((price - min_price) / (max_price - min_price)) * 50) if max_price > min_price else 25
-        day_num = start_idx + i + 1
-        price_str = f"{price:.8f}"
-        graph_bar = "█" * (normalized + 1)
-
-        trend_marker = ""
-        if i > 0:
-            if price > display_prices[i - 1]:
-                trend_marker = "↗"
-            elif price < display_prices[i - 1]:
-                trend_marker = "↘"
-            else:
-                trend_marker = "→"
-
-        print(f"День {day_num:3d}: {trend_marker} {price_str} {graph_bar}")
-
-    if rsi_values:
-        print("\n" + "=" * 70)
-        print("Индикатор RSI (последние 30 дней):")
-        print("=" * 70)
-
-        rsi_display = rsi_values[start_idx:]
-        for i, rsi in enumerate(rsi_display):
-            day_num = start_idx + i + 1
-            if rsi is None:
-                rsi_str = "N/A"
-                bar = ""
-            else:
-                rsi_str = f"{rsi:.2f}"
-
-                if rsi > 70:
-                    level = "Перекупленность"
-                elif rsi < 30:
-                    level = "Перепроданность"
-                else:
-                    level = "Нейтрально"
-
-                bar_length = min(20, int(abs(rsi - 50) / 2.5))
-                if rsi > 50:
-                    bar = "█" * bar_length + f" ↑ {level}"
-                else:
-                    bar = " " * (20 - bar_length) + "█" * bar_length + f" ↓ {level}"
-
-            print(f"День {day_num:3d}: RSI: {rsi_str:6s} {bar}")
-
-    if macd_line and signal_line and histogram:
-        print("\n" + "=" * 70)
-        print("Индикатор MACD (последние 30 дней):")
-        print("=" * 70)
-
-        macd_display = macd_line[start_idx:]
-        signal_display = signal_line[start_idx:]
-        hist_display = histogram[start_idx:]
-
-        for i in range(len(macd_display)):
-            day_num = start_idx + i + 1
-            macd_val = macd_display[i]
-            signal_val = signal_display[i]
-            hist_val = hist_display[i]
-
-            if macd_val is None or signal_val is None or hist_val is None:
-                print(f"День {day_num:3d}: MACD: N/A | Signal: N/A | Hist: N/A")
-            else:
-                macd_str = f"{macd_val:+.8f}"
-                signal_str = f"{signal_val:+.8f}"
-                hist_str = f"{hist_val:+.8f}"
-
-                if hist_val > 0:
-                    signal = "Бычий"
-                else:
-                    signal = "Медвежий"
-
-                if i > 0 and macd_display[i - 1] is not None and signal_display[i - 1] is not None:
-                    if macd_val > signal_val and macd_display[i - 1] <= signal_display[i - 1]:
-                        cross = "↑ Пересечение вверх"
-                    elif macd_val < signal_val and macd_display[i - 1] >= signal_display[i - 1]:
-                        cross = "↓ Пересечение вниз"
-                    else:
-                        cross = ""
-                else:
-                    cross = ""
-
-                print(
-                    f"День {day_num:3d}: MACD: {macd_str} | Signal: {signal_str} | Hist: {hist_str} [{signal}] {cross}")
-
-    print("\n" + "=" * 70)
-    print("Символьные графии индикаторов (последние 30 дней):")
-    print("=" * 70)
-
-    print("\nMomentum:")
-    momentum_display = momentum_values[start_idx:]
-    momentum_clean = [0 if v is None else v for v in momentum_display]
-    mom_min = min(momentum_clean)
-    mom_max = max(momentum_clean)
-
-    for i, mom in enumerate(momentum_display):
-        if mom is None:
-            bar = " " * 25 + "N/A"
-        else:
-            normalized = int(((mom - mom_min) / (mom_max - mom_min)) * 25) if mom_max > mom_min else 12
-            bar = (" " * (12 - normalized // 2)) + "█" * normalized
-            if mom > 0:
-                bar += " [+]"
-            else:
-                bar += " [-]"
-
-        day_num = start_idx + i + 1
-        mom_str = f"{mom:.8f}" if mom is not None else "      N/A     "
-        print(f"День {day_num:3d}: {mom_str} {bar}")
-
-    print("\nBull/Bear Power:")
-    bull_display = bull_power[start_idx:]
-    bear_display = bear_power[start_idx:]
-
-    for i in range(len(bull_display)):
-        bull = bull_display[i]
-        bear = bear_display[i]
-        day_num = start_idx + i + 1
-
-        if bull is None or bear is None:
-            print(f"День {day_num:3d}: Bull: N/A | Bear: N/A")
-        else:
-            bull_str = f"{bull:+.8f}"
-            bear_str = f"{bear:+.8f}"
-
-            bull_strength = ""
-            bear_strength = ""
-
-            if bull > 0:
-                bull_strength = "█" * min(10, int(abs(bull) * 1000))
-            if bear < 0:
-                bear_strength = "█" * min(10, int(abs(bear) * 1000))
 
-            print(f"День {day_num:3d}: Bull: {bull_str} {bull_strength:10s} | Bear: {bear_str} {bear_strength:10s}")
+    Отчёт собирается в один буфер (renderer.render_report) и выводится одной записью.
+    """
+    sys.stdout.write(render_report(
+        close_prices,
+        momentum_values,
+        bull_power,
+        bear_power,
+        rsi_values,
+        macd_line,
+        signal_line,
+        histogram,
+        value_format=".8f",
+        power_unit=0.001
+    ))
 
 
+@instrument()
 def main():
     """Основная функция для тестирования"""
     print("=" * 60)
@@ -460,42 +136,44 @@ def main():
     print("Анализ сигналов:")
     print(f"{'=' * 60}")
 
-    mom_signals = []
-    for i in range(momentum_period + 1, days - 1):
-        if momentum_values[i] is not None and momentum_values[i - 1] is not None:
-            if momentum_values[i] > 0 and momentum_values[i - 1] <= 0:
-                mom_signals.append((i, "BUY", momentum_values[i]))
-            elif momentum_values[i] < 0 and momentum_values[i - 1] >= 0:
-                mom_signals.append((i, "SELL", momentum_values[i]))
-
-    rsi_signals = []
-    for i in range(rsi_period + 1, days - 1):
-        if rsi_values[i] is not None and rsi_values[i - 1] is not None:
-            if rsi_values[i] < 30 and rsi_values[i - 1] >= 30:
-                rsi_signals.append((i, "Перепродано (BUY)", rsi_values[i]))
-            elif rsi_values[i] > 70 and rsi_values[i - 1] <= 70:
-                rsi_signals.append((i, "Перекуплено (SELL)", rsi_values[i]))
-
-    macd_signals = []
-    for i in range(max(macd_slow, macd_signal) + 1, days - 1):
-        if macd_line[i] is not None and signal_line[i] is not None:
-
-            if histogram[i] is not None and histogram[i - 1] is not None:
-                if histogram[i] > 0 and histogram[i - 1] <= 0:
-                    macd_signals.append((i, "Histogram ↑ (BUY)", macd_line[i], histogram[i]))
-                elif histogram[i] < 0 and histogram[i - 1] >= 0:
-                    macd_signals.append((i, "Histogram ↓ (SELL)", macd_line[i], histogram[i]))
-
-
-    bbp_signals = []
-    for i in range(bbp_period + 1, days - 1):
-        if bull_power[i] is not None and bear_power[i] is not None:
-            if bull_power[i] > 0 and bear_power[i] > 0:
-                bbp_signals.append((i, "Сильный бычий", bull_power[i], bear_power[i]))
-            elif bull_power[i] < 0 and bear_power[i] < 0:
-                bbp_signals.append((i, "Сильный медвежий", bull_power[i], bear_power[i]))
-            elif bull_power[i] > 0 > bear_power[i]:
-                bbp_signals.append((i, "Борьба", bull_power[i], bear_power[i]))
+    with stage("signals", bars=days):
+        mom_signals = []
+        for i in range(momentum_period + 1, days - 1):
+            if momentum_values[i] is not None and momentum_values[i - 1] is not None:
+                if momentum_values[i] > 0 and momentum_values[i - 1] <= 0:
+                    mom_signals.append((i, "BUY", momentum_values[i]))
+                elif momentum_values[i] < 0 and momentum_values[i - 1] >= 0:
+                    mom_signals.append((i, "SELL", momentum_values[i]))
+
+        rsi_signals = []
+        for i in range(rsi_period + 1, days - 1):
+            if rsi_values[i] is not None and rsi_values[i - 1] is not None:
+                if rsi_values[i] < 30 and rsi_values[i - 1] >= 30:
+                    rsi_signals.append((i, "Перепродано (BUY)", rsi_values[i]))
+                elif rsi_values[i] > 70 and rsi_values[i - 1] <= 70:
+                    rsi_signals.append((i, "Перекуплено (SELL)", rsi_values[i]))
+
+        macd_signals = []
+        for i in range(max(macd_slow, macd_signal) + 1, days - 1):
+            if macd_line[i] is not None and signal_line[i] is not None:
+
+                if histogram[i] is not None and histogram[i - 1] is not None:
+                    if histogram[i] > 0 and histogram[i - 1] <= 0:
+                        macd_signals.append((i, "Histogram ↑ (BUY)", macd_line[i], histogram[i]))
+                    elif histogram[i] < 0 and histogram[i - 1] >= 0:
+                        macd_signals.append((i, "Histogram ↓ (SELL)", macd_line[i], histogram[i]))
+
+
+        bbp_signals = []
+        for i in range(bbp_period + 1, days - 1):
+            if bull_power[i] is not None and bear_power[i] is not None:
+                if bull_power[i] > 0 and bear_power[i] > 0:
+                    bbp_signals.append((i, "Сильный бычий", bull_power[i], bear_power[i]))
+                elif bull_power[i] < 0 and bear_power[i] < 0:
+                    bbp_signals.append((i, "Сильный медвежий", bull_power[i], bear_power[i]))
+                elif bull_power[i] > 0 > bear_power[i]:
+                    bbp_signals.append((i, "Борьба", bull_power[i], bear_power[i]))
+
 
     print(f"\nСигналы Momentum (пересечение нуля):")
     for signal in mom_signals[-10:]:
@@ -531,46 +209,50 @@ def main():
     print("Статистика:")
     print(f"{'=' * 60}")
 
-    valid_momentum = [m for m in momentum_values if m is not None]
-    valid_bull = [b for b in bull_power if b is not None]
-    valid_bear = [b for b in bear_power if b is not None]
-    valid_rsi = [r for r in rsi_values if r is not None]
-    valid_macd = [m for m in macd_line if m is not None]
-    valid_hist = [h for h in histogram if h is not None]
-
-    if valid_momentum:
-        print(f"Momentum:")
-        print(f"  Среднее: {sum(valid_momentum) / len(valid_momentum):.8f}")
-        print(f"  Максимум: {max(valid_momentum):.8f}")
-        print(f"  Минимум: {min(valid_momentum):.8f}")
-
-    if valid_rsi:
-        print(f"\nRSI:")
-        print(f"  Среднее: {sum(valid_rsi) / len(valid_rsi):.2f}")
-        print(f"  Максимум: {max(valid_rsi):.2f}")
-        print(f"  Минимум: {min(valid_rsi):.2f}")
-        print(f"  Дней в перекупленности (>70): {sum(1 for r in valid_rsi if r > 70)}")
-        print(f"  Дней в перепроданности (<30): {sum(1 for r in valid_rsi if r < 30)}")
-
-    if valid_macd:
-        print(f"\nMACD:")
-        print(f"  Среднее: {sum(valid_macd) / len(valid_macd):.8f}")
-        print(f"  Максимум: {max(valid_macd):.8f}")
-        print(f"  Минимум: {min(valid_macd):.8f}")
-        print(f"  Положительных значений: {sum(1 for m in valid_macd if m > 0)}/{len(valid_macd)}")
-
-    if valid_hist:
-        print(f"\nMACD Гистограмма:")
-        print(f"  Положительных значений: {sum(1 for h in valid_hist if h > 0)}/{len(valid_hist)}")
-
-    if valid_bull and valid_bear:
-        print(f"\nBull Power:")
-        print(f"  Положительных значений: {sum(1 for b in valid_bull if b > 0)}/{len(valid_bull)}")
-        print(f"  Среднее: {sum(valid_bull) / len(valid_bull):.8f}")
-
-        print(f"\nBear Power:")
-        print(f"  Отрицательных значений: {sum(1 for b in valid_bear if b < 0)}/{len(valid_bear)}")
-        print(f"  Среднее: {sum(valid_bear) / len(valid_bear):.8f}")
+    with stage("statistics", bars=days):
+        momentum_stats = RunningStats().update(momentum_values)
+        bull_stats = RunningStats().update(bull_power)
+        bear_stats = RunningStats().update(bear_power)
+        rsi_stats = RunningStats(above=(70,), below=(30,)).update(rsi_values)
+        macd_stats = RunningStats().update(macd_line)
+        hist_stats = RunningStats().update(histogram)
+
+    # Вывод отдельным этапом, чтобы время статистики не включало консольный ввод-вывод
+    with stage("report"):
+        if momentum_stats:
+            print(f"Momentum:")
+            print(f"  Среднее: {momentum_stats.mean:.8f}")
+            print(f"  Максимум: {momentum_stats.max:.8f}")
+            print(f"  Минимум: {momentum_stats.min:.8f}")
+
+        if rsi_stats:
+            print(f"\nRSI:")
+            print(f"  Среднее: {rsi_stats.mean:.2f}")
+            print(f"  Максимум: {rsi_stats.max:.2f}")
+            print(f"  Минимум: {rsi_stats.min:.2f}")
+            print(f"  Дней в перекупленности (>70): {rsi_stats.count_above(70)}")
+            print(f"  Дней в перепроданности (<30): {rsi_stats.count_below(30)}")
+
+        if macd_stats:
+            print(f"\nMACD:")
+            print(f"  Среднее: {macd_stats.mean:.8f}")
+            print(f"  Максимум: {macd_stats.max:.8f}")
+            print(f"  Минимум: {macd_stats.min:.8f}")
+            print(f"  Положительных значений: {macd_stats.positive}/{macd_stats.count}")
+
+        if hist_stats:
+            print(f"\nMACD Гистограмма:")
+            print(f"  Положительных значений: {hist_stats.positive}/{hist_stats.count}")
+
+        if bull_stats and bear_stats:
+            print(f"\nBull Power:")
+            print(f"  Положительных значений: {bull_stats.positive}/{bull_stats.count}")
+            print(f"  Среднее: {bull_stats.mean:.8f}")
+
+            print(f"\nBear Power:")
+            print(f"  Отрицательных значений: {bear_stats.negative}/{bear_stats.count}")
+            print(f"  Среднее: {bear_stats.mean:.8f}")
+
 
     print("\n" + "=" * 60)
     print("Краткий отчёт:")
@@ -616,4 +298,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+
+    if instrumentation.is_enabled():
+        print()
+        print(instrumentation.summary())
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Векторизованный генератор тестовых OHLC-данных.
+
+Та же модель, что в generate_btc_price_data / generate_pepe_price_data,
+но сразу для N путей × M баров одним вызовом и из numpy.random.Generator,
+поэтому результат воспроизводим по seed, а независимые потоки для разных
+процессов получаются через SeedSequence.spawn().
+
+Модель на каждом баре: close = close_prev * trend, high = close * (1 + wick),
+low = close * (1 - wick), где trend и верхняя граница wick (volatility)
+равномерно распределены в полосах, зависящих от номера дня.
+"""
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Полоса: (день, с которого она перестаёт действовать, нижняя граница, верхняя граница);
+# None в первом поле — полоса действует до конца ряда
+Band = Tuple[Optional[int], float, float]
+
+
+class PriceModel:
+    """
+    Параметры модели генератора: стартовая цена и расписание режимов
+
+    Args:
+        start_price: цена закрытия первого дня
+        volatility_bands: полосы верхней границы тени по дням
+        trend_bands: полосы дневного множителя цены по дням
+        min_wick: нижняя граница тени свечи
+        first_bar_range: high/low первого дня = start_price * (1 ± first_bar_range)
+    """
+
+    def __init__(
+            self,
+            start_price: float,
+            volatility_bands: Sequence[Band],
+            trend_bands: Sequence[Band],
+            min_wick: float,
+            first_bar_range: float = 0.02
+    ):
+        self.start_price = start_price
+        self.volatility_bands = tuple(volatility_bands)
+        self.trend_bands = tuple(trend_bands)
+        self.min_wick = min_wick
+        self.first_bar_range = first_bar_range
+
+    def __repr__(self) -> str:
+        return f"PriceModel(start_price={self.start_price}, min_wick={self.min_wick})"
+
+
+BTC_MODEL = PriceModel(
+    start_price=50000.0,
+    volatility_bands=[(30, 0.01, 0.05), (None, 0.02, 0.08)],
+    trend_bands=[(40, 0.98, 1.04), (70, 0.96, 1.03), (None, 0.94, 1.02)],
+    min_wick=0.005,
+)
+
+PEPE_MODEL = PriceModel(
+    start_price=0.00001,
+    volatility_bands=[(30, 0.02, 0.15), (None, 0.05, 0.3)],
+    trend_bands=[(40, 0.95, 1.08), (70, 0.92, 1.05), (None, 0.88, 1.02)],
+    min_wick=0.01,
+)
+
+
+def band_bounds(bands: Sequence[Band], days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Нижняя и верхняя граница полосы для каждого дня из days
+    """
+    limits = np.array([np.inf if until is None else until for until, _, _ in bands])
+    lows = np.array([low for _, low, _ in bands])
+    highs = np.array([high for _, _, high in bands])
+
+    band = np.minimum(np.searchsorted(limits, days, side="right"), len(bands) - 1)
+    return lows[band], highs[band]
+
+
+def generate_paths(
+        n_paths: int,
+        n_bars: int,
+        model: PriceModel = BTC_MODEL,
+        seed: Union[None, int, np.random.SeedSequence, np.random.Generator] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Генерация n_paths путей по n_bars баров
+
+    Args:
+        n_paths: число независимых путей
+        n_bars: число баров (дней) в каждом пути
+        model: параметры модели (BTC_MODEL, PEPE_MODEL или свои)
+        seed: seed, SeedSequence или готовый numpy.random.Generator
+
+    Returns:
+        Кортеж массивов (close_prices, high_prices, low_prices) формы (n_paths, n_bars)
+    """
+    if n_paths < 1 or n_bars < 1:
+        raise ValueError(f"n_paths и n_bars должны быть не меньше 1: {n_paths}, {n_bars}")
+
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    shape = (n_paths, n_bars - 1)
+
+    days = np.arange(1, n_bars)
+    vol_low, vol_high = band_bounds(model.volatility_bands, days)
+    trend_low, trend_high = band_bounds(model.trend_bands, days)
+
+    close_prices = np.empty((n_paths, n_bars))
+    close_prices[:, 0] = model.start_price
+
+    trend = rng.random(shape)
+    trend *= trend_high - trend_low
+    trend += trend_low
+    np.cumprod(trend, axis=1, out=close_prices[:, 1:])
+    close_prices[:, 1:] *= model.start_price
+
+    volatility = rng.random(shape)
+    volatility *= vol_high - vol_low
+    volatility += vol_low
+    volatility -= model.min_wick
+
+    high_prices = np.empty_like(close_prices)
+    low_prices = np.empty_like(close_prices)
+    high_prices[:, 0] = model.start_price * (1 + model.first_bar_range)
+    low_prices[:, 0] = model.start_price * (1 - model.first_bar_range)
+
+    upper_wick = rng.random(shape)
+    upper_wick *= volatility
+    upper_wick += 1 + model.min_wick
+    np.multiply(close_prices[:, 1:], upper_wick, out=high_prices[:, 1:])
+
+    lower_wick = rng.random(shape)
+    lower_wick *= volatility
+    lower_wick += model.min_wick
+    np.subtract(1, lower_wick, out=lower_wick)
+    np.multiply(close_prices[:, 1:], lower_wick, out=low_prices[:, 1:])
+
+    # Инварианты high >= close >= low без ветвлений по барам
+    np.maximum(high_prices, close_prices, out=high_prices)
+    np.minimum(low_prices, close_prices, out=low_prices)
+
+    return close_prices, high_prices, low_prices
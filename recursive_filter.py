@@ -0,0 +1,222 @@
+"""
+Рекурсивный фильтр первого порядка — векторное ядро сглаживающих индикаторов.
+
+EMA (k = 2 / (period + 1)), средние Уайлдера в RSI (k = 1 / period) и
+сигнальная линия MACD — одна и та же рекурсия
+
+    y[t] = (1 - k) * y[t-1] + k * x[t],
+
+которая начинается с SMA первых period значений. Здесь она считается
+без цикла Python по элементам: последовательность режется на блоки, и
+внутри блока рекурсия раскрывается через cumsum (см. linear_filter).
+Все функции работают вдоль последней оси: ряд (bars,) или матрица
+(symbols, bars). smooth_many считает сразу несколько периодов одним
+вызовом фильтра, периоды добавляются как ведущая ось.
+
+Ядро используют массивные версии (indicators_np, chunked). Списочные
+функции algotradesim.py и потоковые классы streaming.py без NumPy
+работают по одному значению и делают тот же шаг через ema_step и
+wilder_step из algotradesim.py.
+"""
+import math
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Предел роста множителя d^-k внутри блока (e^300 < 1e131)
+_MAX_LOG_GROWTH = 300.0
+_MAX_BLOCK = 4096
+
+# При меньшем множителе вклад y[t-2] (< d^2) ниже точности float64
+_MIN_DECAY = 1e-9
+
+
+def ema_alpha(period: int) -> float:
+    """Коэффициент сглаживания EMA: 2 / (period + 1)"""
+    return 2 / (period + 1)
+
+
+def wilder_alpha(period: int) -> float:
+    """Коэффициент сглаживания Уайлдера (RSI, ATR): 1 / period"""
+    return 1 / period
+
+
+def _short_filter(values: np.ndarray, decay, initial, scale: float,
+                  out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Фильтр при decay < _MIN_DECAY: учитывается только предыдущий шаг"""
+    decay = np.asarray(decay, dtype=np.float64)
+    out = np.multiply(values, scale, out=out)
+    out[..., 1:] += (decay[..., None] * scale) * values[..., :-1]
+    out[..., 0] += decay * initial
+    return out
+
+
+def linear_filter(values: np.ndarray, decay, initial, scale: float = 1.0,
+                  out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Рекурсивный фильтр первого порядка y[t] = decay * y[t-1] + scale * x[t]
+
+    Последовательность режется на блоки длины B. Внутри блока рекурсия
+    раскрывается через cumsum: y[j] = d^j * Σ x[k] * d^-k, а значения на
+    границах блоков сами образуют такую же рекурсию с множителем d^B и
+    считаются тем же способом. Длина блока ограничена так, чтобы d^-B
+    не переполнялся.
+
+    Args:
+        values: входной массив (..., n)
+        decay: множитель d, 0 <= d < 1: скаляр или массив формы (...) —
+            свой множитель для каждой строки
+        initial: состояние y[-1], скаляр или массив формы (...)
+        scale: множитель входа
+        out: массив для результата (по умолчанию создаётся новый)
+
+    Returns:
+        Массив y той же формы, что и values
+    """
+    lead = values.shape[:-1]
+    n = values.shape[-1]
+    initial = np.broadcast_to(np.asarray(initial, dtype=np.float64), lead)
+    if out is None:
+        out = np.empty(values.shape, dtype=np.float64)
+
+    if n == 0:
+        return out
+
+    if np.ndim(decay) == 0:
+        decay = float(decay)
+        if decay < _MIN_DECAY:
+            return _short_filter(values, decay, initial, scale, out)
+        growth = -math.log(decay)
+        column = decay
+    else:
+        decay = np.broadcast_to(np.asarray(decay, dtype=np.float64), lead)
+        if not decay.size:
+            return out
+        short = decay < _MIN_DECAY
+        if short.any():
+            # Строки с малым множителем считаются напрямую, остальные — блоками
+            out[short] = _short_filter(values[short], decay[short], initial[short], scale)
+            if not short.all():
+                long = ~short
+                out[long] = linear_filter(values[long], decay[long], initial[long], scale)
+            return out
+        growth = -math.log(decay.min())
+        column = decay[..., None]
+
+    block = int(min(_MAX_BLOCK, _MAX_LOG_GROWTH / growth, n))
+    steps = np.arange(block, dtype=np.float64)
+    weights = scale * column ** -steps
+    shrink = column ** steps
+    carry_weights = shrink * column
+
+    n_blocks = n // block
+    n_full = n_blocks * block
+    carry = initial
+
+    if n_blocks:
+        blocks = values[..., :n_full].reshape(lead + (n_blocks, block))
+        body = np.multiply(blocks, weights if np.ndim(decay) == 0 else weights[..., None, :])
+        np.cumsum(body, axis=-1, out=body)
+        body *= shrink if np.ndim(decay) == 0 else shrink[..., None, :]
+
+        block_decay = decay ** block
+        if n_blocks > 1:
+            ends = linear_filter(body[..., -1], block_decay, initial)
+            previous = np.concatenate([initial[..., None], ends[..., :-1]], axis=-1)
+            carry = ends[..., -1]
+        else:
+            previous = initial[..., None]
+            carry = body[..., 0, -1] + initial * block_decay
+
+        body += previous[..., None] * (carry_weights if np.ndim(decay) == 0 else carry_weights[..., None, :])
+        out[..., :n_full] = body.reshape(lead + (n_full,))
+
+    rest = n - n_full
+    if rest:
+        tail = np.cumsum(values[..., n_full:] * weights[..., :rest], axis=-1)
+        tail *= shrink[..., :rest]
+        tail += np.asarray(carry)[..., None] * carry_weights[..., :rest]
+        out[..., n_full:] = tail
+
+    return out
+
+
+def smooth(values: np.ndarray, alpha: float, period: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Экспоненциальное сглаживание с затравкой SMA первых period значений
+
+    Args:
+        values: входной массив (..., n)
+        alpha: коэффициент сглаживания k (ema_alpha, wilder_alpha)
+        period: число значений в затравке
+        out: массив для результата, может совпадать с values
+
+    Returns:
+        Массив той же формы, NaN на первых period - 1 позициях
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = values.shape[-1]
+    if out is None:
+        out = np.empty(values.shape, dtype=np.float64)
+
+    if n < period:
+        out[...] = np.nan
+        return out
+
+    # Затравка считается до записи в out: out может совпадать с values
+    seed = values[..., :period].sum(axis=-1) / period
+    out[..., :period - 1] = np.nan
+    out[..., period - 1] = seed
+    linear_filter(values[..., period:], 1 - alpha, seed, alpha, out=out[..., period:])
+    return out
+
+
+def smooth_many(values: np.ndarray, periods: Sequence[int], alphas: Optional[Sequence[float]] = None) -> np.ndarray:
+    """
+    smooth() сразу для нескольких периодов одним вызовом фильтра
+
+    Каждому периоду соответствует строка ведущей оси. Затравка периода p
+    подаётся во вход фильтра на позиции p - 1 (до неё вход нулевой), поэтому
+    все периоды фильтруются вместе с позиции min(periods). Результат
+    совпадает с smooth() с точностью до округления затравки.
+
+    Args:
+        values: входной массив (..., n)
+        periods: периоды (длины затравки)
+        alphas: коэффициенты сглаживания (по умолчанию ema_alpha(period))
+
+    Returns:
+        Массив формы (len(periods), ..., n)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    periods = [int(period) for period in periods]
+    alphas = [ema_alpha(period) for period in periods] if alphas is None else [float(a) for a in alphas]
+    n = values.shape[-1]
+
+    result = np.full((len(periods),) + values.shape, np.nan)
+    # Периоды длиннее ряда остаются NaN целиком
+    batched = [i for i, period in enumerate(periods) if period <= n]
+    if not batched:
+        return result
+
+    first = min(periods[i] for i in batched) - 1
+    inputs = np.zeros((len(batched),) + values.shape[:-1] + (n - first,))
+    batch_alphas = np.array([alphas[i] for i in batched])
+
+    for row, i in enumerate(batched):
+        period = periods[i]
+        start = period - 1 - first
+        inputs[row, ..., start] = values[..., :period].sum(axis=-1) / period / alphas[i]
+        inputs[row, ..., start + 1:] = values[..., period:]
+
+    lead_ones = (1,) * (values.ndim - 1)
+    decay = (1 - batch_alphas).reshape((len(batched),) + lead_ones)
+    decay = np.broadcast_to(decay, inputs.shape[:-1])
+    scale = batch_alphas.reshape((len(batched),) + lead_ones + (1,))
+
+    filtered = linear_filter(inputs * scale, decay, 0.0)
+
+    for row, i in enumerate(batched):
+        start = periods[i] - 1
+        result[i, ..., start:] = filtered[row, ..., start - first:]
+    return result
@@ -0,0 +1,347 @@
+"""
+Текстовый вывод результатов: буферизованный отчёт и живая доска.
+
+render_report() собирает весь отчёт plot_results в список строк и
+возвращает одну строку, которая выводится одной записью в stdout вместо
+сотен вызовов print(). Вывод совпадает с прежним построчно.
+
+LiveBoard — таблица по инструментам для наблюдения в реальном времени:
+первый кадр рисуется целиком, дальше перерисовываются только строки,
+текст которых изменился, с позиционированием курсора ANSI-кодами.
+Каждый кадр уходит в терминал одной записью.
+
+Зависит только от стандартной библиотеки.
+"""
+import random
+import sys
+import time
+from typing import Dict, List, Optional, TextIO
+
+DAYS_TO_SHOW = 30
+
+CSI = "\x1b["
+CLEAR_LINE = CSI + "K"
+HIDE_CURSOR = CSI + "?25l"
+SHOW_CURSOR = CSI + "?25h"
+
+
+def render_report(
+        close_prices: List[float],
+        momentum_values: List[Optional[float]],
+        bull_power: List[Optional[float]],
+        bear_power: List[Optional[float]],
+        rsi_values: Optional[List[Optional[float]]] = None,
+        macd_line: Optional[List[Optional[float]]] = None,
+        signal_line: Optional[List[Optional[float]]] = None,
+        histogram: Optional[List[Optional[float]]] = None,
+        value_format: str = ".2f",
+        power_unit: float = 100
+) -> str:
+    """
+    Текстовая визуализация результатов одной строкой
+
+    Args:
+        value_format: формат цен и значений индикаторов (".8f" для PEPE)
+        power_unit: значение Bull/Bear Power на один символ полосы силы
+    """
+    lines = []
+    out = lines.append
+    signed_format = "+" + value_format
+
+    out("\n" + "=" * 70)
+    out("ТЕКСТОВАЯ ВИЗУАЛИЗАЦИЯ РЕЗУЛЬТАТОВ")
+    out("=" * 70)
+
+    start_idx = max(0, len(close_prices) - DAYS_TO_SHOW)
+
+    out("\nСимвольный график цены (последние 30 дней):")
+    out("-" * 70)
+
+    display_prices = close_prices[start_idx:]
+    min_price = min(display_prices)
+    max_price = max(display_prices)
+    price_range = max_price - min_price
+
+    previous = None
+    for day_num, price in enumerate(display_prices, start_idx + 1):
+        normalized = int(((price - min_price) / price_range) * 50) if max_price > min_price else 25
+
+        if previous is None:
+            trend_marker = ""
+        elif price > previous:
+            trend_marker = "↗"
+        elif price < previous:
+            trend_marker = "↘"
+        else:
+            trend_marker = "→"
+        previous = price
+
+        out(f"День {day_num:3d}: {trend_marker} {price:{value_format}} {'█' * (normalized + 1)}")
+
+    if rsi_values:
+        out("\n" + "=" * 70)
+        out("Индикатор RSI (последние 30 дней):")
+        out("=" * 70)
+
+        for day_num, rsi in enumerate(rsi_values[start_idx:], start_idx + 1):
+            if rsi is None:
+                rsi_str = "N/A"
+                bar = ""
+            else:
+                rsi_str = f"{rsi:.2f}"
+
+                if rsi > 70:
+                    level = "Перекупленность"
+                elif rsi < 30:
+                    level = "Перепроданность"
+                else:
+                    level = "Нейтрально"
+
+                bar_length = min(20, int(abs(rsi - 50) / 2.5))
+                if rsi > 50:
+                    bar = "█" * bar_length + f" ↑ {level}"
+                else:
+                    bar = " " * (20 - bar_length) + "█" * bar_length + f" ↓ {level}"
+
+            out(f"День {day_num:3d}: RSI: {rsi_str:6s} {bar}")
+
+    if macd_line and signal_line and histogram:
+        out("\n" + "=" * 70)
+        out("Индикатор MACD (последние 30 дней):")
+        out("=" * 70)
+
+        macd_display = macd_line[start_idx:]
+        signal_display = signal_line[start_idx:]
+        hist_display = histogram[start_idx:]
+
+        for i in range(len(macd_display)):
+            day_num = start_idx + i + 1
+            macd_val = macd_display[i]
+            signal_val = signal_display[i]
+            hist_val = hist_display[i]
+
+            if macd_val is None or signal_val is None or hist_val is None:
+                out(f"День {day_num:3d}: MACD: N/A | Signal: N/A | Hist: N/A")
+                continue
+
+            signal = "Бычий" if hist_val > 0 else "Медвежий"
+
+            cross = ""
+            if i > 0 and macd_display[i - 1] is not None and signal_display[i - 1] is not None:
+                if macd_val > signal_val and macd_display[i - 1] <= signal_display[i - 1]:
+                    cross = "↑ Пересечение вверх"
+                elif macd_val < signal_val and macd_display[i - 1] >= signal_display[i - 1]:
+                    cross = "↓ Пересечение вниз"
+
+            out(f"День {day_num:3d}: MACD: {macd_val:{signed_format}} | Signal: {signal_val:{signed_format}} | "
+                f"Hist: {hist_val:{signed_format}} [{signal}] {cross}")
+
+    out("\n" + "=" * 70)
+    out("Символьные графии индикаторов (последние 30 дней):")
+    out("=" * 70)
+
+    out("\nMomentum:")
+    momentum_display = momentum_values[start_idx:]
+    momentum_clean = [0 if v is None else v for v in momentum_display]
+    mom_min = min(momentum_clean)
+    mom_max = max(momentum_clean)
+
+    for day_num, mom in enumerate(momentum_display, start_idx + 1):
+        if mom is None:
+            out(f"День {day_num:3d}:       N/A      {' ' * 25}N/A")
+            continue
+
+        normalized = int(((mom - mom_min) / (mom_max - mom_min)) * 25) if mom_max > mom_min else 12
+        bar = (" " * (12 - normalized // 2)) + "█" * normalized
+        bar += " [+]" if mom > 0 else " [-]"
+        out(f"День {day_num:3d}: {mom:{value_format}} {bar}")
+
+    out("\nBull/Bear Power:")
+    bear_display = bear_power[start_idx:]
+
+    for i, bull in enumerate(bull_power[start_idx:]):
+        bear = bear_display[i]
+        day_num = start_idx + i + 1
+
+        if bull is None or bear is None:
+            out(f"День {day_num:3d}: Bull: N/A | Bear: N/A")
+            continue
+
+        bull_strength = "█" * min(10, int(abs(bull) / power_unit)) if bull > 0 else ""
+        bear_strength = "█" * min(10, int(abs(bear) / power_unit)) if bear < 0 else ""
+
+        out(f"День {day_num:3d}: Bull: {bull:{signed_format}} {bull_strength:10s} | "
+            f"Bear: {bear:{signed_format}} {bear_strength:10s}")
+
+    lines.append("")
+    return "\n".join(lines)
+
+
+class LiveBoard:
+    """
+    Живая доска инструментов с перерисовкой только изменившихся строк
+
+    Строка инструмента задаётся через update(); render() выводит кадр:
+    в первый раз — заголовок и все строки, затем для каждой изменившейся
+    строки курсор поднимается к ней (CSI n A), строка переписывается и
+    очищается до конца (CSI K), и курсор возвращается под доску. Новые
+    инструменты дописываются снизу. Весь кадр — одна запись в stream.
+
+    Args:
+        stream: куда выводить (по умолчанию sys.stdout)
+        value_format: формат цен и значений индикаторов
+        min_interval: минимальный интервал между кадрами в секундах;
+            render() до его истечения ничего не выводит
+    """
+
+    HEADER = (f"{'Инструмент':<12} {'Цена':>14} {'Изм. %':>8} {'RSI':>6} {'MACD hist':>14} "
+              f"{'Momentum':>14} {'Режим':<16}")
+
+    def __init__(self, stream: Optional[TextIO] = None, value_format: str = ".2f", min_interval: float = 0.0):
+        self.stream = stream or sys.stdout
+        self.value_format = value_format
+        self.min_interval = min_interval
+
+        self.frames = 0
+        self.rows_redrawn = 0
+        self.bytes_written = 0
+
+        self._order: List[str] = []
+        self._text: Dict[str, str] = {}
+        self._shown: Dict[str, str] = {}
+        self._header_shown = False
+        self._last_frame = float("-inf")
+
+    def format_row(self, symbol: str, close: float, previous_close: Optional[float] = None,
+                   rsi: Optional[float] = None, macd_hist: Optional[float] = None,
+                   momentum: Optional[float] = None, bull: Optional[float] = None,
+                   bear: Optional[float] = None) -> str:
+        """Текст строки инструмента"""
+        fmt = self.value_format
+        change = f"{(close / previous_close - 1) * 100:+.2f}" if previous_close else "N/A"
+        rsi_str = f"{rsi:.1f}" if rsi is not None else "N/A"
+        hist_str = f"{macd_hist:+{fmt}}" if macd_hist is not None else "N/A"
+        mom_str = f"{momentum:+{fmt}}" if momentum is not None else "N/A"
+
+        if bull is None or bear is None:
+            regime = ""
+        elif bull > 0 and bear > 0:
+            regime = "Сильный бычий"
+        elif bull < 0 and bear < 0:
+            regime = "Сильный медвежий"
+        elif bull > 0 > bear:
+            regime = "Борьба"
+        else:
+            regime = ""
+
+        return (f"{symbol:<12} {close:>14{fmt}} {change:>8} {rsi_str:>6} {hist_str:>14} "
+                f"{mom_str:>14} {regime:<16}")
+
+    def update(self, symbol: str, close: float, **values):
+        """
+        Новые значения инструмента (аргументы format_row); вывод — в render()
+        """
+        if symbol not in self._text:
+            self._order.append(symbol)
+        self._text[symbol] = self.format_row(symbol, close, **values)
+
+    def set_row(self, symbol: str, text: str):
+        """Строка инструмента готовым текстом"""
+        if symbol not in self._text:
+            self._order.append(symbol)
+        self._text[symbol] = text
+
+    def frame(self) -> str:
+        """
+        Кадр с изменениями с прошлого вывода (пустая строка — изменений нет)
+        """
+        parts = []
+        if not self._header_shown:
+            parts.append(self.HEADER + "\n" + "-" * len(self.HEADER) + "\n")
+            self._header_shown = True
+
+        shown_rows = len(self._shown)
+        for position, symbol in enumerate(self._order[:shown_rows]):
+            text = self._text[symbol]
+            if self._shown[symbol] != text:
+                up = shown_rows - position
+                parts.append(f"{CSI}{up}A\r{text}{CLEAR_LINE}{CSI}{up}B\r")
+                self._shown[symbol] = text
+                self.rows_redrawn += 1
+
+        for symbol in self._order[shown_rows:]:
+            text = self._text[symbol]
+            parts.append(text + "\n")
+            self._shown[symbol] = text
+            self.rows_redrawn += 1
+
+        return "".join(parts)
+
+    def render(self, force: bool = False) -> bool:
+        """
+        Вывод кадра одной записью
+
+        Returns:
+            True, если что-то было выведено
+        """
+        now = time.perf_counter()
+        if not force and now - self._last_frame < self.min_interval:
+            return False
+
+        frame = self.frame()
+        if not frame:
+            return False
+
+        self.stream.write(frame)
+        self.stream.flush()
+        self._last_frame = now
+        self.frames += 1
+        self.bytes_written += len(frame)
+        return True
+
+
+def demo(n_symbols: int = 50, bars: int = 300, fps: float = 10.0, bars_per_frame: int = 1):
+    """
+    Живая доска по n_symbols случайным блужданиям со streaming-индикаторами
+    """
+    from streaming import StreamingBullBearPower, StreamingMACD, StreamingMomentum, StreamingRSI
+
+    board = LiveBoard()
+    symbols = [f"SYM{i:03d}" for i in range(n_symbols)]
+    prices = {symbol: 100.0 for symbol in symbols}
+    indicators = {
+        symbol: (StreamingRSI(), StreamingMACD(), StreamingMomentum(), StreamingBullBearPower())
+        for symbol in symbols
+    }
+
+    board.stream.write(HIDE_CURSOR)
+    try:
+        for _ in range(0, bars, bars_per_frame):
+            started = time.perf_counter()
+
+            for symbol in symbols:
+                rsi, macd, momentum, bbp = indicators[symbol]
+                for _ in range(bars_per_frame):
+                    previous = prices[symbol]
+                    close = previous * (1 + random.gauss(0, 0.01))
+                    prices[symbol] = close
+                    high = close * (1 + random.uniform(0, 0.01))
+                    low = close * (1 - random.uniform(0, 0.01))
+
+                    bull, bear = bbp.update(high, low, close)
+                    board.update(symbol, close, previous_close=previous, rsi=rsi.update(close),
+                                 macd_hist=macd.update(close)[2], momentum=momentum.update(close),
+                                 bull=bull, bear=bear)
+
+            board.render(force=True)
+            time.sleep(max(0.0, 1 / fps - (time.perf_counter() - started)))
+    finally:
+        board.stream.write(SHOW_CURSOR)
+        board.stream.flush()
+
+    print(f"\nКадров: {board.frames}, строк перерисовано: {board.rows_redrawn}, "
+          f"байт выведено: {board.bytes_written}")
+
+
+if __name__ == "__main__":
+    demo()
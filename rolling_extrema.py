@@ -0,0 +1,256 @@
+"""
+Скользящие максимум и минимум и индикаторы на их основе.
+
+Экстремум окна ведётся монотонной очередью: в deque хранятся только те
+бары окна, которые ещё могут стать максимумом (значения по убыванию).
+Новый бар выталкивает с конца все значения не больше себя, а с начала
+уходит бар, выпавший из окна. Каждый бар попадает в очередь и покидает
+её один раз, поэтому работа — амортизированно O(1) на бар при любой
+длине окна.
+
+На этом ядре построены Stochastic %K/%D, Williams %R и каналы Дончиана
+по тем же рядам high/low/close, что и calculate_bull_bear_power.
+Пакетные функции работают со списками (None в зоне прогрева, как в
+algotradesim.py), потоковые классы — по одному бару за update(), как в
+streaming.py. Версии для матриц (symbols, bars) — в indicators_np.
+
+Если максимум и минимум окна совпадают (цена не менялась), %K равен 50,
+а %R равен -50.
+"""
+import math
+import operator
+from collections import deque
+from typing import Callable, Deque, List, Optional, Sequence, Tuple
+
+# Очередь окна: пары (номер бара, значение)
+Window = Deque[Tuple[int, float]]
+
+
+def _push(window: Window, index: int, value: float, period: int,
+          dominates: Callable[[float, float], bool]) -> float:
+    """
+    Шаг монотонной очереди: добавление бара index и экстремум окна
+
+    dominates(new, old) — новое значение вытесняет старое (operator.ge
+    для максимума, operator.le для минимума).
+    """
+    while window and dominates(value, window[-1][1]):
+        window.pop()
+    window.append((index, value))
+    if window[0][0] <= index - period:
+        window.popleft()
+    return window[0][1]
+
+
+def _rolling_extreme(values: Sequence[float], period: int,
+                     dominates: Callable[[float, float], bool]) -> List[Optional[float]]:
+    n = len(values)
+    if n < period:
+        return [None] * n
+
+    window: Window = deque()
+    result = [_push(window, i, value, period, dominates) for i, value in enumerate(values)]
+    result[:period - 1] = [None] * (period - 1)
+    return result
+
+
+def rolling_max(values: Sequence[float], period: int) -> List[Optional[float]]:
+    """
+    Скользящий максимум за period баров
+
+    Args:
+        values: список значений
+        period: длина окна
+
+    Returns:
+        Список максимумов, None на первых period - 1 позициях
+    """
+    return _rolling_extreme(values, period, operator.ge)
+
+
+def rolling_min(values: Sequence[float], period: int) -> List[Optional[float]]:
+    """
+    Скользящий минимум за period баров (см. rolling_max)
+    """
+    return _rolling_extreme(values, period, operator.le)
+
+
+def _mean(values: Sequence[float]) -> float:
+    """Среднее окна %K для %D (одинаково в пакетной и потоковой версиях)"""
+    return math.fsum(values) / len(values)
+
+
+def _stochastic_k(close: float, highest: float, lowest: float) -> float:
+    if highest == lowest:
+        return 50.0
+    return 100 * (close - lowest) / (highest - lowest)
+
+
+def _williams_r(close: float, highest: float, lowest: float) -> float:
+    if highest == lowest:
+        return -50.0
+    return -100 * (highest - close) / (highest - lowest)
+
+
+def calculate_stochastic(
+        high_prices: List[float],
+        low_prices: List[float],
+        close_prices: List[float],
+        k_period: int = 14,
+        d_period: int = 3
+) -> Tuple[List[Optional[float]], List[Optional[float]]]:
+    """
+    Вычисление стохастического осциллятора
+
+    %K = 100 * (close - min(low)) / (max(high) - min(low)) за k_period баров,
+    %D — SMA от %K за d_period баров.
+
+    Returns:
+        Кортеж: (%K, %D)
+    """
+    highest = rolling_max(high_prices, k_period)
+    lowest = rolling_min(low_prices, k_period)
+
+    k_values = [None if h is None else _stochastic_k(c, h, l)
+                for c, h, l in zip(close_prices, highest, lowest)]
+
+    d_values = [None] * len(k_values)
+    for i in range(k_period + d_period - 2, len(k_values)):
+        d_values[i] = _mean(k_values[i - d_period + 1:i + 1])
+
+    return k_values, d_values
+
+
+def calculate_williams_r(
+        high_prices: List[float],
+        low_prices: List[float],
+        close_prices: List[float],
+        period: int = 14
+) -> List[Optional[float]]:
+    """
+    Вычисление индикатора Williams %R
+
+    %R = -100 * (max(high) - close) / (max(high) - min(low)) за period баров,
+    значения от -100 до 0.
+    """
+    highest = rolling_max(high_prices, period)
+    lowest = rolling_min(low_prices, period)
+
+    return [None if h is None else _williams_r(c, h, l)
+            for c, h, l in zip(close_prices, highest, lowest)]
+
+
+def calculate_donchian(
+        high_prices: List[float],
+        low_prices: List[float],
+        period: int = 20
+) -> Tuple[List[Optional[float]], List[Optional[float]], List[Optional[float]]]:
+    """
+    Вычисление канала Дончиана
+
+    Returns:
+        Кортеж: (верхняя граница max(high), средняя линия, нижняя граница min(low))
+    """
+    upper = rolling_max(high_prices, period)
+    lower = rolling_min(low_prices, period)
+    middle = [None if h is None else (h + l) / 2 for h, l in zip(upper, lower)]
+
+    return upper, middle, lower
+
+
+class RollingExtrema:
+    """
+    Потоковые скользящие максимум high и минимум low за period баров
+    """
+    __slots__ = ("period", "count", "highest", "lowest", "_max", "_min")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self.highest: Optional[float] = None
+        self.lowest: Optional[float] = None
+        self._max: Window = deque()
+        self._min: Window = deque()
+
+    def update(self, high: float, low: Optional[float] = None) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Добавление бара (без low экстремумы считаются по одному ряду high)
+
+        Returns:
+            Кортеж: (максимум, минимум) окна, None во время прогрева
+        """
+        low = high if low is None else low
+        index = self.count
+        self.count += 1
+
+        highest = _push(self._max, index, high, self.period, operator.ge)
+        lowest = _push(self._min, index, low, self.period, operator.le)
+        if self.count >= self.period:
+            self.highest, self.lowest = highest, lowest
+
+        return self.highest, self.lowest
+
+
+class StreamingStochastic:
+    """
+    Потоковый стохастический осциллятор (%K, %D)
+    """
+
+    def __init__(self, k_period: int = 14, d_period: int = 3):
+        self.extrema = RollingExtrema(k_period)
+        self.d_period = d_period
+        self.k: Optional[float] = None
+        self.d: Optional[float] = None
+        self._k_window: Deque[float] = deque(maxlen=d_period)
+
+    def update(self, high: float, low: float, close: float) -> Tuple[Optional[float], Optional[float]]:
+        highest, lowest = self.extrema.update(high, low)
+        if highest is None:
+            return None, None
+
+        self.k = _stochastic_k(close, highest, lowest)
+        self._k_window.append(self.k)
+        if len(self._k_window) == self.d_period:
+            self.d = _mean(self._k_window)
+
+        return self.k, self.d
+
+    @property
+    def value(self) -> Tuple[Optional[float], Optional[float]]:
+        return self.k, self.d
+
+
+class StreamingWilliamsR:
+    """
+    Потоковый индикатор Williams %R
+    """
+
+    def __init__(self, period: int = 14):
+        self.extrema = RollingExtrema(period)
+        self.value: Optional[float] = None
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        highest, lowest = self.extrema.update(high, low)
+        if highest is not None:
+            self.value = _williams_r(close, highest, lowest)
+        return self.value
+
+
+class StreamingDonchian:
+    """
+    Потоковый канал Дончиана (верхняя граница, средняя линия, нижняя граница)
+    """
+
+    def __init__(self, period: int = 20):
+        self.extrema = RollingExtrema(period)
+
+    def update(self, high: float, low: float) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        self.extrema.update(high, low)
+        return self.value
+
+    @property
+    def value(self) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        upper, lower = self.extrema.highest, self.extrema.lowest
+        if upper is None:
+            return None, None, None
+        return upper, (upper + lower) / 2, lower
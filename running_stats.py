@@ -0,0 +1,292 @@
+"""
+Однопроходная статистика по ряду значений.
+
+RunningStats за один проход накапливает число значений, среднее и
+дисперсию (алгоритм Уэлфорда), минимум, максимум, число положительных и
+отрицательных значений и число значений выше/ниже заданных порогов.
+None (зона прогрева) пропускается. Накопители объединяются через merge()
+(формула Чана для дисперсии), поэтому статистику можно считать порциями
+или в разных процессах и сложить в конце.
+
+RollingVariance — среднее и дисперсия скользящего окна за O(1) на бар.
+На нём построены пакетные функции волатильности algotradesim.py и
+потоковые классы streaming.py.
+
+Зависит только от стандартной библиотеки; from_array() использует NumPy,
+если он установлен.
+"""
+import math
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Sequence
+
+
+class RunningStats:
+    """
+    Накопитель статистики
+
+    Args:
+        above: пороги, для которых считается число значений > порога
+        below: пороги, для которых считается число значений < порога
+
+    Пример:
+        rsi_stats = RunningStats(above=(70,), below=(30,)).update(rsi_values)
+        rsi_stats.mean, rsi_stats.count_above(70)
+    """
+    __slots__ = ("count", "mean", "m2", "min", "max", "positive", "negative", "above", "below")
+
+    def __init__(self, above: Sequence[float] = (), below: Sequence[float] = ()):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.positive = 0
+        self.negative = 0
+        self.above: Dict[float, int] = {threshold: 0 for threshold in above}
+        self.below: Dict[float, int] = {threshold: 0 for threshold in below}
+
+    def add(self, value: Optional[float]):
+        """Добавление одного значения (None пропускается)"""
+        if value is None:
+            return
+
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value > 0:
+            self.positive += 1
+        elif value < 0:
+            self.negative += 1
+
+        for threshold in self.above:
+            if value > threshold:
+                self.above[threshold] += 1
+        for threshold in self.below:
+            if value < threshold:
+                self.below[threshold] += 1
+
+    def update(self, values: Iterable[Optional[float]]) -> "RunningStats":
+        """
+        Добавление значений за один проход (None пропускается)
+
+        Returns:
+            self, чтобы можно было писать RunningStats().update(values)
+        """
+        count, mean, m2 = self.count, self.mean, self.m2
+        minimum, maximum = self.min, self.max
+        positive = negative = 0
+        above = list(self.above)
+        below = list(self.below)
+        above_counts = [0] * len(above)
+        below_counts = [0] * len(below)
+
+        for value in values:
+            if value is None:
+                continue
+
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+
+            if value < minimum:
+                minimum = value
+            if value > maximum:
+                maximum = value
+            if value > 0:
+                positive += 1
+            elif value < 0:
+                negative += 1
+
+            for i, threshold in enumerate(above):
+                if value > threshold:
+                    above_counts[i] += 1
+            for i, threshold in enumerate(below):
+                if value < threshold:
+                    below_counts[i] += 1
+
+        self.count, self.mean, self.m2 = count, mean, m2
+        self.min, self.max = minimum, maximum
+        self.positive += positive
+        self.negative += negative
+        for threshold, counted in zip(above, above_counts):
+            self.above[threshold] += counted
+        for threshold, counted in zip(below, below_counts):
+            self.below[threshold] += counted
+        return self
+
+    @classmethod
+    def from_array(cls, values, above: Sequence[float] = (), below: Sequence[float] = ()) -> "RunningStats":
+        """
+        Статистика массива NumPy (NaN пропускаются) векторными операциями
+        """
+        import numpy as np
+
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+
+        stats = cls(above, below)
+        stats.count = len(values)
+        if not stats.count:
+            return stats
+
+        stats.mean = float(values.mean())
+        stats.m2 = float(np.square(values - stats.mean).sum())
+        stats.min = float(values.min())
+        stats.max = float(values.max())
+        stats.positive = int(np.count_nonzero(values > 0))
+        stats.negative = int(np.count_nonzero(values < 0))
+        for threshold in stats.above:
+            stats.above[threshold] = int(np.count_nonzero(values > threshold))
+        for threshold in stats.below:
+            stats.below[threshold] = int(np.count_nonzero(values < threshold))
+        return stats
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """
+        Объединение с накопителем по другой части данных (на месте)
+
+        Пороги обоих накопителей должны совпадать.
+        """
+        if self.above.keys() != other.above.keys() or self.below.keys() != other.below.keys():
+            raise ValueError("Нельзя объединить накопители с разными порогами")
+        if not other.count:
+            return self
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.positive += other.positive
+        self.negative += other.negative
+        for threshold, counted in other.above.items():
+            self.above[threshold] += counted
+        for threshold, counted in other.below.items():
+            self.below[threshold] += counted
+        return self
+
+    def __add__(self, other: "RunningStats") -> "RunningStats":
+        result = self.copy()
+        return result.merge(other)
+
+    def copy(self) -> "RunningStats":
+        result = RunningStats(self.above, self.below)
+        result.merge(self)
+        return result
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    @property
+    def variance(self) -> float:
+        """Выборочная дисперсия (n - 1); nan, если значений меньше двух"""
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def count_above(self, threshold: float) -> int:
+        return self.above[threshold]
+
+    def count_below(self, threshold: float) -> int:
+        return self.below[threshold]
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean if self.count else math.nan,
+            "std": self.std,
+            "min": self.min if self.count else math.nan,
+            "max": self.max if self.count else math.nan,
+            "positive": self.positive,
+            "negative": self.negative,
+            "above": dict(self.above),
+            "below": dict(self.below),
+        }
+
+    def __repr__(self) -> str:
+        return (f"RunningStats(count={self.count}, mean={self.mean:g}, std={self.std:g}, "
+                f"min={self.min:g}, max={self.max:g})")
+
+
+class RollingVariance:
+    """
+    Среднее и дисперсия последних period значений
+
+    Окно обновляется формулами Уэлфорда для замены значения:
+
+        mean' = mean + (new - old) / n
+        m2'   = m2 + (new - old) * (new - mean' + old - mean)
+
+    Разности берутся относительно среднего, поэтому на ценах порядка
+    BTC нет потери точности, как у формулы sum(x^2) / n - mean^2. Чтобы
+    ошибка округления не накапливалась на длинных рядах (после всплеска
+    волатильности она осталась бы в m2), раз в period обновлений среднее
+    и m2 пересчитываются по окну точно — это O(1) на бар в среднем.
+
+    Args:
+        period: длина окна
+    """
+    __slots__ = ("period", "mean", "m2", "_window", "_since_resync")
+
+    def __init__(self, period: int):
+        if period < 1:
+            raise ValueError("period должен быть не меньше 1")
+        self.period = period
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._window: Deque[float] = deque()
+        self._since_resync = 0
+
+    def update(self, value: float):
+        """Добавление значения; самое старое значение выпадает из полного окна"""
+        window = self._window
+
+        if len(window) < self.period:
+            window.append(value)
+            delta = value - self.mean
+            self.mean += delta / len(window)
+            self.m2 += delta * (value - self.mean)
+            return
+
+        old = window.popleft()
+        window.append(value)
+
+        self._since_resync += 1
+        if self._since_resync >= self.period:
+            self._since_resync = 0
+            self.mean = math.fsum(window) / self.period
+            self.m2 = math.fsum([(x - self.mean) ** 2 for x in window])
+            return
+
+        delta = value - old
+        mean = self.mean + delta / self.period
+        self.m2 += delta * (value - mean + old - self.mean)
+        self.mean = mean
+
+    @property
+    def ready(self) -> bool:
+        """Окно заполнено"""
+        return len(self._window) == self.period
+
+    @property
+    def variance(self) -> float:
+        """Дисперсия окна (делитель — число значений в окне)"""
+        if not self._window:
+            return math.nan
+        return max(self.m2, 0.0) / len(self._window)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
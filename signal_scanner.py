@@ -0,0 +1,265 @@
+"""
+Векторизованный поиск сигналов: пересечения, выходы за пороги и смена режима.
+
+Все проверки — операции над массивами без цикла по барам. На вход
+подаётся один ряд (bars,) или матрица (symbols, bars), на выходе —
+компактный массив событий EVENT_DTYPE (symbol, index, kind, value),
+упорядоченный по инструменту и бару. NaN в зоне прогрева не порождают
+событий: любое сравнение с NaN ложно.
+"""
+from enum import IntEnum
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+EVENT_DTYPE = np.dtype([
+    ("symbol", np.int32),
+    ("index", np.int64),
+    ("kind", np.int8),
+    ("value", np.float64),
+])
+
+NO_REGIME = -128
+
+
+class EventKind(IntEnum):
+    CROSS_UP = 1
+    CROSS_DOWN = 2
+    ENTER_ABOVE = 3
+    EXIT_ABOVE = 4
+    ENTER_BELOW = 5
+    EXIT_BELOW = 6
+    REGIME_CHANGE = 7
+
+
+class Regime(IntEnum):
+    STRONG_BEAR = -1
+    STRUGGLE = 0
+    STRONG_BULL = 1
+
+
+def cross_above(values: np.ndarray, level) -> np.ndarray:
+    """
+    Маска баров, где values переходит из <= level в > level
+
+    level — число или ряд той же формы (пересечение двух линий).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    level = np.broadcast_to(np.asarray(level, dtype=np.float64), values.shape)
+
+    mask = np.zeros(values.shape, dtype=bool)
+    mask[..., 1:] = (values[..., 1:] > level[..., 1:]) & (values[..., :-1] <= level[..., :-1])
+    return mask
+
+
+def cross_below(values: np.ndarray, level) -> np.ndarray:
+    """
+    Маска баров, где values переходит из >= level в < level
+    """
+    values = np.asarray(values, dtype=np.float64)
+    level = np.broadcast_to(np.asarray(level, dtype=np.float64), values.shape)
+
+    mask = np.zeros(values.shape, dtype=bool)
+    mask[..., 1:] = (values[..., 1:] < level[..., 1:]) & (values[..., :-1] >= level[..., :-1])
+    return mask
+
+
+def classify_regime(bull_power: np.ndarray, bear_power: np.ndarray) -> np.ndarray:
+    """
+    Режим Bull Bear Power на каждом баре (как в main())
+
+    Оба > 0 — сильный бычий, оба < 0 — сильный медвежий,
+    bull > 0 > bear — борьба, иначе NO_REGIME.
+    """
+    bull_power = np.asarray(bull_power, dtype=np.float64)
+    bear_power = np.asarray(bear_power, dtype=np.float64)
+
+    regime = np.full(bull_power.shape, NO_REGIME, dtype=np.int8)
+    regime[(bull_power > 0) & (bear_power > 0)] = Regime.STRONG_BULL
+    regime[(bull_power < 0) & (bear_power < 0)] = Regime.STRONG_BEAR
+    regime[(bull_power > 0) & (bear_power < 0)] = Regime.STRUGGLE
+    return regime
+
+
+def _changed(state: np.ndarray, valid: np.ndarray, to: bool) -> np.ndarray:
+    mask = np.zeros(state.shape, dtype=bool)
+    both_valid = valid[..., 1:] & valid[..., :-1]
+    mask[..., 1:] = both_valid & (state[..., 1:] == to) & (state[..., :-1] != to)
+    return mask
+
+
+def make_events(masks: Dict[EventKind, np.ndarray], values: np.ndarray) -> np.ndarray:
+    """
+    Сборка массива событий из масок по видам событий
+
+    Args:
+        masks: вид события -> булева маска формы (bars,) или (symbols, bars)
+        values: значения, записываемые в поле value
+
+    Returns:
+        Массив EVENT_DTYPE, отсортированный по (symbol, index)
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    parts = []
+
+    for kind, mask in masks.items():
+        rows, index = np.nonzero(np.atleast_2d(mask))
+        part = np.empty(len(rows), dtype=EVENT_DTYPE)
+        part["symbol"] = rows
+        part["index"] = index
+        part["kind"] = kind
+        part["value"] = values[rows, index]
+        parts.append(part)
+
+    if not parts:
+        return np.empty(0, dtype=EVENT_DTYPE)
+
+    events = np.concatenate(parts)
+    return events[np.lexsort((events["kind"], events["index"], events["symbol"]))]
+
+
+# Направление сигнала (+1 BUY, -1 SELL) по виду события для правил из main()
+RULE_DIRECTIONS = {
+    "momentum": {EventKind.CROSS_UP: 1, EventKind.CROSS_DOWN: -1},
+    "rsi": {EventKind.ENTER_BELOW: 1, EventKind.ENTER_ABOVE: -1},
+    "macd": {EventKind.CROSS_UP: 1, EventKind.CROSS_DOWN: -1},
+}
+
+
+def event_directions(events: np.ndarray, rule: str) -> np.ndarray:
+    """
+    Направление каждого события правила rule: +1 BUY, -1 SELL, 0 — не сигнал
+
+    Для правила "bbp" направлением служит новый режим: сильный бычий — BUY,
+    сильный медвежий — SELL, борьба — 0.
+    """
+    if rule == "bbp":
+        return np.where(events["value"] == Regime.STRUGGLE, 0, events["value"]).astype(np.int8)
+
+    directions = np.zeros(len(events), dtype=np.int8)
+    for kind, sign in RULE_DIRECTIONS[rule].items():
+        directions[events["kind"] == kind] = sign
+    return directions
+
+
+def signal_array(events: np.ndarray, shape: Tuple[int, ...], rule: str) -> np.ndarray:
+    """
+    Плотный массив направлений формы shape ((bars,) или (symbols, bars))
+
+    На одном баре может быть несколько событий (RSI за один бар переходит
+    из зоны ниже 30 в зону выше 70: EXIT_BELOW и ENTER_ABOVE). Направления
+    событий бара складываются, и сигналом бара служит знак суммы, поэтому
+    события без направления не затирают сигнал.
+
+    >>> events = SignalScanner().thresholds(np.array([50, 20, 80, 50, 80, 20, 50.]), 30, 70)
+    >>> signal_array(events, (7,), "rsi").tolist()
+    [0, 1, -1, 0, -1, 1, 0]
+    """
+    directions = event_directions(events, rule)
+    total = np.zeros(shape, dtype=np.int16)
+
+    if len(shape) == 1:
+        np.add.at(total, events["index"], directions)
+    else:
+        np.add.at(total, (events["symbol"], events["index"]), directions)
+    return np.sign(total).astype(np.int8)
+
+
+class SignalScanner:
+    """
+    Поиск сигналов по рядам индикаторов
+
+    Пример (сигналы из main()):
+        scanner = SignalScanner()
+        momentum_events = scanner.crossovers(momentum_values)
+        rsi_events = scanner.thresholds(rsi_values, 30, 70)
+        macd_events = scanner.crossovers(histogram)
+        bbp_events = scanner.regime_changes(bull_power, bear_power)
+
+    Условия пересечений те же, что в циклах main(), но сканер проверяет и
+    последний бар, а циклы main() идут до range(..., days - 1) и сигнал
+    на последнем баре не выдают. Чтобы сравнить с main(), события
+    последнего бара нужно отбросить:
+        events = events[events["index"] < days - 1]
+    """
+
+    def crossovers(self, values: np.ndarray, level=0.0) -> np.ndarray:
+        """
+        Пересечения values с уровнем или другой линией: CROSS_UP / CROSS_DOWN
+        """
+        return make_events({
+            EventKind.CROSS_UP: cross_above(values, level),
+            EventKind.CROSS_DOWN: cross_below(values, level),
+        }, values)
+
+    def thresholds(self, values: np.ndarray, lower: float, upper: float) -> np.ndarray:
+        """
+        Входы в зоны за порогами и выходы из них
+
+        ENTER_BELOW — values опускается ниже lower, EXIT_BELOW — возвращается,
+        ENTER_ABOVE — поднимается выше upper, EXIT_ABOVE — возвращается.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        below = values < lower
+        above = values > upper
+        valid = ~np.isnan(values)
+
+        return make_events({
+            EventKind.ENTER_BELOW: cross_below(values, lower),
+            EventKind.EXIT_BELOW: _changed(below, valid, to=False),
+            EventKind.ENTER_ABOVE: cross_above(values, upper),
+            EventKind.EXIT_ABOVE: _changed(above, valid, to=False),
+        }, values)
+
+    def regime_changes(self, bull_power: np.ndarray, bear_power: np.ndarray) -> np.ndarray:
+        """
+        Смена режима Bull Bear Power: value содержит код нового Regime
+
+        Режим сравнивается с последним определённым режимом, поэтому бары
+        NO_REGIME между двумя барами одного режима смены не дают (BULL,
+        NO_REGIME, BULL — одно событие). Первый бар с определённым режимом
+        тоже считается сменой.
+        """
+        regime = classify_regime(bull_power, bear_power)
+        defined = regime != NO_REGIME
+
+        # Номер последнего бара с определённым режимом до текущего включительно
+        last = np.where(defined, np.arange(regime.shape[-1]), -1)
+        np.maximum.accumulate(last, axis=-1, out=last)
+
+        previous = np.full(regime.shape, NO_REGIME, dtype=np.int8)
+        before = last[..., :-1]
+        previous[..., 1:] = np.where(before >= 0, np.take_along_axis(regime, np.maximum(before, 0), axis=-1),
+                                     NO_REGIME)
+        changed = defined & (regime != previous)
+
+        return make_events({EventKind.REGIME_CHANGE: changed}, regime.astype(np.float64))
+
+    def scan(self, indicators: Dict[str, np.ndarray], rsi_levels: Tuple[float, float] = (30, 70)) -> Dict[str, np.ndarray]:
+        """
+        Все сигналы из main() для словаря индикаторов
+
+        Ожидаемые ключи (любые могут отсутствовать): momentum, rsi,
+        macd_hist, bull_power + bear_power — как в UniverseResult.columns.
+        """
+        events = {}
+
+        if "momentum" in indicators:
+            events["momentum"] = self.crossovers(indicators["momentum"])
+        if "rsi" in indicators:
+            events["rsi"] = self.thresholds(indicators["rsi"], *rsi_levels)
+        if "macd_hist" in indicators:
+            events["macd"] = self.crossovers(indicators["macd_hist"])
+        if "bull_power" in indicators and "bear_power" in indicators:
+            events["bbp"] = self.regime_changes(indicators["bull_power"], indicators["bear_power"])
+
+        return events
+
+    def fresh(self, events: np.ndarray, bars: int, lookback: int = 1, kind: Optional[EventKind] = None) -> np.ndarray:
+        """
+        События за последние lookback баров из bars (свежие сигналы)
+        """
+        mask = events["index"] >= bars - lookback
+        if kind is not None:
+            mask &= events["kind"] == kind
+        return events[mask]
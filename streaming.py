@@ -0,0 +1,266 @@
+"""
+Потоковые (инкрементальные) версии индикаторов.
+
+Каждый объект принимает по одному бару через update() за O(1) и хранит
+только состояние рекурсии, поэтому память не растёт с длиной истории.
+Значения совпадают с пакетными функциями algotradesim.py бар в бар:
+пока индикатор прогревается, update() возвращает None.
+
+preview() возвращает значение, которое дал бы update() с той же ценой,
+не меняя состояния, — например, для ещё не закрытого бара.
+"""
+from collections import deque
+from typing import Optional, Tuple
+
+from algotradesim import ema_step, rsi_value, true_range, wilder_step
+from running_stats import RollingVariance
+
+
+class StreamingEMA:
+    """
+    Потоковая экспоненциальная скользящая средняя (EMA)
+
+    Первое значение — SMA первых period цен, как в calculate_ema.
+    """
+
+    def __init__(self, period: int = 13):
+        self.period = period
+        self.multiplier = 2 / (period + 1)
+        self.count = 0
+        self.value: Optional[float] = None
+        self._seed_sum = 0
+
+    def update(self, price: float) -> Optional[float]:
+        self.count += 1
+
+        if self.value is not None:
+            self.value = ema_step(self.value, price, self.multiplier)
+        else:
+            self._seed_sum += price
+            if self.count == self.period:
+                self.value = self._seed_sum / self.period
+
+        return self.value
+
+    def preview(self, price: float) -> Optional[float]:
+        if self.value is not None:
+            return ema_step(self.value, price, self.multiplier)
+        if self.count + 1 == self.period:
+            return (self._seed_sum + price) / self.period
+        return None
+
+
+class StreamingRSI:
+    """
+    Потоковый индикатор RSI со сглаживанием Уайлдера
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self.value: Optional[float] = None
+        self.avg_gain: Optional[float] = None
+        self.avg_loss: Optional[float] = None
+        self._prev_close: Optional[float] = None
+        self._gain_sum = 0
+        self._loss_sum = 0
+
+    def update(self, close: float) -> Optional[float]:
+        prev_close = self._prev_close
+        self._prev_close = close
+        self.count += 1
+
+        if prev_close is None:
+            return None
+
+        change = close - prev_close
+        gain = max(change, 0)
+        loss = abs(min(change, 0))
+
+        if self.avg_gain is None:
+            self._gain_sum += gain
+            self._loss_sum += loss
+            if self.count - 1 < self.period:
+                return None
+            self.avg_gain = self._gain_sum / self.period
+            self.avg_loss = self._loss_sum / self.period
+        else:
+            self.avg_gain = wilder_step(self.avg_gain, gain, self.period)
+            self.avg_loss = wilder_step(self.avg_loss, loss, self.period)
+
+        self.value = rsi_value(self.avg_gain, self.avg_loss)
+        return self.value
+
+    def preview(self, close: float) -> Optional[float]:
+        if self._prev_close is None:
+            return None
+
+        change = close - self._prev_close
+        gain = max(change, 0)
+        loss = abs(min(change, 0))
+
+        if self.avg_gain is None:
+            if self.count < self.period:
+                return None
+            return rsi_value((self._gain_sum + gain) / self.period, (self._loss_sum + loss) / self.period)
+
+        return rsi_value(wilder_step(self.avg_gain, gain, self.period),
+                         wilder_step(self.avg_loss, loss, self.period))
+
+
+class StreamingMACD:
+    """
+    Потоковый индикатор MACD с сигнальной линией и гистограммой
+    """
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.ema_fast = StreamingEMA(fast)
+        self.ema_slow = StreamingEMA(slow)
+        self.ema_signal = StreamingEMA(signal)
+        self.macd: Optional[float] = None
+        self.signal: Optional[float] = None
+        self.histogram: Optional[float] = None
+
+    def update(self, close: float) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        fast = self.ema_fast.update(close)
+        slow = self.ema_slow.update(close)
+
+        if fast is None or slow is None:
+            return None, None, None
+
+        self.macd = fast - slow
+        self.signal = self.ema_signal.update(self.macd)
+        if self.signal is not None:
+            self.histogram = self.macd - self.signal
+
+        return self.macd, self.signal, self.histogram
+
+    def preview(self, close: float) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        fast = self.ema_fast.preview(close)
+        slow = self.ema_slow.preview(close)
+
+        if fast is None or slow is None:
+            return None, None, None
+
+        macd = fast - slow
+        signal = self.ema_signal.preview(macd)
+        histogram = macd - signal if signal is not None else self.histogram
+        return macd, signal, histogram
+
+    @property
+    def value(self) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        return self.macd, self.signal, self.histogram
+
+
+class StreamingMomentum:
+    """
+    Потоковый индикатор Momentum: хранит только последние period + 1 цен
+    """
+
+    def __init__(self, period: int = 10):
+        self.period = period
+        self.value: Optional[float] = None
+        self._window = deque(maxlen=period + 1)
+
+    def update(self, price: float) -> Optional[float]:
+        self._window.append(price)
+
+        if len(self._window) > self.period:
+            self.value = price - self._window[0]
+
+        return self.value
+
+
+class StreamingBullBearPower:
+    """
+    Потоковый индикатор Bull Bear Power
+    """
+
+    def __init__(self, period: int = 13):
+        self.ema = StreamingEMA(period)
+        self.bull_power: Optional[float] = None
+        self.bear_power: Optional[float] = None
+
+    def update(self, high: float, low: float, close: float) -> Tuple[Optional[float], Optional[float]]:
+        ema_close = self.ema.update(close)
+
+        if ema_close is not None:
+            self.bull_power = high - ema_close
+            self.bear_power = low - ema_close
+
+        return self.bull_power, self.bear_power
+
+    @property
+    def value(self) -> Tuple[Optional[float], Optional[float]]:
+        return self.bull_power, self.bear_power
+
+
+class StreamingStdDev:
+    """
+    Потоковое скользящее стандартное отклонение (ядро — RollingVariance)
+    """
+
+    def __init__(self, period: int = 20):
+        self.window = RollingVariance(period)
+        self.value: Optional[float] = None
+
+    def update(self, price: float) -> Optional[float]:
+        self.window.update(price)
+        if self.window.ready:
+            self.value = self.window.std
+        return self.value
+
+
+class StreamingBollingerBands:
+    """
+    Потоковые полосы Боллинджера (средняя линия, верхняя и нижняя полосы)
+    """
+
+    def __init__(self, period: int = 20, num_std: float = 2.0):
+        self.window = RollingVariance(period)
+        self.num_std = num_std
+        self.middle: Optional[float] = None
+        self.upper: Optional[float] = None
+        self.lower: Optional[float] = None
+
+    def update(self, price: float) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        self.window.update(price)
+
+        if self.window.ready:
+            width = self.num_std * self.window.std
+            self.middle = self.window.mean
+            self.upper = self.middle + width
+            self.lower = self.middle - width
+
+        return self.middle, self.upper, self.lower
+
+    @property
+    def value(self) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        return self.middle, self.upper, self.lower
+
+
+class StreamingATR:
+    """
+    Потоковый индикатор ATR со сглаживанием Уайлдера
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self.value: Optional[float] = None
+        self._prev_close: Optional[float] = None
+        self._range_sum = 0
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        bar_range = true_range(high, low, self._prev_close)
+        self._prev_close = close
+        self.count += 1
+
+        if self.value is not None:
+            self.value = wilder_step(self.value, bar_range, self.period)
+        else:
+            self._range_sum += bar_range
+            if self.count == self.period:
+                self.value = self._range_sum / self.period
+
+        return self.value
@@ -0,0 +1,220 @@
+"""
+Перебор параметров индикаторов и порогов сигналов в пуле процессов.
+
+Цены передаются каждому процессу один раз через initializer пула, а
+задачи содержат только наборы параметров. Каждый набор оценивается по
+сигналам из main(): пересечение нуля Momentum, выход RSI за пороги и
+смена знака гистограммы MACD. Сигналы ищет SignalScanner, направления
+берутся из signal_scanner.RULE_DIRECTIONS (signal_array). Для каждого
+сигнала берётся доходность через horizon баров с учётом направления.
+"""
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+import indicators_np
+from indicator_cache import IndicatorCache
+from signal_scanner import SignalScanner, signal_array
+
+SWEEP_PARAMS = (
+    "momentum_period",
+    "rsi_period",
+    "rsi_lower",
+    "rsi_upper",
+    "macd_fast",
+    "macd_slow",
+    "macd_signal",
+)
+
+DEFAULT_SWEEP = {
+    "momentum_period": 10,
+    "rsi_period": 14,
+    "rsi_lower": 30,
+    "rsi_upper": 70,
+    "macd_fast": 12,
+    "macd_slow": 26,
+    "macd_signal": 9,
+}
+
+_worker_prices: Optional[np.ndarray] = None
+_worker_horizon = 5
+_worker_cache: Optional[IndicatorCache] = None
+
+
+def parameter_grid(**ranges: Sequence) -> List[dict]:
+    """
+    Полная сетка параметров: декартово произведение переданных диапазонов
+
+    Не указанные параметры берутся из DEFAULT_SWEEP, заведомо
+    некорректные сочетания (fast >= slow, lower >= upper) отбрасываются.
+    """
+    names = list(ranges)
+    combos = []
+
+    for values in itertools.product(*(ranges[name] for name in names)):
+        params = {**DEFAULT_SWEEP, **dict(zip(names, values))}
+        if is_valid(params):
+            combos.append(params)
+
+    return combos
+
+
+def random_parameters(ranges: Dict[str, Sequence], samples: int, seed: Optional[int] = None) -> List[dict]:
+    """
+    Случайный поиск: samples уникальных наборов из диапазонов ranges
+    """
+    rng = random.Random(seed)
+    combos = []
+    seen = set()
+    attempts = 0
+
+    while len(combos) < samples and attempts < samples * 20:
+        attempts += 1
+        params = {**DEFAULT_SWEEP, **{name: rng.choice(list(values)) for name, values in ranges.items()}}
+        key = tuple(params[name] for name in SWEEP_PARAMS)
+        if key in seen or not is_valid(params):
+            continue
+        seen.add(key)
+        combos.append(params)
+
+    return combos
+
+
+def is_valid(params: dict) -> bool:
+    """Проверка согласованности набора параметров"""
+    return params["macd_fast"] < params["macd_slow"] and params["rsi_lower"] < params["rsi_upper"]
+
+
+def evaluate_parameters(close_prices: np.ndarray, params: dict, horizon: int = 5,
+                        cache: Optional[IndicatorCache] = None) -> dict:
+    """
+    Статистика сигналов одного набора параметров
+
+    Индикаторы, общие для разных наборов (EMA для MACD, RSI и Momentum
+    с теми же периодами), берутся из cache, если он передан.
+
+    Returns:
+        Словарь: параметры, число сигналов по индикаторам, доля
+        прибыльных сигналов и средняя доходность через horizon баров
+    """
+    momentum_period = params["momentum_period"]
+    rsi_period = params["rsi_period"]
+
+    if cache is None:
+        momentum = indicators_np.calculate_momentum(close_prices, momentum_period)
+        rsi = indicators_np.calculate_rsi(close_prices, rsi_period)
+    else:
+        momentum = cache.get_or_compute(close_prices, "momentum", (momentum_period,),
+                                        lambda: indicators_np.calculate_momentum(close_prices, momentum_period))
+        rsi = cache.get_or_compute(close_prices, "rsi", (rsi_period,),
+                                   lambda: indicators_np.calculate_rsi(close_prices, rsi_period))
+
+    _, _, histogram = indicators_np.calculate_macd(
+        close_prices, params["macd_fast"], params["macd_slow"], params["macd_signal"], cache=cache
+    )
+
+    indicators = {"momentum": momentum, "rsi": rsi, "macd_hist": histogram}
+    events = SignalScanner().scan(indicators, rsi_levels=(params["rsi_lower"], params["rsi_upper"]))
+    rules = {rule: signal_array(rule_events, close_prices.shape, rule) for rule, rule_events in events.items()}
+
+    n = close_prices.shape[-1]
+    forward = np.full(n, np.nan)
+    if n > horizon:
+        forward[:n - horizon] = close_prices[horizon:] / close_prices[:n - horizon] - 1
+
+    row = dict(params)
+    returns = []
+
+    for name, directions in rules.items():
+        index = np.flatnonzero(directions)
+        index = index[~np.isnan(forward[index])]
+        row[f"{name}_signals"] = len(index)
+        returns.append(directions[index] * forward[index])
+
+    signed = np.concatenate(returns)
+    row["signals"] = len(signed)
+    row["hit_rate"] = float(np.mean(signed > 0)) if len(signed) else float("nan")
+    row["mean_return"] = float(np.mean(signed)) if len(signed) else float("nan")
+    return row
+
+
+def _init_worker(close_prices: np.ndarray, horizon: int, cache_bytes: int):
+    global _worker_prices, _worker_horizon, _worker_cache
+    _worker_prices = close_prices
+    _worker_horizon = horizon
+    _worker_cache = IndicatorCache(cache_bytes) if cache_bytes else None
+
+
+def _evaluate_batch(batch: List[dict]) -> List[dict]:
+    return [evaluate_parameters(_worker_prices, params, _worker_horizon, _worker_cache) for params in batch]
+
+
+def run_sweep(
+        close_prices: Sequence[float],
+        combos: Iterable[dict],
+        horizon: int = 5,
+        workers: Optional[int] = None,
+        sort_by: str = "mean_return",
+        min_signals: int = 1,
+        cache_bytes: int = 256 * 1024 * 1024
+) -> List[dict]:
+    """
+    Оценка всех наборов параметров в пуле процессов
+
+    Args:
+        close_prices: цены закрытия
+        combos: наборы параметров (parameter_grid / random_parameters)
+        horizon: горизонт доходности после сигнала, баров
+        workers: число процессов (по умолчанию — число ядер)
+        sort_by: колонка, по убыванию которой ранжируется таблица
+        min_signals: наборы с меньшим числом сигналов идут в конец
+        cache_bytes: лимит IndicatorCache в каждом процессе (0 — без кэша)
+
+    Returns:
+        Таблица результатов, отсортированная от лучшего набора к худшему
+    """
+    close_prices = np.ascontiguousarray(close_prices, dtype=np.float64)
+    combos = list(combos)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(combos) < 2:
+        cache = IndicatorCache(cache_bytes) if cache_bytes else None
+        rows = [evaluate_parameters(close_prices, params, horizon, cache) for params in combos]
+    else:
+        # Пачки по несколько наборов на задачу: примерно 4 задачи на процесс
+        batch_size = max(1, -(-len(combos) // (workers * 4)))
+        batches = [combos[i:i + batch_size] for i in range(0, len(combos), batch_size)]
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(close_prices, horizon, cache_bytes)) as executor:
+            rows = [row for batch in executor.map(_evaluate_batch, batches) for row in batch]
+
+    def rank(row):
+        value = row[sort_by]
+        enough = row["signals"] >= min_signals and value == value
+        return (enough, value if enough else 0.0)
+
+    rows.sort(key=rank, reverse=True)
+    return rows
+
+
+def format_table(rows: List[dict], limit: int = 20) -> str:
+    """
+    Текстовая таблица лучших наборов параметров
+    """
+    header = (f"{'#':>3} {'Mom':>4} {'RSI':>4} {'Low':>4} {'High':>4} {'Fast':>4} {'Slow':>4} "
+              f"{'Sig':>4} {'Сигн.':>6} {'Hit %':>6} {'Ср. дох. %':>10}")
+    lines = [header, "-" * len(header)]
+
+    for place, row in enumerate(rows[:limit], 1):
+        lines.append(
+            f"{place:>3} {row['momentum_period']:>4} {row['rsi_period']:>4} {row['rsi_lower']:>4} "
+            f"{row['rsi_upper']:>4} {row['macd_fast']:>4} {row['macd_slow']:>4} {row['macd_signal']:>4} "
+            f"{row['signals']:>6} {row['hit_rate'] * 100:>6.1f} {row['mean_return'] * 100:>10.3f}"
+        )
+
+    return "\n".join(lines)
@@ -0,0 +1,41 @@
+import numpy as np
+
+import backtest
+
+NAN = np.nan
+
+
+def test_position_closed_at_end_of_history():
+    prices = np.array([[NAN, 10, 11, 12, 13, NAN, NAN],
+                       [10, 11, 12, 13, 14, 15, 16]])
+    signals = np.zeros(prices.shape, dtype=np.int8)
+    signals[:, 1] = 1
+
+    result = backtest.run_backtest(prices, signals, fee=0.0, slippage=0.0)
+
+    np.testing.assert_array_equal(result.positions[0], [0, 1, 1, 1, 0, 0, 0])
+    np.testing.assert_array_equal(result.turnover[0], [0, 1, 0, 0, 1, 0, 0])
+    np.testing.assert_allclose(result.equity[0], [1, 1, 1.1, 1.2, 1.3, 1.3, 1.3])
+    # Полная история до конца массива позицию не закрывает
+    np.testing.assert_array_equal(result.positions[1], [0, 1, 1, 1, 1, 1, 1])
+
+
+def test_position_carried_through_interior_gap():
+    prices = np.array([10.0, 11.0, NAN, NAN, 12.0])
+    signals = np.array([1, 0, -1, 0, 0])
+
+    result = backtest.run_backtest(prices, signals, fee=0.0, slippage=0.0)
+
+    np.testing.assert_array_equal(result.positions, [1, 1, 1, 1, 1])
+    np.testing.assert_array_equal(result.turnover, [1, 0, 0, 0, 0])
+    np.testing.assert_allclose(result.equity[-1], 1.2)
+
+
+def test_costs_charged_on_turnover():
+    prices = np.array([10.0, 10.0, 10.0, 10.0])
+    signals = np.array([1, -1, 0, 0])
+
+    result = backtest.run_backtest(prices, signals, fee=0.001, slippage=0.0)
+
+    np.testing.assert_allclose(result.costs, [0.001, 0.002, 0.0, 0.0])
+    assert backtest.run_backtest(prices, signals, allow_short=False).positions.tolist() == [1, 0, 0, 0]
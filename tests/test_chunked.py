@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+import chunked
+import indicators_np
+import universe
+from price_generator import generate_paths
+
+
+@pytest.fixture(scope="module")
+def series():
+    close, high, low = generate_paths(1, 500, seed=9)
+    return close[0], high[0], low[0]
+
+
+def _concat(chunks):
+    chunks = list(chunks)
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 26, 100, 500, 1000])
+def test_chunked_matches_universe(series, block_size):
+    close, high, low = series
+    whole = universe.compute_universe(close, high, low).symbol("0")
+    parts = _concat(chunked.run_chunked(chunked.iter_blocks(close, high, low, block_size)))
+
+    for name in universe.COLUMNS:
+        np.testing.assert_allclose(parts[name], whole[name], rtol=indicators_np.REFERENCE_RTOL,
+                                   atol=1e-9, equal_nan=True, err_msg=name)
+
+
+@pytest.mark.parametrize("block_size", [1, 9, 64])
+def test_chunked_sma_and_momentum(series, block_size):
+    close = series[0]
+    sma, momentum = chunked.ChunkedSMA(20), chunked.ChunkedMomentum(10)
+    blocks = [close[i:i + block_size] for i in range(0, len(close), block_size)]
+
+    np.testing.assert_allclose(np.concatenate([sma.process(block) for block in blocks]),
+                               indicators_np.calculate_sma(close, 20), rtol=indicators_np.REFERENCE_RTOL,
+                               equal_nan=True)
+    np.testing.assert_array_equal(np.concatenate([momentum.process(block) for block in blocks]),
+                                  indicators_np.calculate_momentum(close, 10))
+
+
+@pytest.mark.parametrize("gap_policy", indicators_np.GAP_POLICIES)
+@pytest.mark.parametrize("block_size", [1, 5, 40])
+def test_chunked_ema_gap_policies(series, gap_policy, block_size):
+    prices = series[0].copy()
+    prices[[3, 30, 31, 32, 120, 121, 300]] = np.nan
+    ema = chunked.ChunkedEMA(13, gap_policy=gap_policy)
+
+    result = np.concatenate([ema.process(prices[i:i + block_size]) for i in range(0, len(prices), block_size)])
+    np.testing.assert_allclose(result, indicators_np.calculate_ema_with_nan(prices, 13, gap_policy),
+                               rtol=indicators_np.REFERENCE_RTOL, equal_nan=True)
+
+
+def test_unknown_parameter_is_rejected():
+    with pytest.raises(ValueError):
+        chunked.ChunkedIndicators(period=3)
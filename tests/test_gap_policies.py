@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+import algotradesim
+import indicators_np
+
+NONE_POSITIONS = {0, 1, 2, 10, 11, 40, 41, 42, 43, 44, 45, 46, 47, 48, 49, 50, 51, 52, 53, 54, 55, 120, 199}
+
+
+@pytest.fixture(scope="module")
+def prices():
+    rng = random.Random(4)
+    values = [100.0]
+    for _ in range(199):
+        values.append(values[-1] * rng.uniform(0.97, 1.03))
+    return [None if i in NONE_POSITIONS else value for i, value in enumerate(values)]
+
+
+def test_skip_equals_compact_and_reexpand(prices):
+    present = [price for price in prices if price is not None]
+    compact = iter(algotradesim.calculate_ema(present, 13))
+    expected = [None if price is None else next(compact) for price in prices]
+
+    assert algotradesim.calculate_ema_with_none(prices, 13, "skip") == expected
+
+
+def test_hold_repeats_last_value_on_gaps(prices):
+    skip = algotradesim.calculate_ema_with_none(prices, 13, "skip")
+    hold = algotradesim.calculate_ema_with_none(prices, 13, "hold")
+
+    last = None
+    for price, skipped, held in zip(prices, skip, hold):
+        if price is None:
+            assert held == last
+        else:
+            assert held == skipped
+            last = held
+
+
+def test_reset_restarts_warmup_after_gap():
+    prices = [1.0, 2.0, 3.0, None, 4.0, 5.0, 6.0, 7.0]
+    assert algotradesim.calculate_ema_with_none(prices, 3, "reset") == [None, None, 2.0, None, None, None, 5.0, 6.0]
+
+
+@pytest.mark.parametrize("gap_policy", algotradesim.GAP_POLICIES)
+@pytest.mark.parametrize("period", [1, 3, 13, 30])
+def test_numpy_matches_list(prices, gap_policy, period):
+    expected = algotradesim.calculate_ema_with_none(prices, period, gap_policy)
+    values = indicators_np.calculate_ema_with_nan(indicators_np.to_array(prices), period, gap_policy)
+
+    assert indicators_np.max_reference_error(values, expected, 100.0) <= indicators_np.REFERENCE_RTOL
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        algotradesim.calculate_ema_with_none([1.0], 3, "drop")
+    with pytest.raises(ValueError):
+        indicators_np.calculate_ema_with_nan(indicators_np.to_array([1.0]), 3, "drop")
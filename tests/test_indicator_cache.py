@@ -0,0 +1,94 @@
+import random
+import time
+
+import numpy as np
+
+import algotradesim
+import indicator_cache
+from indicator_cache import IndicatorCache
+
+
+def _prices(n, seed=1):
+    rng = random.Random(seed)
+    prices = [100.0]
+    for _ in range(n - 1):
+        prices.append(prices[-1] * rng.uniform(0.98, 1.02))
+    return prices
+
+
+def _count_calls(monkeypatch, module, name):
+    calls = []
+    original = getattr(module, name)
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(module, name, counted)
+    return calls
+
+
+def test_list_hit_does_not_hash_or_recompute(monkeypatch):
+    cache = IndicatorCache()
+    prices = _prices(1000)
+    expected = algotradesim.calculate_ema(prices, 13)
+    hashes = _count_calls(monkeypatch, indicator_cache, "series_key")
+    computes = _count_calls(monkeypatch, algotradesim, "calculate_ema")
+
+    first = cache.ema_list(prices, 13)
+    second = cache.ema_list(prices, 13)
+
+    assert first == second == expected
+    assert first is not second
+    assert len(hashes) == 1
+    assert len(computes) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_list_hit_is_cheaper_than_recompute():
+    cache = IndicatorCache()
+    prices = _prices(200_000)
+    cache.ema_list(prices, 13)
+
+    def best(func, repeat=5):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    hit = best(lambda: cache.ema_list(prices, 13))
+    recompute = best(lambda: algotradesim.calculate_ema(prices, 13))
+    assert hit * 3 < recompute
+
+
+def test_appended_list_is_a_new_series():
+    cache = IndicatorCache()
+    prices = _prices(100)
+    cache.ema_list(prices, 5)
+    prices.append(prices[-1] * 1.01)
+
+    assert cache.ema_list(prices, 5) == algotradesim.calculate_ema(prices, 5)
+    assert cache.stats()["misses"] == 2
+
+
+def test_caller_key_skips_hashing(monkeypatch):
+    cache = IndicatorCache()
+    prices = _prices(100)
+    hashes = _count_calls(monkeypatch, indicator_cache, "series_key")
+
+    cache.ema_list(prices, 5, key=("BTC", 1))
+    cache.ema_list(list(prices), 5, key=("BTC", 1))
+
+    assert not hashes
+    assert cache.stats()["hits"] == 1
+
+
+def test_array_results_are_read_only_and_shared():
+    cache = IndicatorCache()
+    prices = np.array(_prices(500))
+
+    first = cache.ema(prices, 13)
+    assert cache.ema(prices.copy(), 13) is first
+    assert not first.flags.writeable
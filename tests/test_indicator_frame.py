@@ -0,0 +1,72 @@
+import math
+
+import pytest
+
+import algotradesim
+from indicator_frame import IndicatorFrame
+from price_generator import generate_paths
+
+
+@pytest.fixture(scope="module")
+def series():
+    close, high, low = generate_paths(1, 200, seed=5)
+    return close[0].tolist(), high[0].tolist(), low[0].tolist()
+
+
+def _full(close, high, low):
+    macd_line, signal_line, histogram = algotradesim.calculate_macd(close, 12, 26, 9)
+    bull_power, bear_power = algotradesim.calculate_bull_bear_power(high, low, close, 13)
+    return {
+        "momentum": algotradesim.calculate_momentum(close, 10),
+        "rsi": algotradesim.calculate_rsi(close, 14),
+        "macd": macd_line,
+        "macd_signal": signal_line,
+        "macd_hist": histogram,
+        "bull_power": bull_power,
+        "bear_power": bear_power,
+        "sma_20": algotradesim.calculate_sma(close, 20),
+        "ema_50": algotradesim.calculate_ema(close, 50),
+    }
+
+
+def _assert_same(values, expected):
+    assert len(values) == len(expected)
+    for value, reference in zip(values, expected):
+        if reference is None:
+            assert value is None
+        else:
+            assert math.isclose(value, reference, rel_tol=1e-12, abs_tol=1e-9)
+
+
+@pytest.mark.parametrize("start, stop", [(None, None), (-10, None), (30, 60), (0, 5)])
+def test_windows_match_full_series(series, start, stop):
+    frame = IndicatorFrame(*series)
+    expected = _full(*series)
+
+    for name, values in expected.items():
+        _assert_same(frame.window(name, start, stop), values[slice(start, stop)])
+
+
+def test_sma_window_computes_only_warmup(series):
+    frame = IndicatorFrame(*series)
+    frame["sma_20", -10:]
+
+    assert frame.bars_computed == 10 + 19
+
+
+def test_recomputed_window_after_tail_matches(series):
+    frame = IndicatorFrame(*series)
+    expected = _full(*series)
+
+    frame.tail(5, "macd_hist", "momentum")
+    _assert_same(frame["macd_hist"], expected["macd_hist"])
+    _assert_same(frame["momentum", 50:80], expected["momentum"][50:80])
+
+
+def test_unknown_column_and_parameter(series):
+    frame = IndicatorFrame(*series)
+
+    with pytest.raises(KeyError):
+        frame["vwap"]
+    with pytest.raises(ValueError):
+        IndicatorFrame(series[0], rsi=14)
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+import algotradesim
+import indicators_np
+from price_generator import generate_paths
+
+SCALE = 50_000.0
+TOLERANCE = indicators_np.REFERENCE_RTOL
+
+
+@pytest.fixture(scope="module")
+def prices():
+    close, high, low = generate_paths(3, 300, seed=42)
+    return close, high, low
+
+
+def _lists(*rows):
+    return [row.tolist() for row in rows]
+
+
+def _assert_matches(values, reference, scale=SCALE):
+    assert indicators_np.max_reference_error(values, reference, scale) <= TOLERANCE
+
+
+@pytest.mark.parametrize("period", [1, 5, 14, 200, 400])
+def test_single_series_indicators(prices, period):
+    close, high, low = prices
+    c, h, l = _lists(close[0], high[0], low[0])
+
+    _assert_matches(indicators_np.calculate_sma(close[0], period), algotradesim.calculate_sma(c, period))
+    _assert_matches(indicators_np.calculate_ema(close[0], period), algotradesim.calculate_ema(c, period))
+    _assert_matches(indicators_np.calculate_momentum(close[0], period), algotradesim.calculate_momentum(c, period))
+    _assert_matches(indicators_np.calculate_rsi(close[0], period), algotradesim.calculate_rsi(c, period), 100.0)
+    _assert_matches(indicators_np.calculate_stddev(close[0], period), algotradesim.calculate_stddev(c, period))
+    _assert_matches(indicators_np.calculate_atr(high[0], low[0], close[0], period),
+                    algotradesim.calculate_atr(h, l, c, period))
+
+    for values, reference in zip(indicators_np.calculate_bull_bear_power(high[0], low[0], close[0], period),
+                                 algotradesim.calculate_bull_bear_power(h, l, c, period)):
+        _assert_matches(values, reference)
+    for values, reference in zip(indicators_np.calculate_bollinger_bands(close[0], period),
+                                 algotradesim.calculate_bollinger_bands(c, period)):
+        _assert_matches(values, reference)
+
+
+def test_macd(prices):
+    close = prices[0][0]
+    for values, reference in zip(indicators_np.calculate_macd(close, 5, 13, 4),
+                                 algotradesim.calculate_macd(close.tolist(), 5, 13, 4)):
+        _assert_matches(values, reference)
+
+
+def test_matrix_rows_match_single_series(prices):
+    close, high, low = prices
+    checks = {
+        "sma": lambda c, h, l: indicators_np.calculate_sma(c, 20),
+        "ema": lambda c, h, l: indicators_np.calculate_ema(c, 13),
+        "rsi": lambda c, h, l: indicators_np.calculate_rsi(c, 14),
+        "stddev": lambda c, h, l: indicators_np.calculate_stddev(c, 20),
+        "atr": lambda c, h, l: indicators_np.calculate_atr(h, l, c, 14),
+        "macd_hist": lambda c, h, l: indicators_np.calculate_macd(c)[2],
+    }
+    for name, check in checks.items():
+        matrix = check(close, high, low)
+        for row in range(close.shape[0]):
+            np.testing.assert_allclose(matrix[row], check(close[row], high[row], low[row]),
+                                       rtol=1e-12, atol=1e-9, equal_nan=True, err_msg=name)
+
+
+def test_ema_many_matches_ema(prices):
+    close = prices[0]
+    periods = [3, 12, 26, 400]
+    many = indicators_np.calculate_ema_many(close, periods)
+
+    for row, period in enumerate(periods):
+        expected = indicators_np.calculate_ema(close, period)
+        np.testing.assert_allclose(many[row], expected, rtol=TOLERANCE, equal_nan=True)
+
+
+def test_optional_list_round_trip():
+    values = [None, 1.5, None, 2.0]
+    assert indicators_np.to_optional_list(indicators_np.to_array(values)) == values
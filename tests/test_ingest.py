@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+import ingest
+
+ROWS = [
+    (100.0, 101.5, 99.0, 100.5, 10.0),
+    (100.5, 102.0, 100.0, 101.0, 12.5),
+    (101.0, 101.25, 98.5, 99.0, 7.0),
+]
+
+
+def _write_csv(tmp_path, rows=ROWS):
+    path = tmp_path / "bars.csv"
+    lines = ["date,Open,High,Low,Close,Volume"]
+    lines += [f"2024-01-0{i + 1}," + ",".join(str(v) for v in row) for i, row in enumerate(rows)]
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def _concat(chunks, columns=ingest.DEFAULT_COLUMNS):
+    chunks = list(chunks)
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in columns}
+
+
+def _expected(columns=ingest.DEFAULT_COLUMNS):
+    table = np.array(ROWS)
+    return {name: table[:, ingest.DEFAULT_COLUMNS.index(name)] for name in columns}
+
+
+@pytest.mark.parametrize("read_size", [16, 1 << 20])
+def test_csv_numpy_engine(tmp_path, read_size):
+    result = _concat(ingest.iter_csv(_write_csv(tmp_path), read_size=read_size, engine="numpy"))
+    for name, values in _expected().items():
+        np.testing.assert_array_equal(result[name], values)
+
+
+def test_csv_arrow_engine_matches_numpy(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = _write_csv(tmp_path)
+
+    arrow = _concat(ingest.iter_csv(path, engine="arrow"))
+    numpy = _concat(ingest.iter_csv(path, engine="numpy"))
+    for name in ingest.DEFAULT_COLUMNS:
+        np.testing.assert_array_equal(arrow[name], numpy[name])
+
+
+def test_csv_arrow_engine_requires_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest, "arrow_csv", None)
+    with pytest.raises(ValueError):
+        next(ingest.iter_csv(_write_csv(tmp_path), engine="arrow"))
+
+
+def test_csv_missing_column(tmp_path):
+    with pytest.raises(ValueError, match="oi"):
+        next(ingest.iter_csv(_write_csv(tmp_path), ("close", "oi"), engine="numpy"))
+
+
+@pytest.mark.parametrize("read_size", [32, 1 << 20])
+def test_ndjson_fast_path(tmp_path, read_size):
+    path = tmp_path / "bars.ndjson"
+    path.write_text("".join(
+        '{"t": %d, "open": %r, "high": %r, "low": %r, "close": "%r", "volume": %r}\n' % ((i,) + row)
+        for i, row in enumerate(ROWS)))
+
+    result = _concat(ingest.iter_ndjson(str(path), read_size=read_size))
+    for name, values in _expected().items():
+        np.testing.assert_array_equal(result[name], values)
+
+
+def test_ndjson_reordered_keys_fall_back_to_json(tmp_path):
+    path = tmp_path / "bars.ndjson"
+    path.write_text('{"close": 1.0, "high": 2.0}\n{"high": 3.0, "close": 4.0}\n\n{"high": 5, "close": 6}\n')
+
+    result = _concat(ingest.iter_ndjson(str(path), ("high", "close")), ("high", "close"))
+    np.testing.assert_array_equal(result["high"], [2.0, 3.0, 5.0])
+    np.testing.assert_array_equal(result["close"], [1.0, 4.0, 6.0])
+
+
+@pytest.mark.parametrize("line", ['{"high": 2.0}', '{"high": 2.0, "close": null}'])
+def test_ndjson_missing_value_names_the_line(tmp_path, line):
+    path = tmp_path / "bars.ndjson"
+    path.write_text('{"high": 1.0, "close": 1.0}\n' + line + "\n")
+
+    with pytest.raises(ValueError, match="строка 2"):
+        list(ingest.iter_ndjson(str(path), ("high", "close")))
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+import monte_carlo
+import price_generator
+
+
+@pytest.mark.parametrize("kwargs", [{"n_bars": 0}, {"n_paths": 0}, {"batch_paths": 0}, {"n_bars": -5}])
+def test_invalid_sizes_raise_value_error(kwargs):
+    with pytest.raises(ValueError):
+        monte_carlo.run_monte_carlo(workers=1, **kwargs)
+
+
+def test_generate_paths_validates_sizes():
+    with pytest.raises(ValueError):
+        price_generator.generate_paths(1, 0)
+    close, high, low = price_generator.generate_paths(3, 1, seed=1)
+    assert close.shape == high.shape == low.shape == (3, 1)
+
+
+def test_result_depends_on_seed_not_on_workers():
+    kwargs = dict(n_paths=60, n_bars=80, seed=11, batch_paths=20)
+    single = monte_carlo.run_monte_carlo(workers=1, **kwargs)
+    pooled = monte_carlo.run_monte_carlo(workers=2, **kwargs)
+
+    np.testing.assert_array_equal(single.signals, pooled.signals)
+    np.testing.assert_array_equal(single.return_sums, pooled.return_sums)
+    np.testing.assert_array_equal(single.return_histogram, pooled.return_histogram)
+    assert single.signals.shape == (60, len(monte_carlo.RULES))
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from algotradesim import ema_step, wilder_step
+from recursive_filter import ema_alpha, linear_filter, smooth, smooth_many, wilder_alpha
+
+
+def _scalar_filter(values, decay, initial, scale):
+    result, state = [], initial
+    for value in values:
+        state = decay * state + scale * value
+        result.append(state)
+    return result
+
+
+@pytest.mark.parametrize("n", [0, 1, 5, 4096, 10_000])
+@pytest.mark.parametrize("decay", [0.0, 1e-12, 0.5, 0.9, 0.999])
+def test_linear_filter_matches_scalar_loop(n, decay):
+    values = np.random.default_rng(n).normal(size=n)
+    expected = _scalar_filter(values, decay, 0.3, 0.7)
+
+    np.testing.assert_allclose(linear_filter(values, decay, 0.3, 0.7), expected, rtol=1e-9, atol=1e-12)
+
+
+def test_linear_filter_per_row_decay():
+    values = np.random.default_rng(1).normal(size=(4, 3000))
+    decay = np.array([0.0, 1e-10, 0.5, 0.99])
+    initial = np.array([1.0, -1.0, 2.0, 0.5])
+
+    result = linear_filter(values, decay, initial)
+    for row in range(4):
+        np.testing.assert_allclose(result[row], _scalar_filter(values[row], decay[row], initial[row], 1.0),
+                                   rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize("period", [1, 2, 14, 26])
+def test_smooth_matches_scalar_steps(period):
+    values = np.random.default_rng(period).uniform(90, 110, size=500)
+
+    ema = [None] * (period - 1) + [values[:period].sum() / period]
+    wilder = list(ema)
+    for value in values[period:]:
+        ema.append(ema_step(ema[-1], value, ema_alpha(period)))
+        wilder.append(wilder_step(wilder[-1], value, period))
+
+    for alpha, expected in ((ema_alpha(period), ema), (wilder_alpha(period), wilder)):
+        result = smooth(values, alpha, period)
+        assert np.isnan(result[:period - 1]).all()
+        np.testing.assert_allclose(result[period - 1:], expected[period - 1:], rtol=1e-12)
+
+
+def test_smooth_in_place():
+    values = np.random.default_rng(0).uniform(size=200)
+    expected = smooth(values, ema_alpha(10), 10)
+
+    smooth(values, ema_alpha(10), 10, out=values)
+    np.testing.assert_array_equal(values, expected)
+
+
+def test_smooth_many_matches_smooth():
+    values = np.random.default_rng(2).uniform(90, 110, size=(3, 400))
+    periods = [2, 12, 26, 500]
+
+    result = smooth_many(values, periods)
+    assert result.shape == (4, 3, 400)
+    for row, period in enumerate(periods):
+        np.testing.assert_allclose(result[row], smooth(values, ema_alpha(period), period), rtol=1e-12, equal_nan=True)
@@ -0,0 +1,77 @@
+import random
+
+import numpy as np
+import pytest
+
+import indicators_np
+import rolling_extrema
+
+
+def _bars(n, seed=2):
+    rng = random.Random(seed)
+    # Повторяющиеся значения проверяют равные элементы в очереди
+    high = [rng.choice([1.0, 2.0, 3.0, 4.0]) + rng.choice([0.0, 0.25]) for _ in range(n)]
+    low = [h - rng.choice([0.0, 0.5, 1.0]) for h in high]
+    close = [(h + l) / 2 for h, l in zip(high, low)]
+    return high, low, close
+
+
+def _brute(values, period, extreme):
+    return [None if i < period - 1 else extreme(values[i - period + 1:i + 1]) for i in range(len(values))]
+
+
+@pytest.mark.parametrize("n, period", [(300, 14), (50, 1), (10, 14), (14, 14)])
+def test_rolling_extrema_match_brute_force(n, period):
+    high, low, _ = _bars(n)
+    expected_max = _brute(high, period, max) if n >= period else [None] * n
+    expected_min = _brute(low, period, min) if n >= period else [None] * n
+
+    assert rolling_extrema.rolling_max(high, period) == expected_max
+    assert rolling_extrema.rolling_min(low, period) == expected_min
+
+    extrema = rolling_extrema.RollingExtrema(period)
+    assert [extrema.update(h, l) for h, l in zip(high, low)] == [
+        (None, None) if h is None else (h, l) for h, l in zip(expected_max, expected_min)]
+
+
+@pytest.mark.parametrize("k_period, d_period", [(14, 3), (5, 1), (3, 7)])
+def test_streaming_matches_batch_exactly(k_period, d_period):
+    high, low, close = _bars(400)
+
+    stochastic = rolling_extrema.StreamingStochastic(k_period, d_period)
+    streamed = [stochastic.update(*bar) for bar in zip(high, low, close)]
+    k_values, d_values = rolling_extrema.calculate_stochastic(high, low, close, k_period, d_period)
+    assert [k for k, _ in streamed] == k_values
+    assert [d for _, d in streamed] == d_values
+
+    williams = rolling_extrema.StreamingWilliamsR(k_period)
+    assert [williams.update(*bar) for bar in zip(high, low, close)] == \
+        rolling_extrema.calculate_williams_r(high, low, close, k_period)
+
+    donchian = rolling_extrema.StreamingDonchian(k_period)
+    assert [donchian.update(h, l) for h, l in zip(high, low)] == \
+        list(zip(*rolling_extrema.calculate_donchian(high, low, k_period)))
+
+
+def test_flat_window():
+    k_values, _ = rolling_extrema.calculate_stochastic([1.0] * 5, [1.0] * 5, [1.0] * 5, 3, 2)
+    assert k_values == [None, None, 50.0, 50.0, 50.0]
+    assert rolling_extrema.calculate_williams_r([1.0] * 3, [1.0] * 3, [1.0] * 3, 3)[-1] == -50.0
+
+
+def test_numpy_versions_match_lists():
+    high, low, close = _bars(500)
+    matrix = [np.array([column, column[::-1]]) for column in (high, low, close)]
+
+    np_k, np_d = indicators_np.calculate_stochastic(*matrix, 14, 3)
+    np_r = indicators_np.calculate_williams_r(*matrix, 14)
+    np_upper, np_middle, np_lower = indicators_np.calculate_donchian(matrix[0], matrix[1], 20)
+
+    for row in range(2):
+        h, l, c = (list(column[row]) for column in matrix)
+        k_values, d_values = rolling_extrema.calculate_stochastic(h, l, c, 14, 3)
+        upper, middle, lower = rolling_extrema.calculate_donchian(h, l, 20)
+        for values, reference in [(np_k, k_values), (np_d, d_values),
+                                  (np_r, rolling_extrema.calculate_williams_r(h, l, c, 14)),
+                                  (np_upper, upper), (np_middle, middle), (np_lower, lower)]:
+            assert indicators_np.max_reference_error(values[row], reference, 100.0) < 1e-12
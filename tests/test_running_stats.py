@@ -0,0 +1,65 @@
+import math
+import random
+import statistics
+
+import numpy as np
+import pytest
+
+from running_stats import RollingVariance, RunningStats
+
+
+@pytest.fixture(scope="module")
+def values():
+    rng = random.Random(8)
+    return [None if rng.random() < 0.1 else rng.gauss(50, 20) for _ in range(2000)]
+
+
+def test_running_stats_match_statistics_module(values):
+    present = [v for v in values if v is not None]
+    stats = RunningStats(above=(70,), below=(30,)).update(values)
+
+    assert stats.count == len(present)
+    assert stats.mean == pytest.approx(statistics.fmean(present), rel=1e-12)
+    assert stats.variance == pytest.approx(statistics.variance(present), rel=1e-10)
+    assert (stats.min, stats.max) == (min(present), max(present))
+    assert stats.count_above(70) == sum(v > 70 for v in present)
+    assert stats.count_below(30) == sum(v < 30 for v in present)
+
+
+def test_merge_and_from_array_match_single_pass(values):
+    whole = RunningStats(above=(70,), below=(30,)).update(values)
+    merged = RunningStats(above=(70,), below=(30,)).update(values[:700])
+    merged.merge(RunningStats(above=(70,), below=(30,)).update(values[700:]))
+    array = RunningStats.from_array(np.array([np.nan if v is None else v for v in values]), (70,), (30,))
+
+    for stats in (merged, array):
+        assert stats.as_dict().keys() == whole.as_dict().keys()
+        for key, value in whole.as_dict().items():
+            assert stats.as_dict()[key] == pytest.approx(value, rel=1e-10), key
+
+
+def test_merge_rejects_different_thresholds():
+    with pytest.raises(ValueError):
+        RunningStats(above=(70,)).merge(RunningStats(above=(80,)).update([1.0]))
+
+
+@pytest.mark.parametrize("period", [1, 3, 20])
+def test_rolling_variance_matches_exact_window(period):
+    # Высокие цены с резкой сменой волатильности: проверка дрейфа m2
+    rng = random.Random(period)
+    prices = [50_000 + rng.gauss(0, 500 if i < 3000 else 0.5) for i in range(6000)]
+    window = RollingVariance(period)
+
+    for i, price in enumerate(prices):
+        window.update(price)
+        if i >= period - 1 and i % 97 == 0 or i == len(prices) - 1:
+            exact = statistics.pvariance(prices[i - period + 1:i + 1])
+            assert window.variance == pytest.approx(exact, rel=1e-6, abs=1e-9)
+
+
+def test_rolling_variance_warmup():
+    window = RollingVariance(3)
+    assert math.isnan(window.variance)
+    window.update(1.0)
+    window.update(3.0)
+    assert not window.ready and window.variance == 1.0
@@ -0,0 +1,43 @@
+import doctest
+
+import numpy as np
+
+import signal_scanner
+from signal_scanner import EventKind, Regime, SignalScanner
+
+NAN = np.nan
+
+
+def test_doctests():
+    assert doctest.testmod(signal_scanner).failed == 0
+
+
+def test_regime_gap_does_not_repeat_change():
+    # BULL, нет режима, BULL, BEAR, NaN, борьба, борьба
+    bull = np.array([1, 0, 1, -1, NAN, 1, 1.0])
+    bear = np.array([1, 0, 1, -1, NAN, -1, -1.0])
+
+    events = SignalScanner().regime_changes(bull, bear)
+
+    assert events["index"].tolist() == [0, 3, 5]
+    assert events["value"].tolist() == [Regime.STRONG_BULL, Regime.STRONG_BEAR, Regime.STRUGGLE]
+
+
+def test_regime_changes_per_symbol():
+    bull = np.array([[1, 0, 1.0], [-1, -1, 1.0]])
+    bear = np.array([[1, 0, 1.0], [-1, -1, 1.0]])
+
+    events = SignalScanner().regime_changes(bull, bear)
+
+    assert list(zip(events["symbol"].tolist(), events["index"].tolist())) == [(0, 0), (1, 0), (1, 2)]
+
+
+def test_thresholds_and_crossovers():
+    scanner = SignalScanner()
+    rsi = scanner.thresholds(np.array([NAN, 50, 25, 35, 75, 65.0]), 30, 70)
+    assert [(int(e["index"]), EventKind(e["kind"])) for e in rsi] == [
+        (2, EventKind.ENTER_BELOW), (3, EventKind.EXIT_BELOW), (4, EventKind.ENTER_ABOVE), (5, EventKind.EXIT_ABOVE)]
+
+    cross = scanner.crossovers(np.array([NAN, -1, 0, 1, -1.0]))
+    assert [(int(e["index"]), EventKind(e["kind"])) for e in cross] == [
+        (3, EventKind.CROSS_UP), (4, EventKind.CROSS_DOWN)]
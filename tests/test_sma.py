@@ -0,0 +1,37 @@
+import math
+import random
+
+import pytest
+
+from algotradesim import calculate_sma
+from benchmarks import calculate_sma_reference
+
+
+@pytest.mark.parametrize("period", [1, 2, 14, 50])
+def test_rolling_sma_matches_window_sums(period):
+    rng = random.Random(period)
+    prices = [rng.uniform(1, 1e5) for _ in range(1000)]
+
+    result = calculate_sma(prices, period)
+    reference = calculate_sma_reference(prices, period)
+
+    assert [v is None for v in result] == [v is None for v in reference]
+    for value, expected in zip(result, reference):
+        if expected is not None:
+            assert value == pytest.approx(expected, rel=1e-12)
+
+
+def test_short_series_is_all_none():
+    assert calculate_sma([1.0, 2.0], 3) == [None, None]
+
+
+def test_no_drift_on_long_series():
+    # Большие и малые значения вперемешку: без компенсации сумма дрейфует
+    rng = random.Random(0)
+    prices = [rng.choice([1e8, 1e-3]) * rng.random() for _ in range(200_000)]
+    period = 20
+
+    result = calculate_sma(prices, period)
+    for i in range(len(prices) - 50, len(prices)):
+        exact = math.fsum(prices[i - period + 1:i + 1]) / period
+        assert result[i] == pytest.approx(exact, rel=1e-12, abs=1e-12)
@@ -0,0 +1,50 @@
+import pytest
+
+import algotradesim
+import streaming
+from price_generator import generate_paths
+
+
+@pytest.fixture(scope="module")
+def bars():
+    close, high, low = generate_paths(1, 250, seed=3)
+    return close[0].tolist(), high[0].tolist(), low[0].tolist()
+
+
+def _stream(indicator, *series):
+    return [indicator.update(*values) for values in zip(*series)]
+
+
+def test_single_value_indicators_match_batch(bars):
+    close, high, low = bars
+
+    assert _stream(streaming.StreamingEMA(13), close) == algotradesim.calculate_ema(close, 13)
+    assert _stream(streaming.StreamingRSI(14), close) == algotradesim.calculate_rsi(close, 14)
+    assert _stream(streaming.StreamingMomentum(10), close) == algotradesim.calculate_momentum(close, 10)
+    assert _stream(streaming.StreamingATR(14), high, low, close) == algotradesim.calculate_atr(high, low, close, 14)
+
+
+def test_multi_value_indicators_match_batch(bars):
+    close, high, low = bars
+
+    assert _stream(streaming.StreamingMACD(12, 26, 9), close) == list(zip(*algotradesim.calculate_macd(close)))
+    assert _stream(streaming.StreamingBullBearPower(13), high, low, close) == \
+        list(zip(*algotradesim.calculate_bull_bear_power(high, low, close, 13)))
+
+
+def test_windowed_indicators_match_batch(bars):
+    close = bars[0]
+
+    assert _stream(streaming.StreamingStdDev(20), close) == algotradesim.calculate_stddev(close, 20)
+    assert _stream(streaming.StreamingBollingerBands(20, 2.0), close) == \
+        list(zip(*algotradesim.calculate_bollinger_bands(close, 20, 2.0)))
+
+
+@pytest.mark.parametrize("factory", [lambda: streaming.StreamingEMA(5), lambda: streaming.StreamingRSI(5),
+                                     lambda: streaming.StreamingMACD(3, 6, 4)])
+def test_preview_equals_update_without_changing_state(bars, factory):
+    indicator = factory()
+    for price in bars[0][:40]:
+        previewed = indicator.preview(price)
+        assert indicator.preview(price) == previewed
+        assert indicator.update(price) == previewed
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+import algotradesim
+from timeframes import MultiTimeframe, timeframe_seconds
+
+
+@pytest.fixture(scope="module")
+def minutes():
+    rng = random.Random(5)
+    close = [100.0]
+    for _ in range(3 * 24 * 60 - 1):
+        close.append(close[-1] * rng.uniform(0.999, 1.001))
+    high = [c * rng.uniform(1.0, 1.002) for c in close]
+    low = [c * rng.uniform(0.998, 1.0) for c in close]
+    return close, high, low
+
+
+def _roll_up(close, high, low, size):
+    bars = []
+    for start in range(0, len(close), size):
+        bars.append((close[start + size - 1], max(high[start:start + size]), min(low[start:start + size])))
+    return bars
+
+
+def test_aggregated_bars_and_indicators_match_batch(minutes):
+    close, high, low = minutes
+    mtf = MultiTimeframe(("1m", "15m", "1h"), rsi_period=5, macd_fast=3, macd_slow=6, macd_signal=4)
+    closed = mtf.update_many(close, high, low)
+
+    for timeframe in ("15m", "1h"):
+        expected = _roll_up(close, high, low, timeframe_seconds(timeframe) // 60)
+        bars = [bar for bar in closed if bar.timeframe == timeframe]
+        assert [(bar.close, bar.high, bar.low) for bar in bars] == expected
+
+        closes = [c for c, _, _ in expected]
+        assert [bar.rsi for bar in bars] == algotradesim.calculate_rsi(closes, 5)
+        assert [(bar.macd, bar.macd_signal, bar.macd_hist) for bar in bars] == \
+            list(zip(*algotradesim.calculate_macd(closes, 3, 6, 4)))
+
+
+def test_gap_closes_stale_bar_first():
+    mtf = MultiTimeframe(("1m", "5m"))
+    mtf.update(1.0, timestamp=0)
+    mtf.update(2.0, timestamp=60)
+
+    closed = mtf.update(3.0, timestamp=600)
+
+    assert [(bar.timeframe, bar.start, bar.close) for bar in closed] == [("5m", 0, 2.0), ("1m", 600, 3.0)]
+    assert mtf.partial("5m").start == 600
+
+
+def test_partial_matches_flush(minutes):
+    close = minutes[0][:100]
+    mtf = MultiTimeframe(("1m", "1h"), rsi_period=3)
+    mtf.update_many(close)
+
+    partial = mtf.partial("1h")
+    assert [bar for bar in mtf.flush() if bar.timeframe == "1h"] == [partial]
+
+
+def test_invalid_timeframes():
+    with pytest.raises(ValueError):
+        timeframe_seconds("0m")
+    with pytest.raises(ValueError):
+        MultiTimeframe(("2m", "5m"))
+    mtf = MultiTimeframe(("1m",))
+    mtf.update(1.0, timestamp=60)
+    with pytest.raises(ValueError):
+        mtf.update(1.0, timestamp=60)
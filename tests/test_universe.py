@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+import indicators_np
+import universe
+from price_generator import generate_paths
+
+
+@pytest.fixture(scope="module")
+def ragged():
+    close, high, low = generate_paths(3, 150, seed=1)
+    # Второй инструмент появляется позже, третий раньше заканчивается
+    close[1, :20] = high[1, :20] = low[1, :20] = np.nan
+    close[2, 110:] = high[2, 110:] = low[2, 110:] = np.nan
+    return close, high, low
+
+
+def _single(close, high, low):
+    bull_power, bear_power = indicators_np.calculate_bull_bear_power(high, low, close, 13)
+    macd_line, signal_line, histogram = indicators_np.calculate_macd(close, 12, 26, 9)
+    return {
+        "close": close,
+        "momentum": indicators_np.calculate_momentum(close, 10),
+        "bull_power": bull_power,
+        "bear_power": bear_power,
+        "rsi": indicators_np.calculate_rsi(close, 14),
+        "macd": macd_line,
+        "macd_signal": signal_line,
+        "macd_hist": histogram,
+    }
+
+
+def test_rows_match_per_symbol_computation(ragged):
+    close, high, low = ragged
+    result = universe.compute_universe(close, high, low, symbols=["a", "b", "c"])
+    starts, lengths = universe.history_bounds(close)
+
+    for row, symbol in enumerate(result.symbols):
+        start, stop = starts[row], starts[row] + lengths[row]
+        expected = _single(close[row, start:stop], high[row, start:stop], low[row, start:stop])
+        columns = result.symbol(symbol)
+
+        for name in universe.COLUMNS:
+            assert np.isnan(columns[name][:start]).all() and np.isnan(columns[name][stop:]).all()
+            np.testing.assert_allclose(columns[name][start:stop], expected[name],
+                                       rtol=1e-12, atol=1e-9, equal_nan=True, err_msg=name)
+
+
+def test_latest_uses_each_symbols_last_bar(ragged):
+    close, high, low = ragged
+    result = universe.compute_universe(close, high, low)
+
+    np.testing.assert_array_equal(result.latest("close"), [close[0, -1], close[1, -1], close[2, 109]])
+
+
+def test_interior_gap_is_rejected(ragged):
+    close = ragged[0].copy()
+    close[0, 50] = np.nan
+
+    with pytest.raises(ValueError, match="'x'"):
+        universe.compute_universe(close, symbols=["x", "y", "z"])
+
+
+def test_unknown_parameter_is_rejected(ragged):
+    with pytest.raises(ValueError):
+        universe.compute_universe(ragged[0], rsi=14)
@@ -0,0 +1,233 @@
+"""
+Индикаторы на нескольких таймфреймах из одного потока баров.
+
+MultiTimeframe принимает базовые бары (например, минутные) по одному и
+сразу собирает из них бары старших таймфреймов: open первого бара,
+максимум high, минимум low, close последнего бара и сумма объёмов.
+Бар таймфрейма закрывается, когда базовый бар доходит до его правой
+границы (или когда пришёл бар уже следующего интервала — при пропусках
+в данных). Потоковые RSI и MACD таймфрейма (streaming.py) обновляются
+только при закрытии его бара, поэтому работа на базовый бар — O(число
+таймфреймов), а значения совпадают с calculate_rsi/calculate_macd по
+ряду закрытий этого таймфрейма.
+
+Текущий недоформированный бар доступен через partial(): индикаторы для
+него считаются через preview() без изменения состояния.
+
+Пример:
+    mtf = MultiTimeframe(("1m", "5m", "15m", "1h", "1d"))
+    for timestamp, open_, high, low, close, volume in bars:
+        for bar in mtf.update(close, high, low, open_, volume, timestamp):
+            print(bar.timeframe, bar.close, bar.rsi)
+    mtf.partial("1h")
+
+Зависит только от стандартной библиотеки.
+"""
+import re
+from collections import deque
+from typing import Deque, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from streaming import StreamingMACD, StreamingRSI
+
+# Длительность таймфреймов в секундах
+TIMEFRAMES = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "1h": 3600,
+    "4h": 14400,
+    "1d": 86400,
+}
+
+DEFAULT_TIMEFRAMES = ("1m", "5m", "15m", "1h", "1d")
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_TIMEFRAME = re.compile(r"(\d+)([smhd])$")
+
+
+def timeframe_seconds(timeframe: str) -> int:
+    """
+    Длительность таймфрейма вида 30s, 5m, 4h, 1d в секундах
+    """
+    if timeframe in TIMEFRAMES:
+        return TIMEFRAMES[timeframe]
+
+    match = _TIMEFRAME.match(timeframe)
+    if match is None or int(match.group(1)) == 0:
+        raise ValueError(f"Неизвестный таймфрейм: {timeframe!r}")
+    return int(match.group(1)) * _UNITS[match.group(2)]
+
+
+class TimeframeBar(NamedTuple):
+    timeframe: str
+    start: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    rsi: Optional[float]
+    macd: Optional[float]
+    macd_signal: Optional[float]
+    macd_hist: Optional[float]
+
+
+class TimeframeState:
+    """
+    Состояние одного таймфрейма: формирующийся бар, индикаторы и
+    последние закрытые бары
+
+    Args:
+        history: сколько закрытых баров хранить (None — все)
+    """
+    __slots__ = ("timeframe", "seconds", "rsi", "macd", "history", "closed",
+                 "start", "open", "high", "low", "close", "volume")
+
+    def __init__(self, timeframe: str, rsi_period: int, macd_fast: int, macd_slow: int, macd_signal: int,
+                 history: Optional[int] = None):
+        self.timeframe = timeframe
+        self.seconds = timeframe_seconds(timeframe)
+        self.rsi = StreamingRSI(rsi_period)
+        self.macd = StreamingMACD(macd_fast, macd_slow, macd_signal)
+        self.history: Deque[TimeframeBar] = deque(maxlen=history)
+        self.closed = 0
+        self.start: Optional[int] = None
+        self.open = self.high = self.low = self.close = self.volume = 0.0
+
+    def add(self, start: int, open_: float, high: float, low: float, close: float, volume: float):
+        """Добавление базового бара в формирующийся бар интервала start"""
+        if self.start is None:
+            self.start = start
+            self.open, self.high, self.low, self.close, self.volume = open_, high, low, close, volume
+            return
+
+        if high > self.high:
+            self.high = high
+        if low < self.low:
+            self.low = low
+        self.close = close
+        self.volume += volume
+
+    def close_bar(self) -> TimeframeBar:
+        """Закрытие формирующегося бара с обновлением индикаторов"""
+        rsi = self.rsi.update(self.close)
+        macd, signal, histogram = self.macd.update(self.close)
+        bar = TimeframeBar(self.timeframe, self.start, self.open, self.high, self.low, self.close, self.volume,
+                           rsi, macd, signal, histogram)
+
+        self.history.append(bar)
+        self.closed += 1
+        self.start = None
+        return bar
+
+    def partial(self) -> Optional[TimeframeBar]:
+        """Формирующийся бар с индикаторами «как если бы он закрылся сейчас»"""
+        if self.start is None:
+            return None
+        macd, signal, histogram = self.macd.preview(self.close)
+        return TimeframeBar(self.timeframe, self.start, self.open, self.high, self.low, self.close, self.volume,
+                            self.rsi.preview(self.close), macd, signal, histogram)
+
+
+class MultiTimeframe:
+    """
+    Агрегация базовых баров в старшие таймфреймы с потоковыми RSI и MACD
+
+    Args:
+        timeframes: таймфреймы, каждый кратен базовому
+        base: таймфрейм входных баров (по умолчанию — самый короткий)
+        history: сколько закрытых баров хранить на таймфрейм (None — все)
+        rsi_period, macd_fast, macd_slow, macd_signal: периоды индикаторов
+    """
+
+    def __init__(self, timeframes: Sequence[str] = DEFAULT_TIMEFRAMES, base: Optional[str] = None,
+                 history: Optional[int] = None, rsi_period: int = 14,
+                 macd_fast: int = 12, macd_slow: int = 26, macd_signal: int = 9):
+        if not timeframes:
+            raise ValueError("Нужен хотя бы один таймфрейм")
+
+        self.states: Dict[str, TimeframeState] = {}
+        for timeframe in sorted(timeframes, key=timeframe_seconds):
+            self.states[timeframe] = TimeframeState(timeframe, rsi_period, macd_fast, macd_slow, macd_signal, history)
+
+        self.base = base or next(iter(self.states))
+        self.base_seconds = timeframe_seconds(self.base)
+        for state in self.states.values():
+            if state.seconds % self.base_seconds:
+                raise ValueError(f"Таймфрейм {state.timeframe} не кратен базовому {self.base}")
+
+        self.bars = 0
+        self._last_timestamp: Optional[int] = None
+
+    def update(self, close: float, high: Optional[float] = None, low: Optional[float] = None,
+               open_: Optional[float] = None, volume: float = 0.0,
+               timestamp: Optional[int] = None) -> List[TimeframeBar]:
+        """
+        Обработка одного базового бара
+
+        Args:
+            timestamp: начало бара в секундах (по умолчанию — номер бара,
+                умноженный на длительность базового таймфрейма)
+
+        Returns:
+            Бары, закрытые этим баром, от младшего таймфрейма к старшему
+        """
+        if timestamp is None:
+            timestamp = self.bars * self.base_seconds
+        elif self._last_timestamp is not None and timestamp <= self._last_timestamp:
+            raise ValueError(f"Время бара {timestamp} не больше предыдущего {self._last_timestamp}")
+        self._last_timestamp = timestamp
+        self.bars += 1
+
+        high = close if high is None else high
+        low = close if low is None else low
+        open_ = close if open_ is None else open_
+        end = timestamp + self.base_seconds
+
+        # Пропуск в данных: бар пришёл уже из следующего интервала, и
+        # прежние бары закрываются раньше, чем бары, закрытые этим баром
+        closed = [state.close_bar() for state in self.states.values()
+                  if state.start is not None and state.start != timestamp - timestamp % state.seconds]
+
+        for state in self.states.values():
+            start = timestamp - timestamp % state.seconds
+            state.add(start, open_, high, low, close, volume)
+            if end >= start + state.seconds:
+                closed.append(state.close_bar())
+
+        return closed
+
+    def update_many(self, close: Iterable[float], high: Optional[Iterable[float]] = None,
+                    low: Optional[Iterable[float]] = None,
+                    timestamps: Optional[Iterable[int]] = None) -> List[TimeframeBar]:
+        """Обработка последовательности базовых баров; возвращает все закрытые бары"""
+        close = list(close)
+        high = close if high is None else high
+        low = close if low is None else low
+        timestamps = [None] * len(close) if timestamps is None else timestamps
+
+        closed = []
+        for c, h, l, t in zip(close, high, low, timestamps):
+            closed.extend(self.update(c, h, l, timestamp=t))
+        return closed
+
+    def flush(self) -> List[TimeframeBar]:
+        """Принудительное закрытие всех формирующихся баров (конец данных)"""
+        return [state.close_bar() for state in self.states.values() if state.start is not None]
+
+    def partial(self, timeframe: str) -> Optional[TimeframeBar]:
+        """Текущий недоформированный бар таймфрейма (None, если бар только что закрылся)"""
+        return self.states[timeframe].partial()
+
+    def last(self, timeframe: str) -> Optional[TimeframeBar]:
+        """Последний закрытый бар таймфрейма"""
+        history = self.states[timeframe].history
+        return history[-1] if history else None
+
+    def history(self, timeframe: str) -> List[TimeframeBar]:
+        """Сохранённые закрытые бары таймфрейма"""
+        return list(self.states[timeframe].history)
+
+    def __repr__(self) -> str:
+        closed = {timeframe: state.closed for timeframe, state in self.states.items()}
+        return f"MultiTimeframe(base={self.base}, bars={self.bars}, closed={closed})"
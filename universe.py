@@ -0,0 +1,181 @@
+"""
+Пакетный расчёт индикаторов для целой вселенной инструментов.
+
+Цены передаются матрицей (symbols, bars), все индикаторы считаются
+векторизованно по всем строкам сразу через indicators_np. История каждого
+инструмента может начинаться и заканчиваться в разные дни: бары вне
+истории помечаются NaN, а прогрев индикаторов отсчитывается от первого
+бара каждой строки.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import indicators_np
+
+DEFAULT_PARAMS = {
+    "momentum_period": 10,
+    "bbp_period": 13,
+    "rsi_period": 14,
+    "macd_fast": 12,
+    "macd_slow": 26,
+    "macd_signal": 9,
+}
+
+COLUMNS = (
+    "close",
+    "momentum",
+    "bull_power",
+    "bear_power",
+    "rsi",
+    "macd",
+    "macd_signal",
+    "macd_hist",
+)
+
+
+def history_bounds(prices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Границы истории каждой строки: индекс первого валидного бара и длина
+
+    Returns:
+        Кортеж массивов: (starts, lengths)
+    """
+    valid = ~np.isnan(prices)
+    n = prices.shape[-1]
+    has_data = valid.any(axis=-1)
+
+    starts = np.where(has_data, valid.argmax(axis=-1), n)
+    ends = np.where(has_data, n - valid[:, ::-1].argmax(axis=-1), n)
+    return starts, ends - starts
+
+
+def shift_rows(matrix: np.ndarray, shifts: np.ndarray) -> np.ndarray:
+    """
+    Сдвиг каждой строки влево на shifts[i] баров (вправо при отрицательном)
+
+    Освободившиеся позиции заполняются NaN.
+    """
+    n = matrix.shape[-1]
+    source = np.arange(n) + shifts[:, None]
+    inside = (source >= 0) & (source < n)
+
+    shifted = np.take_along_axis(matrix, np.clip(source, 0, n - 1), axis=-1)
+    shifted[~inside] = np.nan
+    return shifted
+
+
+class UniverseResult:
+    """
+    Результат расчёта по вселенной: колонки формы (symbols, bars)
+
+    Все колонки выровнены по оси баров, mask отмечает бары внутри
+    истории каждого инструмента.
+    """
+
+    def __init__(self, symbols: List[str], columns: Dict[str, np.ndarray], mask: np.ndarray):
+        self.symbols = symbols
+        self.columns = columns
+        self.mask = mask
+        self._index = {symbol: i for i, symbol in enumerate(symbols)}
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def symbol(self, symbol: str) -> Dict[str, np.ndarray]:
+        """Все колонки одного инструмента"""
+        row = self._index[symbol]
+        return {name: values[row] for name, values in self.columns.items()}
+
+    def latest(self, column: str) -> np.ndarray:
+        """Последнее значение колонки в пределах истории каждого инструмента"""
+        values = self.columns[column]
+        has_data = self.mask.any(axis=-1)
+        last = values.shape[-1] - 1 - self.mask[:, ::-1].argmax(axis=-1)
+        latest = values[np.arange(values.shape[0]), last]
+        latest[~has_data] = np.nan
+        return latest
+
+
+def compute_universe(
+        close_prices: np.ndarray,
+        high_prices: Optional[np.ndarray] = None,
+        low_prices: Optional[np.ndarray] = None,
+        symbols: Optional[Sequence[str]] = None,
+        **params
+) -> UniverseResult:
+    """
+    Вычисление всех индикаторов для матрицы цен (symbols, bars)
+
+    Args:
+        close_prices: цены закрытия, NaN вне истории инструмента (внутри
+            истории пропуски не допускаются — ValueError)
+        high_prices: максимумы (по умолчанию — цены закрытия)
+        low_prices: минимумы (по умолчанию — цены закрытия)
+        symbols: названия инструментов
+        **params: периоды индикаторов, см. DEFAULT_PARAMS
+
+    Returns:
+        UniverseResult с колонками из COLUMNS
+    """
+    unknown = set(params) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError(f"Неизвестные параметры: {sorted(unknown)}")
+    settings = {**DEFAULT_PARAMS, **params}
+
+    close_prices = np.atleast_2d(np.asarray(close_prices, dtype=np.float64))
+    high_prices = close_prices if high_prices is None else np.atleast_2d(np.asarray(high_prices, dtype=np.float64))
+    low_prices = close_prices if low_prices is None else np.atleast_2d(np.asarray(low_prices, dtype=np.float64))
+
+    if symbols is None:
+        symbols = [str(i) for i in range(close_prices.shape[0])]
+
+    starts, lengths = history_bounds(close_prices)
+    bars = np.arange(close_prices.shape[-1])
+    mask = (bars >= starts[:, None]) & (bars < (starts + lengths)[:, None])
+
+    # NaN внутри истории прошёл бы через рекурсию EMA/RSI/MACD и испортил
+    # все последующие значения строки
+    gaps = (mask & np.isnan(close_prices)).any(axis=-1)
+    if gaps.any():
+        names = [symbols[i] for i in np.flatnonzero(gaps)]
+        raise ValueError(f"Пропуски цен закрытия внутри истории инструментов {names}: "
+                         f"NaN допускается только до начала и после конца истории")
+
+    # Выравниваем начало всех историй по нулевому бару, чтобы прогрев
+    # и затравка SMA у каждой строки начинались с её первого бара
+    ragged = bool(starts.any())
+    if ragged:
+        close_aligned = shift_rows(close_prices, starts)
+        high_aligned = shift_rows(high_prices, starts)
+        low_aligned = shift_rows(low_prices, starts)
+    else:
+        close_aligned, high_aligned, low_aligned = close_prices, high_prices, low_prices
+
+    bull_power, bear_power = indicators_np.calculate_bull_bear_power(
+        high_aligned, low_aligned, close_aligned, settings["bbp_period"]
+    )
+    macd_line, signal_line, histogram = indicators_np.calculate_macd(
+        close_aligned, settings["macd_fast"], settings["macd_slow"], settings["macd_signal"]
+    )
+
+    columns = {
+        "close": close_aligned,
+        "momentum": indicators_np.calculate_momentum(close_aligned, settings["momentum_period"]),
+        "bull_power": bull_power,
+        "bear_power": bear_power,
+        "rsi": indicators_np.calculate_rsi(close_aligned, settings["rsi_period"]),
+        "macd": macd_line,
+        "macd_signal": signal_line,
+        "macd_hist": histogram,
+    }
+
+    for name, values in columns.items():
+        if ragged:
+            values = shift_rows(values, -starts)
+        else:
+            values = values.copy() if name == "close" else values
+        values[~mask] = np.nan
+        columns[name] = values
+
+    return UniverseResult(list(symbols), columns, mask)